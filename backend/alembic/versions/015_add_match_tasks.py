@@ -0,0 +1,51 @@
+"""add match_tasks table
+
+Revision ID: 015
+Revises: 014
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '015'
+down_revision = '014'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Create match_tasks table (per-resume queue rows for batch matching)
+    op.create_table(
+        'match_tasks',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('batch_job_id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('job_id', sa.Integer(), nullable=False),
+        sa.Column('resume_id', sa.Integer(), nullable=False),
+        sa.Column('status', sa.String(20), nullable=False, server_default='pending'),
+        sa.Column('match_id', sa.Integer(), nullable=True),
+        sa.Column('error_message', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['batch_job_id'], ['batch_jobs.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.ForeignKeyConstraint(['job_id'], ['jobs.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['resume_id'], ['resumes.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['match_id'], ['matches.id'], ondelete='SET NULL'),
+        sa.PrimaryKeyConstraint('id')
+    )
+
+    # Create indexes
+    op.create_index('ix_match_tasks_id', 'match_tasks', ['id'], unique=False)
+    op.create_index('idx_match_task_batch_status', 'match_tasks', ['batch_job_id', 'status', 'id'], unique=False)
+
+
+def downgrade():
+    # Drop indexes
+    op.drop_index('idx_match_task_batch_status', table_name='match_tasks')
+    op.drop_index('ix_match_tasks_id', table_name='match_tasks')
+
+    # Drop table
+    op.drop_table('match_tasks')
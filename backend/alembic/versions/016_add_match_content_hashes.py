@@ -0,0 +1,34 @@
+"""add content hashes for match caching
+
+Revision ID: 016
+Revises: 015
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '016'
+down_revision = '015'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Content hashes of resume/job text (filled in on next write, or lazily by the match endpoint)
+    op.add_column('resumes', sa.Column('content_hash', sa.String(64), nullable=True))
+    op.add_column('jobs', sa.Column('content_hash', sa.String(64), nullable=True))
+
+    # Inputs each match was computed from, used as the match cache key
+    op.add_column('matches', sa.Column('resume_hash', sa.String(64), nullable=True))
+    op.add_column('matches', sa.Column('job_hash', sa.String(64), nullable=True))
+    op.add_column('matches', sa.Column('detailed', sa.Boolean(), nullable=True))
+
+
+def downgrade():
+    op.drop_column('matches', 'detailed')
+    op.drop_column('matches', 'job_hash')
+    op.drop_column('matches', 'resume_hash')
+    op.drop_column('jobs', 'content_hash')
+    op.drop_column('resumes', 'content_hash')
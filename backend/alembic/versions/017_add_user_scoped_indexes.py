@@ -0,0 +1,36 @@
+"""add user-scoped indexes for match listing and ownership checks
+
+Revision ID: 017
+Revises: 016
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '017'
+down_revision = '016'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # list_matches: newest-first listing per user, optionally filtered by job.
+    # (user_id, resume_id) lookups are already served by idx_match_user_resume_job.
+    op.create_index(
+        'idx_match_user_created', 'matches',
+        ['user_id', sa.text('created_at DESC')], unique=False
+    )
+    op.create_index('idx_match_user_job', 'matches', ['user_id', 'job_id'], unique=False)
+
+    # Ownership checks (id + user_id) and per-user listings
+    op.create_index('idx_resume_user', 'resumes', ['user_id'], unique=False)
+    op.create_index('idx_job_user', 'jobs', ['user_id'], unique=False)
+
+
+def downgrade():
+    op.drop_index('idx_job_user', table_name='jobs')
+    op.drop_index('idx_resume_user', table_name='resumes')
+    op.drop_index('idx_match_user_job', table_name='matches')
+    op.drop_index('idx_match_user_created', table_name='matches')
@@ -0,0 +1,44 @@
+"""store match result and generated content columns as JSONB
+
+Revision ID: 018
+Revises: 017
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '018'
+down_revision = '017'
+branch_labels = None
+depends_on = None
+
+JSONB_COLUMNS = [
+    'missing_skills',
+    'recommendations',
+    'keyword_matches',
+    'ats_issues',
+    'interview_prep_data',
+    'cover_letter_data',
+    'improved_resume_data',
+]
+
+
+def upgrade():
+    for column in JSONB_COLUMNS:
+        op.alter_column(
+            'matches', column,
+            type_=postgresql.JSONB(),
+            postgresql_using=f'{column}::jsonb'
+        )
+
+
+def downgrade():
+    for column in JSONB_COLUMNS:
+        op.alter_column(
+            'matches', column,
+            type_=postgresql.JSON(astext_type=sa.Text()),
+            postgresql_using=f'{column}::json'
+        )
@@ -0,0 +1,41 @@
+"""add id tiebreaker to match listing indexes
+
+Revision ID: 019
+Revises: 018
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '019'
+down_revision = '018'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # list_matches orders by (created_at DESC, id DESC) and pages with a
+    # (created_at, id) < cursor seek; index the full key so each page is a
+    # range scan, including when filtered by job
+    op.drop_index('idx_match_user_created', table_name='matches')
+    op.create_index(
+        'idx_match_user_created', 'matches',
+        ['user_id', sa.text('created_at DESC'), sa.text('id DESC')], unique=False
+    )
+    op.drop_index('idx_match_user_job', table_name='matches')
+    op.create_index(
+        'idx_match_user_job', 'matches',
+        ['user_id', 'job_id', sa.text('created_at DESC'), sa.text('id DESC')], unique=False
+    )
+
+
+def downgrade():
+    op.drop_index('idx_match_user_job', table_name='matches')
+    op.create_index('idx_match_user_job', 'matches', ['user_id', 'job_id'], unique=False)
+    op.drop_index('idx_match_user_created', table_name='matches')
+    op.create_index(
+        'idx_match_user_created', 'matches',
+        ['user_id', sa.text('created_at DESC')], unique=False
+    )
@@ -0,0 +1,37 @@
+"""store analytics event_data as JSONB with a GIN index
+
+Revision ID: 020
+Revises: 019
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '020'
+down_revision = '019'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.alter_column(
+        'analytics', 'event_data',
+        type_=postgresql.JSONB(),
+        postgresql_using='event_data::jsonb'
+    )
+    op.create_index(
+        'idx_analytics_event_data', 'analytics', ['event_data'],
+        unique=False, postgresql_using='gin'
+    )
+
+
+def downgrade():
+    op.drop_index('idx_analytics_event_data', table_name='analytics')
+    op.alter_column(
+        'analytics', 'event_data',
+        type_=postgresql.JSON(astext_type=sa.Text()),
+        postgresql_using='event_data::json'
+    )
@@ -0,0 +1,25 @@
+"""add analysis status to resumes
+
+Revision ID: 021
+Revises: 020
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '021'
+down_revision = '020'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # LLM analysis now runs after the upload response; NULL means no analysis
+    # was requested (or the resume predates background analysis)
+    op.add_column('resumes', sa.Column('analysis_status', sa.String(20), nullable=True))
+
+
+def downgrade():
+    op.drop_column('resumes', 'analysis_status')
@@ -0,0 +1,29 @@
+"""add keyset index for listing resumes
+
+Revision ID: 022
+Revises: 021
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '022'
+down_revision = '021'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # list_resumes orders live resumes by (created_at DESC, id DESC) and pages
+    # with a (created_at, id) < cursor seek
+    op.create_index(
+        'idx_resume_user_created', 'resumes',
+        ['user_id', sa.text('created_at DESC'), sa.text('id DESC')], unique=False,
+        postgresql_where=sa.text('deleted_at IS NULL')
+    )
+
+
+def downgrade():
+    op.drop_index('idx_resume_user_created', table_name='resumes')
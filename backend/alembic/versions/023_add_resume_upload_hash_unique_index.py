@@ -0,0 +1,38 @@
+"""add unique index on resume upload hash per user
+
+Revision ID: 023
+Revises: 022
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '023'
+down_revision = '022'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Uploads that raced past the old SELECT-then-INSERT check may have left
+    # duplicates; keep the hash on the oldest copy only so the index can build
+    op.execute(
+        """
+        UPDATE resumes SET upload_hash = NULL
+        WHERE upload_hash IS NOT NULL
+          AND id NOT IN (
+              SELECT MIN(id) FROM resumes
+              WHERE upload_hash IS NOT NULL
+              GROUP BY user_id, upload_hash
+          )
+        """
+    )
+    op.create_index(
+        'uq_resume_user_upload_hash', 'resumes',
+        ['user_id', 'upload_hash'], unique=True
+    )
+
+
+def downgrade():
+    op.drop_index('uq_resume_user_upload_hash', table_name='resumes')
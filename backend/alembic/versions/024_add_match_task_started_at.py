@@ -0,0 +1,24 @@
+"""add started_at to match_tasks
+
+Revision ID: 024
+Revises: 023
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '024'
+down_revision = '023'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Lets workers reclaim tasks left in "processing" by a crashed worker
+    op.add_column('match_tasks', sa.Column('started_at', sa.DateTime(), nullable=True))
+
+
+def downgrade():
+    op.drop_column('match_tasks', 'started_at')
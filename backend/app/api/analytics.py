@@ -31,7 +31,7 @@ class AnalyticsStats(BaseModel):
 
 
 @router.post("/track")
-async def track_event(
+def track_event(
     event: AnalyticsEvent,
     request: Request,
     db: Session = Depends(get_db),
@@ -59,7 +59,7 @@ async def track_event(
 
 
 @router.get("/stats", response_model=AnalyticsStats)
-async def get_analytics_stats(
+def get_analytics_stats(
     days: int = 30,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -141,7 +141,7 @@ async def get_analytics_stats(
 
 
 @router.get("/admin/stats")
-async def get_admin_analytics(
+def get_admin_analytics(
     days: int = 30,
     admin_user: User = Depends(get_admin_user),
     db: Session = Depends(get_db)
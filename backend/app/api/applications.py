@@ -15,7 +15,7 @@ router = APIRouter()
 
 
 @router.post("/", response_model=ApplicationResponse, status_code=status.HTTP_201_CREATED)
-async def create_application(
+def create_application(
     app_data: ApplicationCreate,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -68,7 +68,7 @@ async def create_application(
 
 
 @router.get("/", response_model=List[ApplicationResponse])
-async def list_applications(
+def list_applications(
     status_filter: Optional[str] = None,
     skip: int = 0,
     limit: int = 100,
@@ -98,7 +98,7 @@ async def list_applications(
 
 
 @router.get("/{application_id}", response_model=ApplicationResponse)
-async def get_application(
+def get_application(
     application_id: int,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -121,7 +121,7 @@ async def get_application(
 
 
 @router.put("/{application_id}", response_model=ApplicationResponse)
-async def update_application(
+def update_application(
     application_id: int,
     app_data: ApplicationUpdate,
     current_user: User = Depends(get_current_user),
@@ -158,7 +158,7 @@ async def update_application(
 
 
 @router.delete("/{application_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_application(
+def delete_application(
     application_id: int,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
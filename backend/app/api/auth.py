@@ -31,6 +31,7 @@ from app.core.auth import (
     verify_password
 )
 from app.core.config import settings
+from app.core.quota import PLAN_LIMITS
 from app.models.database import get_db
 from app.models.models import User
 from app.services.email_service import email_service
@@ -40,7 +41,7 @@ router = APIRouter()
 
 
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-async def register(user_data: UserCreate, db: Session = Depends(get_db)):
+def register(user_data: UserCreate, db: Session = Depends(get_db)):
     """
     Register a new user.
     """
@@ -67,7 +68,7 @@ async def register(user_data: UserCreate, db: Session = Depends(get_db)):
 
 
 @router.post("/login", response_model=Token)
-async def login(credentials: UserLogin, db: Session = Depends(get_db)):
+def login(credentials: UserLogin, db: Session = Depends(get_db)):
     """
     Login and get access token.
     """
@@ -103,7 +104,7 @@ async def get_current_user_info(current_user: User = Depends(get_current_user)):
 
 
 @router.post("/api-key/regenerate")
-async def regenerate_api_key(
+def regenerate_api_key(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -141,7 +142,7 @@ async def get_llm_settings(current_user: User = Depends(get_current_user)):
 
 
 @router.put("/llm-settings", response_model=LLMSettingsResponse)
-async def update_llm_settings(
+def update_llm_settings(
     settings_data: LLMSettingsUpdate,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -190,13 +191,6 @@ async def get_usage(current_user: User = Depends(get_current_user)):
     """
     Get user's usage statistics and plan information.
     """
-    # Define plan limits
-    PLAN_LIMITS = {
-        "free": 10,  # 10 free job matches
-        "pro": 999999,  # Unlimited for pro
-        "enterprise": 999999
-    }
-
     # Admin users have unlimited access
     if current_user.is_admin:
         limit = 999999
@@ -217,7 +211,7 @@ async def get_usage(current_user: User = Depends(get_current_user)):
 
 
 @router.post("/forgot-password")
-async def forgot_password(
+def forgot_password(
     request: ForgotPasswordRequest,
     db: Session = Depends(get_db)
 ):
@@ -279,7 +273,7 @@ async def forgot_password(
 
 
 @router.post("/reset-password")
-async def reset_password(
+def reset_password(
     request: ResetPasswordRequest,
     db: Session = Depends(get_db)
 ):
@@ -586,7 +580,7 @@ async def get_pricing():
 
 
 @router.post("/tour/complete")
-async def complete_tour(
+def complete_tour(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -12,7 +12,7 @@ from app.core.auth import get_current_user, get_user_llm_api_key, normalize_llm_
 from app.core.config import settings
 from app.core.llm_providers import LLMFactory
 from app.models.database import get_db
-from app.models.models import User, Job
+from app.models.models import User, Job, Match, build_job_text
 from app.services.job_matcher import SkillExtractor
 from app.services.job_scraper import JobScraper, JobScraperError
 
@@ -68,14 +68,14 @@ async def create_job(
             )
 
             api_key = get_user_llm_api_key(current_user, provider)
-            llm_client = LLMFactory.create_client(
+            llm_client = LLMFactory.get_client(
                 provider=provider,
                 api_key=api_key,
                 model=model
             )
 
             extractor = SkillExtractor(llm_client)
-            full_description = f"{job_data.description}\n\n{job_data.requirements or ''}"
+            full_description = build_job_text(job_data.description, job_data.requirements)
             skills_data = await extractor.extract_skills(full_description)
             job.parsed_data = skills_data
 
@@ -154,7 +154,7 @@ async def import_job_from_url(
             )
 
             api_key = get_user_llm_api_key(current_user, provider)
-            llm_client = LLMFactory.create_client(
+            llm_client = LLMFactory.get_client(
                 provider=provider,
                 api_key=api_key,
                 model=model
@@ -177,7 +177,7 @@ async def import_job_from_url(
 
 
 @router.get("/", response_model=List[JobResponse])
-async def list_jobs(
+def list_jobs(
     skip: int = 0,
     limit: int = 100,
     active_only: bool = True,
@@ -202,7 +202,7 @@ async def list_jobs(
 
 
 @router.get("/{job_id}", response_model=JobResponse)
-async def get_job(
+def get_job(
     job_id: int,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -227,7 +227,7 @@ async def get_job(
 
 
 @router.put("/{job_id}", response_model=JobResponse)
-async def update_job(
+def update_job(
     job_id: int,
     job_data: JobCreate,
     current_user: User = Depends(get_current_user),
@@ -261,7 +261,7 @@ async def update_job(
 
 
 @router.get("/{job_id}/matches-count")
-async def get_job_matches_count(
+def get_job_matches_count(
     job_id: int,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -270,7 +270,6 @@ async def get_job_matches_count(
     Get the count of matches associated with a job.
     Used before deletion to inform the user.
     """
-    from app.models.models import Match
 
     job = db.query(Job).filter(
         Job.id == job_id,
@@ -292,7 +291,7 @@ async def get_job_matches_count(
 
 
 @router.delete("/{job_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_job(
+def delete_job(
     job_id: int,
     keep_matches: bool = False,
     current_user: User = Depends(get_current_user),
@@ -303,7 +302,6 @@ async def delete_job(
     If keep_matches=true, performs soft delete (sets deleted_at timestamp).
     If keep_matches=false, performs hard delete (removes from database).
     """
-    from app.models.models import Match
     from datetime import datetime
 
     job = db.query(Job).filter(
@@ -140,7 +140,7 @@ async def scan_linkedin_job(
         logger.info("Step 2: Parsing resume...")
         try:
             resume_content = await resume.read()
-            resume_text = ResumeParser.parse(resume_content, resume.filename)
+            resume_text = await ResumeParser.parse_async(resume_content, resume.filename)
         except ResumeParseError as e:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -171,7 +171,7 @@ async def scan_linkedin_job(
                 detail=f"No API key provided for {provider}. Please provide an API key or configure one in settings."
             )
 
-        llm_client = LLMFactory.create_client(
+        llm_client = LLMFactory.get_client(
             provider=provider,
             api_key=llm_api_key,
             model=model
@@ -1,29 +1,110 @@
 """
 Resume-Job matching endpoints.
 """
-from typing import List, Optional
-from pydantic import BaseModel
-from fastapi.responses import StreamingResponse
+import asyncio
 import io
-from datetime import datetime
-
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-
-from app.api.schemas import MatchRequest, BatchMatchRequest, MatchResponse
-from app.core.auth import get_current_user, get_user_llm_api_key, normalize_llm_provider_and_model
+import re
+from contextlib import aclosing
+from datetime import date, datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import orjson
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from pydantic import BaseModel
+from sqlalchemy import insert, select, tuple_
+from sqlalchemy.orm import Session, load_only
+from starlette.background import BackgroundTask
+
+from app.api.schemas import (
+    BatchJobResponse,
+    BatchMatchQueuedResponse,
+    BatchMatchRequest,
+    MatchRequest,
+    MatchResponse,
+)
+from app.core.auth import get_current_user, get_user_llm_client, resolve_user_llm
+from app.core.cache import (
+    cache_delete,
+    cache_get_json,
+    cache_set_json,
+    document_key,
+    generated_content_key,
+    shared_content_key,
+)
 from app.core.config import settings
-from app.core.llm_providers import LLMFactory
-from app.models.database import get_db
-from app.models.models import User, Resume, Job, Match, APIUsage
-from app.services.job_matcher import JobMatcher
-from app.services.interview_generator import InterviewGenerator
-from app.services.cover_letter_generator import CoverLetterGenerator
+from app.core.downloads import iter_buffer, render_document
+from app.core.http_cache import make_etag, not_modified
 from app.core.logging_config import get_logger
+from app.core.pagination import decode_cursor, encode_cursor
+from app.core.quota import (
+    COVER_LETTER_LIMITS,
+    INTERVIEW_PREP_LIMITS,
+    PLAN_LIMITS,
+    release_quota,
+    reserve_quota,
+)
+from app.core.rate_limit import acquire_match_slot, limit_match_concurrency, release_match_slot
+from app.core.sse import SSE_HEADERS, sse_deltas, sse_event
+from app.models.database import SessionLocal, get_db, get_read_db
+from app.models.models import (
+    RESUME_UPLOADED,
+    Application,
+    BatchJob,
+    Job,
+    Match,
+    MatchTask,
+    Resume,
+    User,
+    content_hash,
+    job_content_hash,
+)
+from app.services.cover_letter_generator import CoverLetterGenerator
+from app.services.interview_generator import InterviewGenerator
+from app.services.job_matcher import JobMatcher, match_result_rows
+from app.services.usage_tracker import record_events, record_usage
 
 router = APIRouter()
 logger = get_logger(__name__)
 
+# Columns exposed by MatchResponse, read straight off trusted ORM rows
+_MATCH_RESPONSE_FIELDS = tuple(MatchResponse.model_fields)
+
+# Columns the match endpoints read; loading only these skips wide columns
+# such as parsed_data and the embedding vectors
+_MATCH_RESPONSE_COLUMNS = tuple(getattr(Match, field) for field in _MATCH_RESPONSE_FIELDS)
+_RESUME_COLUMNS = (Resume.id, Resume.raw_text, Resume.content_hash)
+_JOB_COLUMNS = (Job.id, Job.title, Job.company, Job.description, Job.requirements, Job.content_hash)
+
+
+def _match_payload(match: Match) -> dict:
+    """
+    MatchResponse fields of a Match row we wrote ourselves.
+
+    Returned through ORJSONResponse, which skips FastAPI's per-field
+    response_model validation; request bodies are still validated.
+    """
+    return {field: getattr(match, field) for field in _MATCH_RESPONSE_FIELDS}
+
+
+def _match_created_event(user_id: int, payload: dict) -> dict:
+    """Analytics row for a newly created match, built from its response payload."""
+    return {
+        "user_id": user_id,
+        "event_type": "match_created",
+        "event_data": {
+            "match_id": payload["id"],
+            "resume_id": payload["resume_id"],
+            "job_id": payload["job_id"],
+            "match_score": payload["match_score"]
+        }
+    }
+
+# LLM-backed steps currently running in this process, keyed by their inputs,
+# so a duplicate request (e.g. a client retry) awaits the same result
+_inflight: Dict[tuple, asyncio.Task] = {}
+
 
 # Schemas for interview prep and cover letter
 class InterviewPrepResponse(BaseModel):
@@ -44,194 +125,349 @@ class CoverLetterResponse(BaseModel):
     job_title: str
 
 
-@router.post("/", response_model=MatchResponse, status_code=status.HTTP_201_CREATED)
-async def create_match(
-    match_request: MatchRequest,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
-):
+def _load_match_with_context(
+    db: Session,
+    match_id: int,
+    user_id: int,
+    with_resume: bool = True
+) -> Tuple[Optional[Match], Optional[Resume], Optional[Job]]:
     """
-    Create a match between a resume and job description.
-    Returns match score, missing skills, and recommendations.
+    Load a user's match together with its resume and job in a single query.
+
+    Returns (None, None, None) if the match does not exist or belongs to
+    another user. Pass with_resume=False to skip loading resume text.
     """
-    # Check usage limits for free tier
-    PLAN_LIMITS = {
-        "free": 10,
-        "pro": 999999,
-        "enterprise": 999999
+    if with_resume:
+        query = db.query(Match, Resume, Job).outerjoin(Resume, Resume.id == Match.resume_id)
+        query = query.options(load_only(*_RESUME_COLUMNS))
+    else:
+        query = db.query(Match, Job)
+
+    row = query.outerjoin(Job, Job.id == Match.job_id).options(load_only(*_JOB_COLUMNS)).filter(
+        Match.id == match_id,
+        Match.user_id == user_id
+    ).first()
+
+    if row is None:
+        return None, None, None
+    if with_resume:
+        return row[0], row[1], row[2]
+    return row[0], None, row[1]
+
+
+def _generated_content_entry(data: Optional[dict], job: Optional[Job]) -> dict:
+    """Cache entry for generated content plus the job fields its documents need."""
+    return {
+        "data": data,
+        "job_title": job.title if job else "Position",
+        "company": job.company if job else "Company"
     }
 
-    limit = PLAN_LIMITS.get(current_user.plan, 10)
-    # Admin users bypass usage limits
-    if not current_user.is_admin and current_user.matches_used >= limit:
+
+async def _get_generated_content(db: Session, user_id: int, match_id: int, kind: str) -> dict:
+    """
+    Load a match's generated interview prep or cover letter for a download.
+
+    Served from Redis when warm, so repeated downloads skip loading the
+    match's JSON from the database. Raises 404 if the match does not exist
+    or belongs to another user.
+    """
+    cache_key = generated_content_key(user_id, match_id, kind)
+    cached = await cache_get_json(cache_key)
+    if cached is not None:
+        return cached
+
+    match, _, job = await run_in_threadpool(
+        _load_match_with_context, db, match_id, user_id, with_resume=False
+    )
+
+    if not match:
         raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail=f"Free tier limit reached ({limit} matches). Please upgrade to Pro for unlimited matches."
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Match not found"
         )
 
-    # Verify resume ownership
-    resume = db.query(Resume).filter(
-        Resume.id == match_request.resume_id,
-        Resume.user_id == current_user.id
+    data = match.interview_prep_data if kind == "interview_prep" else match.cover_letter_data
+    entry = _generated_content_entry(data, job)
+    if data:
+        await cache_set_json(cache_key, entry)
+    return entry
+
+
+async def _coalesced(key: tuple, call: Callable[[], Awaitable[Any]]) -> Any:
+    """
+    Run an LLM-backed step once per key, sharing the result with concurrent callers.
+
+    The first caller for a key starts call() as its own task; callers arriving
+    while it is in flight await the same outcome (result or exception) instead
+    of paying for a second identical LLM request. Every caller awaits the task
+    through a shield, so a disconnecting caller - including the one that
+    started it - never cancels the step for the others.
+    """
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.create_task(call())
+        _inflight[key] = task
+        task.add_done_callback(lambda done: _forget_inflight(key, done))
+    else:
+        logger.info("Coalescing duplicate LLM request", kind=key[0])
+
+    return await asyncio.shield(task)
+
+
+def _forget_inflight(key: tuple, task: asyncio.Task) -> None:
+    """Drop a finished shared step, marking its exception retrieved in case no caller is left."""
+    _inflight.pop(key, None)
+    if not task.cancelled():
+        task.exception()
+
+
+def _load_match_inputs(
+    db: Session, user_id: int, resume_id: int, job_id: int
+) -> Tuple[Resume, Job]:
+    """Load a user's resume and job in one query, raising 404 if either is missing."""
+    # Verify resume and job ownership in one round trip
+    row = db.query(Resume, Job).outerjoin(
+        Job,
+        (Job.id == job_id) & (Job.user_id == user_id)
+    ).options(
+        load_only(*_RESUME_COLUMNS),
+        load_only(*_JOB_COLUMNS)
+    ).filter(
+        Resume.id == resume_id,
+        Resume.user_id == user_id,
+        RESUME_UPLOADED
     ).first()
 
-    if not resume:
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Resume not found"
         )
 
-    # Verify job ownership
-    job = db.query(Job).filter(
-        Job.id == match_request.job_id,
-        Job.user_id == current_user.id
-    ).first()
-
+    resume, job = row
     if not job:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Job not found"
         )
 
-    # Get LLM client - Priority: request > user preference > system default
-    provider = (
-        match_request.llm_provider or
-        current_user.llm_provider or
-        settings.default_llm_provider
+    return resume, job
+
+
+def _find_reusable_match(
+    db: Session,
+    user_id: int,
+    resume_id: int,
+    job_id: int,
+    resume_hash: str,
+    job_hash: str,
+    detailed: bool,
+    provider: str,
+    model: str
+) -> Optional[Match]:
+    """Most recent match computed from identical inputs, if still fresh enough to reuse."""
+    query = db.query(Match).filter(
+        Match.user_id == user_id,
+        Match.resume_id == resume_id,
+        Match.job_id == job_id,
+        Match.resume_hash == resume_hash,
+        Match.job_hash == job_hash,
+        Match.detailed == detailed,
+        Match.llm_provider == provider,
+        Match.llm_model == model
     )
-    model = (
-        match_request.llm_model or
-        current_user.llm_model or
-        settings.default_model_name
+    if settings.match_reuse_max_age_seconds:
+        # Older results are rescored so prompt and model changes take effect
+        query = query.filter(
+            Match.created_at
+            >= datetime.utcnow() - timedelta(seconds=settings.match_reuse_max_age_seconds)
+        )
+    return query.order_by(Match.created_at.desc()).first()
+
+
+def _insert_match(db: Session, match_row: dict) -> dict:
+    """
+    Insert and commit one match, returning its response payload.
+
+    RETURNING hydrates id and defaults in the same round trip, and the
+    payload is built before commit expires the instance.
+    """
+    match = db.scalars(insert(Match).values(**match_row).returning(Match)).one()
+    payload = _match_payload(match)
+    db.commit()
+    return payload
+
+
+def _insert_matches(db: Session, match_rows: List[dict]) -> List[dict]:
+    """Insert and commit a batch of matches in one statement, returning their payloads."""
+    payloads = []
+    if match_rows:
+        # Single multi-row INSERT ... RETURNING instead of one INSERT
+        # plus one refresh SELECT per match
+        matches = db.scalars(insert(Match).returning(Match), match_rows).all()
+        payloads = [_match_payload(match) for match in matches]
+
+    db.commit()
+    return payloads
+
+
+@router.post(
+    "/",
+    response_model=MatchResponse,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(limit_match_concurrency)]
+)
+async def create_match(
+    match_request: MatchRequest,
+    background_tasks: BackgroundTasks,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Create a match between a resume and job description.
+    Returns match score, missing skills, and recommendations.
+    """
+    # psycopg2 calls block, so DB work runs in the threadpool to keep the
+    # event loop free for other requests' LLM calls and streams
+    resume, job = await run_in_threadpool(
+        _load_match_inputs, db, current_user.id, match_request.resume_id, match_request.job_id
+    )
+
+    # Get LLM client - Priority: request > user preference > system default
+    llm_client, provider, model = get_user_llm_client(
+        current_user, match_request.llm_provider, match_request.llm_model
     )
 
-    # Normalize to prevent provider-model mismatches
-    provider, model = normalize_llm_provider_and_model(provider, model)
+    # Reuse an earlier result computed from identical resume and job content
+    resume_hash = resume.content_hash or content_hash(resume.raw_text)
+    job_hash = job.content_hash or job_content_hash(job.description, job.requirements)
 
-    api_key = get_user_llm_api_key(current_user, provider)
+    cached_match = await run_in_threadpool(
+        _find_reusable_match, db, current_user.id, resume.id, job.id,
+        resume_hash, job_hash, match_request.detailed, provider, model
+    )
 
-    if not api_key:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"No API key configured for provider: {provider}"
+    if cached_match:
+        logger.info("Returning cached match", match_id=cached_match.id)
+        return ORJSONResponse(
+            content=_match_payload(cached_match), headers={"X-Match-Cache": "hit"}
         )
 
-    try:
-        llm_client = LLMFactory.create_client(
-            provider=provider,
-            api_key=api_key,
-            model=model
+    # Release the pooled connection while waiting on the LLM; attributes
+    # already loaded stay readable on the now-detached instances
+    await run_in_threadpool(db.close)
+
+    # Duplicate requests (e.g. a client retry) share one reservation, LLM call
+    # and match row instead of each being charged and stored separately
+    payload = await _coalesced(
+        ("match", current_user.id, resume.id, job.id, match_request.detailed, provider, model),
+        lambda: _create_match(
+            current_user, resume, job, resume_hash, job_hash, match_request.detailed,
+            llm_client, background_tasks
         )
+    )
 
-        # Perform matching
-        matcher = JobMatcher(llm_client)
-        job_text = f"{job.description}\n\n{job.requirements or ''}"
+    return ORJSONResponse(content=payload, status_code=status.HTTP_201_CREATED)
 
-        match_result = await matcher.match(
-            resume_text=resume.raw_text,
-            job_description=job_text,
-            detailed=match_request.detailed
+
+async def _create_match(
+    current_user: User,
+    resume: Resume,
+    job: Job,
+    resume_hash: str,
+    job_hash: str,
+    detailed: bool,
+    llm_client: Any,
+    background_tasks: BackgroundTasks
+) -> dict:
+    """
+    Reserve quota, run the LLM match and store it, returning the match payload.
+
+    Runs as a shared step that outlives a disconnecting caller, so it uses
+    its own session rather than the request's. Telemetry is added to the
+    background tasks of the request that started it.
+    """
+    db = SessionLocal()
+    payload = None
+
+    try:
+        # Check usage limits for free tier. The match is reserved up front so
+        # concurrent requests cannot both pass the limit
+        limit = PLAN_LIMITS.get(current_user.plan, 10)
+        reserved = await run_in_threadpool(
+            reserve_quota, db, current_user, User.matches_used, limit
         )
+        if reserved is None:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail=(
+                    f"Free tier limit reached ({limit} matches). "
+                    "Please upgrade to Pro for unlimited matches."
+                )
+            )
 
-        # Create match record
-        match = Match(
-            user_id=current_user.id,
-            resume_id=resume.id,
-            job_id=job.id,
-            match_score=match_result.get("match_score", 0),
-            missing_skills=match_result.get("missing_skills"),
-            recommendations=match_result.get("recommendations"),
-            explanation=match_result.get("explanation"),
-            ats_score=match_result.get("ats_score"),
-            keyword_matches=match_result.get("keyword_matches"),
-            ats_issues=match_result.get("ats_issues"),
-            llm_provider=match_result["_metadata"]["provider"],
-            llm_model=match_result["_metadata"]["model"],
-            tokens_used=match_result["_metadata"]["tokens_used"],
-            cost_estimate=match_result["_metadata"]["cost_estimate"]
-        )
-
-        db.add(match)
-
-        # Increment user's match usage counter
-        current_user.matches_used += 1
-
-        # Track API usage
-        if settings.enable_cost_tracking:
-            usage = APIUsage(
-                user_id=current_user.id,
-                endpoint="/api/v1/matches",
-                llm_provider=match.llm_provider,
-                llm_model=match.llm_model,
-                tokens_used=match.tokens_used,
-                cost_estimate=match.cost_estimate
+        try:
+            # Perform matching
+            matcher = JobMatcher(llm_client)
+            match_result = await matcher.match(
+                resume_text=resume.raw_text,
+                job_description=job.full_text,
+                detailed=detailed
             )
-            db.add(usage)
 
-        db.commit()
-        db.refresh(match)
-
-        # Track analytics event
-        from app.models.models import Analytics
-        analytics_event = Analytics(
-            user_id=current_user.id,
-            event_type="match_created",
-            event_data={
-                "match_id": match.id,
-                "resume_id": resume.id,
-                "job_id": job.id,
-                "match_score": match.match_score
-            }
-        )
-        db.add(analytics_event)
-        db.commit()
+            match_row, usage_row = match_result_rows(
+                match_result, current_user.id, resume.id, job.id,
+                resume_hash, job_hash, detailed, "/api/v1/matches"
+            )
+            payload = await run_in_threadpool(_insert_match, db, match_row)
 
-        logger.info(
-            "Match created",
-            resume_id=resume.id,
-            job_id=job.id,
-            score=match.match_score
-        )
+            # Track the analytics event and API usage after the response is sent
+            # (write-only telemetry)
+            background_tasks.add_task(
+                record_events, [_match_created_event(current_user.id, payload)]
+            )
+            if settings.enable_cost_tracking:
+                background_tasks.add_task(record_usage, [usage_row])
 
-        return match
+            logger.info(
+                "Match created",
+                resume_id=payload["resume_id"],
+                job_id=payload["job_id"],
+                score=payload["match_score"]
+            )
 
-    except Exception as e:
-        logger.error("Match creation failed", error=str(e))
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Matching failed: {str(e)}"
-        )
+            return payload
 
+        except Exception as e:
+            logger.error("Match creation failed", error=str(e))
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Matching failed: {str(e)}"
+            )
 
-@router.post("/batch", response_model=List[MatchResponse])
-async def create_batch_matches(
+        finally:
+            # Also covers cancellation, which bypasses the except above
+            if payload is None:
+                await run_in_threadpool(release_quota, db, current_user.id, User.matches_used)
+
+    finally:
+        await run_in_threadpool(db.close)
+
+
+def _prepare_batch(
     batch_request: BatchMatchRequest,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
-):
-    """
-    Create matches for multiple resumes against a single job.
-    Useful for screening candidates.
+    current_user: User,
+    db: Session
+) -> Tuple[Job, list, Any, int]:
     """
-    # Check usage limits for free tier (batch counts as number of resumes)
-    PLAN_LIMITS = {
-        "free": 10,
-        "pro": 999999,
-        "enterprise": 999999
-    }
-
-    limit = PLAN_LIMITS.get(current_user.plan, 10)
-    matches_to_create = len(batch_request.resume_ids)
-    # Admin users bypass usage limits
-    if not current_user.is_admin and current_user.matches_used + matches_to_create > limit:
-        remaining = max(0, limit - current_user.matches_used)
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail=f"Free tier limit would be exceeded. You have {remaining} matches remaining. Please upgrade to Pro for unlimited matches."
-        )
+    Validate a batch match request and reserve its quota.
 
+    Returns (job, resumes, llm_client, reserved). The session is closed
+    before returning so no pooled connection is held during the LLM calls.
+    """
     # Verify job ownership
-    job = db.query(Job).filter(
+    job = db.query(Job).options(load_only(*_JOB_COLUMNS)).filter(
         Job.id == batch_request.job_id,
         Job.user_id == current_user.id
     ).first()
@@ -242,134 +478,453 @@ async def create_batch_matches(
             detail="Job not found"
         )
 
-    # Verify all resumes exist and belong to user
-    resumes = db.query(Resume).filter(
-        Resume.id.in_(batch_request.resume_ids),
-        Resume.user_id == current_user.id
+    # Verify all resumes exist and belong to user, fetching only the columns
+    # matching needs (skips parsed_data, embeddings and other wide columns)
+    resumes = db.execute(
+        select(Resume.id, Resume.raw_text, Resume.content_hash).where(
+            Resume.id.in_(batch_request.resume_ids),
+            Resume.user_id == current_user.id,
+            RESUME_UPLOADED
+        )
     ).all()
 
-    if len(resumes) != len(batch_request.resume_ids):
+    if {r.id for r in resumes} != set(batch_request.resume_ids):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="One or more resumes not found"
         )
 
     # Get LLM client - Priority: request > user preference > system default
-    provider = (
-        batch_request.llm_provider or
-        current_user.llm_provider or
-        settings.default_llm_provider
-    )
-    model = (
-        batch_request.llm_model or
-        current_user.llm_model or
-        settings.default_model_name
+    llm_client, _, _ = get_user_llm_client(
+        current_user, batch_request.llm_provider, batch_request.llm_model
     )
 
-    # Normalize to prevent provider-model mismatches
-    provider, model = normalize_llm_provider_and_model(provider, model)
+    # Release the pooled connection while waiting on the LLM; attributes
+    # already loaded stay readable on the now-detached instances
+    db.close()
 
-    api_key = get_user_llm_api_key(current_user, provider)
-
-    if not api_key:
+    # Check usage limits for free tier (batch counts as number of resumes).
+    # Every requested match is reserved up front; failures are released later
+    limit = PLAN_LIMITS.get(current_user.plan, 10)
+    # One match per distinct resume; duplicate IDs in the request are not charged twice
+    matches_to_create = len(resumes)
+    if reserve_quota(db, current_user, User.matches_used, limit, amount=matches_to_create) is None:
+        remaining = max(0, limit - current_user.matches_used)
         raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"No API key configured for provider: {provider}"
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=f"Free tier limit would be exceeded. You have {remaining} matches remaining. Please upgrade to Pro for unlimited matches."
         )
 
-    try:
-        llm_client = LLMFactory.create_client(
-            provider=provider,
-            api_key=api_key,
-            model=model
-        )
+    return job, resumes, llm_client, matches_to_create
+
+
+@router.post(
+    "/batch",
+    response_model=List[MatchResponse],
+    dependencies=[Depends(limit_match_concurrency)]
+)
+async def create_batch_matches(
+    batch_request: BatchMatchRequest,
+    background_tasks: BackgroundTasks,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Create matches for multiple resumes against a single job.
+    Useful for screening candidates.
+    """
+    job, resumes, llm_client, matches_to_create = await run_in_threadpool(
+        _prepare_batch, batch_request, current_user, db
+    )
 
+    try:
         matcher = JobMatcher(llm_client)
-        job_text = f"{job.description}\n\n{job.requirements or ''}"
+        job_text = job.full_text
+        job_hash = job.content_hash or job_content_hash(job.description, job.requirements)
 
         # Batch match
         resume_texts = [r.raw_text for r in resumes]
+
         match_results = await matcher.batch_match(
             resume_texts=resume_texts,
             job_description=job_text,
             detailed=batch_request.detailed
         )
 
-        # Create match records
-        matches = []
-        for resume, result in zip(resumes, match_results):
+        # Accumulate match rows so the whole batch is written in one statement
+        match_rows = []
+        usage_rows = []
+        # batch_match returns results sorted by score; pair them back to
+        # their resume through resume_index
+        for result in match_results:
+            resume = resumes[result["resume_index"]]
             if "error" in result:
                 logger.warning(f"Match failed for resume {resume.id}", error=result["error"])
                 continue
 
-            match = Match(
-                user_id=current_user.id,
-                resume_id=resume.id,
-                job_id=job.id,
-                match_score=result.get("match_score", 0),
-                missing_skills=result.get("missing_skills"),
-                recommendations=result.get("recommendations"),
-                explanation=result.get("explanation"),
-                llm_provider=result["_metadata"]["provider"],
-                llm_model=result["_metadata"]["model"],
-                tokens_used=result["_metadata"]["tokens_used"],
-                cost_estimate=result["_metadata"]["cost_estimate"]
+            match_row, usage_row = match_result_rows(
+                result, current_user.id, resume.id, job.id,
+                resume.content_hash or content_hash(resume.raw_text), job_hash,
+                batch_request.detailed, "/api/v1/matches/batch"
             )
-
-            db.add(match)
-            matches.append(match)
+            match_rows.append(match_row)
 
             # Track API usage
             if settings.enable_cost_tracking:
-                usage = APIUsage(
-                    user_id=current_user.id,
-                    endpoint="/api/v1/matches/batch",
-                    llm_provider=match.llm_provider,
-                    llm_model=match.llm_model,
-                    tokens_used=match.tokens_used,
-                    cost_estimate=match.cost_estimate
-                )
-                db.add(usage)
+                usage_rows.append(usage_row)
 
-        # Increment user's match usage counter by number of successful matches
-        current_user.matches_used += len(matches)
+        payloads = await run_in_threadpool(_insert_matches, db, match_rows)
 
-        db.commit()
+        # Only successful matches count against usage
+        await run_in_threadpool(
+            release_quota, db, current_user.id, User.matches_used,
+            matches_to_create - len(match_rows)
+        )
 
-        for match in matches:
-            db.refresh(match)
+        # Bulk insert analytics events and usage rows after the response is sent
+        if payloads:
+            background_tasks.add_task(
+                record_events,
+                [_match_created_event(current_user.id, payload) for payload in payloads]
+            )
+        if usage_rows:
+            background_tasks.add_task(record_usage, usage_rows)
 
         logger.info(
             "Batch matches created",
             job_id=job.id,
-            num_matches=len(matches)
+            num_matches=len(payloads)
         )
 
-        return matches
+        return ORJSONResponse(content=payloads)
 
     except Exception as e:
         logger.error("Batch matching failed", error=str(e))
+        await run_in_threadpool(
+            release_quota, db, current_user.id, User.matches_used, matches_to_create
+        )
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Batch matching failed: {str(e)}"
         )
 
 
+@router.post("/batch/stream")
+async def stream_batch_matches(
+    batch_request: BatchMatchRequest,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Create matches for multiple resumes against a single job, streamed as NDJSON.
+
+    Each line is a match (same shape as POST /matches/batch items), sent as
+    soon as its LLM call finishes rather than after the whole batch. Lines
+    arrive in completion order, not sorted by score. A failure after the
+    stream has started is reported as a final {"error": ...} line.
+    """
+    # The in-flight slot is held until the stream ends; a yield dependency
+    # would give it back before the body is even sent
+    slot = await acquire_match_slot(current_user.id)
+    try:
+        return await _stream_batch_matches(batch_request, current_user, db, slot)
+    except BaseException:
+        if slot:
+            await release_match_slot(current_user.id, slot)
+        raise
+
+
+async def _stream_batch_matches(
+    batch_request: BatchMatchRequest,
+    current_user: User,
+    db: Session,
+    slot: Optional[str]
+) -> StreamingResponse:
+    """Validate a streamed batch and build its response; see stream_batch_matches."""
+    job, resumes, llm_client, matches_to_create = await run_in_threadpool(
+        _prepare_batch, batch_request, current_user, db
+    )
+
+    matcher = JobMatcher(llm_client)
+    job_text = job.full_text
+    job_hash = job.content_hash or job_content_hash(job.description, job.requirements)
+    resume_texts = [r.raw_text for r in resumes]
+    user_id = current_user.id
+    usage_rows: List[dict] = []
+    event_rows: List[dict] = []
+
+    async def ndjson_stream():
+        # The request's session is already closed once streaming starts
+        stream_db = SessionLocal()
+        created = 0
+        try:
+            async with aclosing(matcher.iter_batch_match(
+                resume_texts, job_text, batch_request.detailed
+            )) as results:
+                async for result in results:
+                    resume = resumes[result["resume_index"]]
+                    if "error" in result:
+                        logger.warning(
+                            f"Match failed for resume {resume.id}", error=result["error"]
+                        )
+                        continue
+
+                    match_row, usage_row = match_result_rows(
+                        result, user_id, resume.id, job.id,
+                        resume.content_hash or content_hash(resume.raw_text), job_hash,
+                        batch_request.detailed, "/api/v1/matches/batch/stream"
+                    )
+
+                    # The row is committed before its line is sent so every
+                    # streamed match ID exists even if the client disconnects
+                    payload = await run_in_threadpool(_insert_match, stream_db, match_row)
+                    created += 1
+                    event_rows.append(_match_created_event(user_id, payload))
+
+                    if settings.enable_cost_tracking:
+                        usage_rows.append(usage_row)
+
+                    yield orjson.dumps(payload) + b"\n"
+
+            logger.info("Batch matches streamed", job_id=job.id, num_matches=created)
+
+        except Exception as e:
+            logger.error("Batch match streaming failed", error=str(e))
+            yield orjson.dumps({"error": "Batch matching failed. Please try again."}) + b"\n"
+
+        finally:
+            # Only successful matches count against usage, including when
+            # the client disconnects mid-stream. Runs inline: a cancelled
+            # stream cannot await the threadpool here
+            release_quota(stream_db, user_id, User.matches_used, matches_to_create - created)
+            stream_db.close()
+
+    # Telemetry collected while streaming is bulk inserted once the stream ends.
+    # Background tasks also run when the client disconnects, so the in-flight
+    # slot is given back there rather than in the generator, which never runs
+    # if the client leaves before the first chunk
+    telemetry = BackgroundTasks()
+    if slot:
+        telemetry.add_task(release_match_slot, user_id, slot)
+    telemetry.add_task(record_events, event_rows)
+    telemetry.add_task(record_usage, usage_rows)
+
+    return StreamingResponse(
+        ndjson_stream(),
+        media_type="application/x-ndjson",
+        background=telemetry
+    )
+
+
+@router.post(
+    "/batch/async",
+    response_model=BatchMatchQueuedResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    dependencies=[Depends(limit_match_concurrency)]
+)
+def queue_batch_matches(
+    batch_request: BatchMatchRequest,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Queue matches for multiple resumes against a single job.
+    Returns immediately with a batch job ID; poll GET /matches/batch/{batch_job_id}
+    for progress. Each resume becomes a match task pulled by Celery workers.
+    """
+    # Verify job ownership
+    job = db.query(Job).filter(
+        Job.id == batch_request.job_id,
+        Job.user_id == current_user.id
+    ).first()
+
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found"
+        )
+
+    # Verify all resumes exist and belong to user
+    resume_ids = set(db.execute(
+        select(Resume.id).where(
+            Resume.id.in_(batch_request.resume_ids),
+            Resume.user_id == current_user.id,
+            RESUME_UPLOADED
+        )
+    ).scalars())
+
+    if resume_ids != set(batch_request.resume_ids):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="One or more resumes not found"
+        )
+
+    # Resolve LLM settings - Priority: request > user preference > system default
+    provider, model, _ = resolve_user_llm(
+        current_user, batch_request.llm_provider, batch_request.llm_model
+    )
+
+    try:
+        # Celery is optional (not installed in every deployment)
+        from app.tasks.match_tasks import process_match_tasks
+    except ImportError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Queued batch matching is not available"
+        )
+
+    # Check usage limits for free tier (batch counts as number of resumes).
+    # Every queued match is reserved up front; workers release failed tasks
+    limit = PLAN_LIMITS.get(current_user.plan, 10)
+    matches_to_create = len(resume_ids)
+    if reserve_quota(db, current_user, User.matches_used, limit, amount=matches_to_create) is None:
+        remaining = max(0, limit - current_user.matches_used)
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=f"Free tier limit would be exceeded. You have {remaining} matches remaining. Please upgrade to Pro for unlimited matches."
+        )
+
+    batch_job = BatchJob(
+        user_id=current_user.id,
+        job_type="match",
+        status="pending",
+        total_items=len(resume_ids)
+    )
+    db.add(batch_job)
+    db.flush()
+
+    # Enqueue one task per resume in a single multi-row INSERT
+    task_ids = list(db.execute(
+        insert(MatchTask).values([
+            {
+                "batch_job_id": batch_job.id,
+                "user_id": current_user.id,
+                "job_id": job.id,
+                "resume_id": resume_id,
+                "status": "pending"
+            }
+            for resume_id in sorted(resume_ids)
+        ]).returning(MatchTask.id)
+    ).scalars())
+    try:
+        db.commit()
+    except Exception:
+        release_quota(db, current_user.id, User.matches_used, matches_to_create)
+        raise
+
+    # Several workers drain the same batch in parallel via SKIP LOCKED
+    try:
+        workers = max(1, min(len(task_ids), settings.batch_match_workers))
+        for _ in range(workers):
+            result = process_match_tasks.delay(
+                batch_job.id, provider, model, batch_request.detailed
+            )
+        batch_job.celery_task_id = result.id
+        db.commit()
+    except Exception as e:
+        logger.error(
+            "Failed to dispatch batch match workers", batch_job_id=batch_job.id, error=str(e)
+        )
+        batch_job.status = "failed"
+        batch_job.error_message = str(e)
+        db.commit()
+        release_quota(db, current_user.id, User.matches_used, matches_to_create)
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Queued batch matching is not available"
+        )
+
+    logger.info(
+        "Batch matches queued",
+        batch_job_id=batch_job.id,
+        job_id=job.id,
+        num_tasks=len(task_ids)
+    )
+
+    return BatchMatchQueuedResponse(
+        batch_job_id=batch_job.id,
+        task_ids=task_ids,
+        status=batch_job.status
+    )
+
+
+@router.get("/batch/{batch_job_id}", response_model=BatchJobResponse)
+def get_batch_matches(
+    batch_job_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Get progress of a queued batch, including per-resume task status.
+    """
+    batch_job = db.query(BatchJob).filter(
+        BatchJob.id == batch_job_id,
+        BatchJob.user_id == current_user.id
+    ).first()
+
+    if not batch_job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Batch job not found"
+        )
+
+    rows = db.query(
+        MatchTask.id,
+        MatchTask.resume_id,
+        MatchTask.status,
+        MatchTask.match_id,
+        MatchTask.error_message,
+        Match.match_score
+    ).outerjoin(Match, Match.id == MatchTask.match_id).filter(
+        MatchTask.batch_job_id == batch_job.id
+    ).order_by(MatchTask.id).all()
+
+    tasks = [
+        {
+            "task_id": row.id,
+            "resume_id": row.resume_id,
+            "status": row.status,
+            "match_id": row.match_id,
+            "match_score": row.match_score,
+            "error": row.error_message
+        }
+        for row in rows
+    ]
+
+    return BatchJobResponse(
+        id=batch_job.id,
+        job_type=batch_job.job_type,
+        status=batch_job.status,
+        total_items=batch_job.total_items,
+        processed_items=batch_job.processed_items or 0,
+        failed_items=batch_job.failed_items or 0,
+        results={"tasks": tasks},
+        created_at=batch_job.created_at,
+        completed_at=batch_job.completed_at
+    )
+
+
 @router.get("/", response_model=List[MatchResponse])
-async def list_matches(
+def list_matches(
     resume_id: int = None,
     job_id: int = None,
     min_score: float = 0,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
-    List all matches for the current user.
+    List all matches for the current user, newest first.
     Can filter by resume_id, job_id, or minimum score.
+
+    Pass the X-Next-Cursor header of a page back as `cursor` to fetch the
+    next page; unlike `skip`, this costs the same for every page.
     """
-    query = db.query(Match).filter(Match.user_id == current_user.id)
+    query = db.query(Match).options(load_only(*_MATCH_RESPONSE_COLUMNS)).filter(
+        Match.user_id == current_user.id
+    )
 
     if resume_id:
         query = query.filter(Match.resume_id == resume_id)
@@ -380,21 +935,36 @@ async def list_matches(
     if min_score > 0:
         query = query.filter(Match.match_score >= min_score)
 
-    matches = query.order_by(Match.created_at.desc()).offset(skip).limit(limit).all()
+    if cursor:
+        # Seek past the previous page instead of scanning and discarding rows
+        query = query.filter(tuple_(Match.created_at, Match.id) < decode_cursor(cursor))
+    elif skip:
+        query = query.offset(skip)
+
+    matches = query.order_by(Match.created_at.desc(), Match.id.desc()).limit(limit).all()
 
-    return matches
+    headers = {}
+    if len(matches) == limit and matches[-1].created_at is not None:
+        headers["X-Next-Cursor"] = encode_cursor(matches[-1])
+
+    return ORJSONResponse(content=[_match_payload(match) for match in matches], headers=headers)
 
 
 @router.get("/{match_id}", response_model=MatchResponse)
-async def get_match(
+def get_match(
     match_id: int,
+    request: Request,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     Get a specific match by ID.
+
+    Responds 304 Not Modified when If-None-Match carries the current ETag.
     """
-    match = db.query(Match).filter(
+    match = db.query(Match).options(
+        load_only(*_MATCH_RESPONSE_COLUMNS, Match.updated_at)
+    ).filter(
         Match.id == match_id,
         Match.user_id == current_user.id
     ).first()
@@ -405,7 +975,39 @@ async def get_match(
             detail="Match not found"
         )
 
-    return match
+    version = match.updated_at or match.created_at
+    etag = make_etag(str(match.id), version.isoformat() if version else "")
+    unchanged = not_modified(request, etag)
+    if unchanged is not None:
+        return unchanged
+
+    return ORJSONResponse(content=_match_payload(match), headers={"ETag": etag})
+
+
+def _delete_owned_match(db: Session, match_id: int, user_id: int) -> bool:
+    """
+    Delete a user's match without loading it. Returns False if not found.
+
+    Applications pointing at the match are detached first, as the ORM
+    delete did.
+    """
+    owned = select(Match.id).where(Match.id == match_id, Match.user_id == user_id)
+
+    db.query(Application).filter(Application.match_id.in_(owned)).update(
+        {Application.match_id: None},
+        synchronize_session=False
+    )
+    deleted = db.query(Match).filter(
+        Match.id == match_id,
+        Match.user_id == user_id
+    ).delete(synchronize_session=False)
+
+    if not deleted:
+        db.rollback()
+        return False
+
+    db.commit()
+    return True
 
 
 @router.delete("/{match_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -417,23 +1019,62 @@ async def delete_match(
     """
     Delete a match.
     """
-    match = db.query(Match).filter(
-        Match.id == match_id,
-        Match.user_id == current_user.id
-    ).first()
-
-    if not match:
+    if not await run_in_threadpool(_delete_owned_match, db, match_id, current_user.id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Match not found"
         )
 
-    db.delete(match)
-    db.commit()
+    # Downloads are served from this cache first
+    await cache_delete(
+        generated_content_key(current_user.id, match_id, "interview_prep"),
+        generated_content_key(current_user.id, match_id, "cover_letter")
+    )
 
     return None
 
 
+def _shared_content_inputs(resume: Resume, job: Job, provider: str, model: str) -> Tuple[str, ...]:
+    """Inputs that fully determine generated interview prep / cover letter text."""
+    return (
+        resume.content_hash or content_hash(resume.raw_text),
+        job.content_hash or job_content_hash(job.description, job.requirements),
+        job.title,
+        job.company or "",
+        provider,
+        model,
+    )
+
+
+def _save_generated_content(db: Session, match_id: int, kind: str, result: dict) -> None:
+    """Write generated content onto the match."""
+    column = Match.interview_prep_data if kind == "interview_prep" else Match.cover_letter_data
+
+    db.query(Match).filter(Match.id == match_id).update(
+        {column: result},
+        synchronize_session=False
+    )
+
+    db.commit()
+
+
+async def _store_generated_content(
+    db: Session,
+    user_id: int,
+    match_id: int,
+    kind: str,
+    result: dict,
+    job: Job
+) -> None:
+    """Save generated content on the match and refresh its download cache entry."""
+    # Build the entry before commit expires the loaded job
+    entry = _generated_content_entry(result, job)
+
+    await run_in_threadpool(_save_generated_content, db, match_id, kind, result)
+
+    await cache_set_json(generated_content_key(user_id, match_id, kind), entry)
+
+
 @router.post("/{match_id}/interview-prep", response_model=InterviewPrepResponse)
 async def generate_interview_prep(
     match_id: int,
@@ -445,11 +1086,10 @@ async def generate_interview_prep(
     Generate interview preparation questions based on the match.
     Returns cached data if available unless regenerate=true.
     """
-    # Get match
-    match = db.query(Match).filter(
-        Match.id == match_id,
-        Match.user_id == current_user.id
-    ).first()
+    # Get match with its resume and job
+    match, resume, job = await run_in_threadpool(
+        _load_match_with_context, db, match_id, current_user.id
+    )
 
     if not match:
         raise HTTPException(
@@ -462,24 +1102,82 @@ async def generate_interview_prep(
         logger.info("Returning cached interview prep", match_id=match_id)
         return match.interview_prep_data
 
-    # Check usage limits for free tier (only when generating new content)
-    INTERVIEW_PREP_LIMITS = {
-        "free": 3,
-        "pro": 999999,
-        "enterprise": 999999
-    }
+    if not resume or not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Resume or job not found"
+        )
+
+    # Get LLM client
+    llm_client, provider, model = get_user_llm_client(current_user)
+
+    # Identical resume and job text yield the same questions for any user;
+    # reuse them without an LLM call or a quota charge
+    shared_key = shared_content_key(
+        "interview_prep", *_shared_content_inputs(resume, job, provider, model)
+    )
+    if not regenerate:
+        shared = await cache_get_json(shared_key)
+        if shared is not None:
+            await _store_generated_content(
+                db, current_user.id, match_id, "interview_prep", shared, job
+            )
+            logger.info("Reusing shared interview prep", match_id=match_id)
+            return shared
+
+    # Release the pooled connection while waiting on the LLM; attributes
+    # already loaded stay readable on the now-detached instances
+    await run_in_threadpool(db.close)
+
+    # Generate interview prep
+    generator = InterviewGenerator(llm_client)
+    resume_text = resume.raw_text
+    job_description = job.full_text
+
+    return await _coalesced(
+        ("interview_prep", current_user.id, match_id, provider, model),
+        lambda: _generate_content(
+            current_user, match_id, "interview_prep", job, shared_key,
+            User.interview_preps_used, INTERVIEW_PREP_LIMITS.get(current_user.plan, 3),
+            lambda: generator.generate_questions(
+                resume_text=resume_text,
+                job_description=job_description,
+                job_title=job.title,
+                company=job.company or "the company"
+            )
+        )
+    )
+
 
-    limit = INTERVIEW_PREP_LIMITS.get(current_user.plan, 3)
-    # Admin users bypass usage limits
-    if not current_user.is_admin and current_user.interview_preps_used >= limit:
+@router.post("/{match_id}/cover-letter", response_model=CoverLetterResponse)
+async def generate_cover_letter(
+    match_id: int,
+    request: CoverLetterRequest,
+    regenerate: bool = False,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Generate a cover letter based on the match.
+    Returns cached data if available unless regenerate=true or tone has changed.
+    """
+    # Get match with its resume and job
+    match, resume, job = await run_in_threadpool(
+        _load_match_with_context, db, match_id, current_user.id
+    )
+
+    if not match:
         raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail=f"Free tier limit reached ({limit} interview preps). Please upgrade to Pro for unlimited access."
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Match not found"
         )
 
-    # Get resume and job
-    resume = db.query(Resume).filter(Resume.id == match.resume_id).first()
-    job = db.query(Job).filter(Job.id == match.job_id).first()
+    # Check if we have cached data with the same tone
+    if match.cover_letter_data and not regenerate:
+        cached_tone = match.cover_letter_data.get("tone", "professional")
+        if cached_tone == request.tone:
+            logger.info("Returning cached cover letter", match_id=match_id)
+            return match.cover_letter_data
 
     if not resume or not job:
         raise HTTPException(
@@ -488,63 +1186,162 @@ async def generate_interview_prep(
         )
 
     # Get LLM client
-    provider = current_user.llm_provider or settings.default_llm_provider
-    model = current_user.llm_model or settings.default_model_name
+    llm_client, provider, model = get_user_llm_client(current_user)
 
-    # Normalize to prevent provider-model mismatches
-    provider, model = normalize_llm_provider_and_model(provider, model)
+    # Identical resume and job text in the same tone yield the same letter
+    # for any user; reuse it without an LLM call or a quota charge
+    shared_key = shared_content_key(
+        "cover_letter", *_shared_content_inputs(resume, job, provider, model), request.tone
+    )
+    if not regenerate:
+        shared = await cache_get_json(shared_key)
+        if shared is not None:
+            await _store_generated_content(
+                db, current_user.id, match_id, "cover_letter", shared, job
+            )
+            logger.info("Reusing shared cover letter", match_id=match_id, tone=request.tone)
+            return shared
 
-    api_key = get_user_llm_api_key(current_user, provider)
+    # Release the pooled connection while waiting on the LLM; attributes
+    # already loaded stay readable on the now-detached instances
+    await run_in_threadpool(db.close)
 
-    if not api_key:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"No API key configured for provider: {provider}"
+    # Generate cover letter
+    generator = CoverLetterGenerator(llm_client)
+    resume_text = resume.raw_text
+    job_description = job.full_text
+
+    async def generate() -> dict:
+        result = await generator.generate(
+            resume_text=resume_text,
+            job_title=job.title,
+            company=job.company or "the company",
+            job_description=job_description,
+            tone=request.tone
         )
+        # Add tone to result for caching
+        return {**result, "tone": request.tone}
+
+    return await _coalesced(
+        ("cover_letter", current_user.id, match_id, request.tone, provider, model),
+        lambda: _generate_content(
+            current_user, match_id, "cover_letter", job, shared_key,
+            User.cover_letters_used, COVER_LETTER_LIMITS.get(current_user.plan, 3),
+            generate
+        )
+    )
+
+
+# Quota label and failure message of each kind of generated content
+_GENERATED_CONTENT_MESSAGES = {
+    "interview_prep": (
+        "interview preps", "Failed to generate interview preparation. Please try again."
+    ),
+    "cover_letter": ("cover letters", "Failed to generate cover letter. Please try again."),
+}
+
+
+async def _generate_content(
+    current_user: User,
+    match_id: int,
+    kind: str,
+    job: Job,
+    shared_key: str,
+    counter: Any,
+    limit: int,
+    generate: Callable[[], Awaitable[dict]]
+) -> dict:
+    """
+    Reserve quota, generate interview prep or a cover letter and store it.
+
+    Runs as a shared step that outlives a disconnecting caller, so it uses
+    its own session rather than the request's.
+
+    Args:
+        current_user: User to charge
+        match_id: Match the content belongs to
+        kind: "interview_prep" or "cover_letter"
+        job: Job of the match, for the download cache entry
+        shared_key: Cache key shared by requests with identical inputs
+        counter: Usage column to reserve on, e.g. User.cover_letters_used
+        limit: Plan limit for the counter
+        generate: Makes the LLM call and returns the content to store
+    """
+    label, failure_detail = _GENERATED_CONTENT_MESSAGES[kind]
+    db = SessionLocal()
+    stored = False
 
     try:
-        llm_client = LLMFactory.create_client(
-            provider=provider,
-            api_key=api_key,
-            model=model
-        )
+        # Check usage limits for free tier (only when generating new content),
+        # reserving the usage before the LLM call
+        usage = await run_in_threadpool(reserve_quota, db, current_user, counter, limit)
+        if usage is None:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail=(
+                    f"Free tier limit reached ({limit} {label}). "
+                    "Please upgrade to Pro for unlimited access."
+                )
+            )
 
-        # Generate interview prep
-        generator = InterviewGenerator(llm_client)
-        result = await generator.generate_questions(
-            resume_text=resume.raw_text,
-            job_description=f"{job.description}\n\n{job.requirements or ''}",
-            job_title=job.title,
-            company=job.company or "the company"
-        )
+        try:
+            result = await generate()
 
-        # Cache the result
-        match.interview_prep_data = result
+            # Cache the result
+            await _store_generated_content(db, current_user.id, match_id, kind, result, job)
+            stored = True
+            await cache_set_json(shared_key, result, ttl=settings.shared_content_cache_ttl)
 
-        # Increment usage counter
-        current_user.interview_preps_used += 1
+            logger.info("Generated content cached", kind=kind, match_id=match_id, usage=usage)
 
-        db.commit()
+            return result
 
-        logger.info(
-            "Interview prep generated and cached",
-            match_id=match_id,
-            usage=current_user.interview_preps_used
-        )
+        except Exception as e:
+            logger.error("Content generation failed", kind=kind, error=str(e))
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=failure_detail
+            )
+
+        finally:
+            # Also covers cancellation, which bypasses the except above
+            if not stored:
+                await run_in_threadpool(release_quota, db, current_user.id, counter)
+
+    finally:
+        await run_in_threadpool(db.close)
+
+
+def _save_streamed_cover_letter(match_id: int, user_id: int, outcome: dict) -> None:
+    """
+    Cache a streamed cover letter on the match.
+
+    Runs after the stream has been sent. If the stream failed or the client
+    disconnected before the letter was complete, the usage reserved for it
+    is released instead.
+    """
+    result = outcome.get("result")
 
-        return result
+    db = SessionLocal()
+    try:
+        if result is None:
+            release_quota(db, user_id, User.cover_letters_used)
+            return
 
+        db.query(Match).filter(Match.id == match_id).update(
+            {Match.cover_letter_data: result},
+            synchronize_session=False
+        )
+        db.commit()
     except Exception as e:
-        logger.error("Interview prep generation failed", error=str(e))
         db.rollback()
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to generate interview preparation. Please try again."
-        )
+        logger.error("Failed to cache streamed cover letter", match_id=match_id, error=str(e))
+    finally:
+        db.close()
 
 
-@router.post("/{match_id}/cover-letter", response_model=CoverLetterResponse)
-async def generate_cover_letter(
+@router.post("/{match_id}/cover-letter/stream")
+async def stream_cover_letter(
     match_id: int,
     request: CoverLetterRequest,
     regenerate: bool = False,
@@ -552,14 +1349,14 @@ async def generate_cover_letter(
     db: Session = Depends(get_db)
 ):
     """
-    Generate a cover letter based on the match.
-    Returns cached data if available unless regenerate=true or tone has changed.
+    Stream a cover letter as server-sent events.
+    Emits "data" events with text deltas, then a "done" event with the full
+    result, which is cached on the match like the non-streaming endpoint.
     """
-    # Get match
-    match = db.query(Match).filter(
-        Match.id == match_id,
-        Match.user_id == current_user.id
-    ).first()
+    # Get match with its resume and job
+    match, resume, job = await run_in_threadpool(
+        _load_match_with_context, db, match_id, current_user.id
+    )
 
     if not match:
         raise HTTPException(
@@ -567,166 +1364,192 @@ async def generate_cover_letter(
             detail="Match not found"
         )
 
-    # Check if we have cached data with the same tone
+    # Replay cached data with the same tone as a single event
     if match.cover_letter_data and not regenerate:
         cached_tone = match.cover_letter_data.get("tone", "professional")
         if cached_tone == request.tone:
             logger.info("Returning cached cover letter", match_id=match_id)
-            return match.cover_letter_data
+            return StreamingResponse(
+                iter([sse_event(match.cover_letter_data, event="done")]),
+                media_type="text/event-stream",
+                headers=SSE_HEADERS
+            )
 
-    # Check usage limits for free tier (only when generating new content)
-    COVER_LETTER_LIMITS = {
-        "free": 3,
-        "pro": 999999,
-        "enterprise": 999999
-    }
+    if not resume or not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Resume or job not found"
+        )
 
+    # Get LLM client
+    llm_client, provider, model = get_user_llm_client(current_user)
+
+    # Don't hold a pooled connection for the length of the stream
+    await run_in_threadpool(db.close)
+
+    # Check usage limits for free tier (only when generating new content),
+    # reserving the usage before the LLM call
     limit = COVER_LETTER_LIMITS.get(current_user.plan, 3)
-    # Admin users bypass usage limits
-    if not current_user.is_admin and current_user.cover_letters_used >= limit:
+    reserved = await run_in_threadpool(
+        reserve_quota, db, current_user, User.cover_letters_used, limit
+    )
+    if reserved is None:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail=f"Free tier limit reached ({limit} cover letters). Please upgrade to Pro for unlimited access."
         )
 
-    # Get resume and job
-    resume = db.query(Resume).filter(Resume.id == match.resume_id).first()
-    job = db.query(Job).filter(Job.id == match.job_id).first()
+    generator = CoverLetterGenerator(llm_client)
+    resume_text = resume.raw_text
+    job_description = job.full_text
+    job_title = job.title
+    company = job.company or "the company"
+    user_id = current_user.id
 
-    if not resume or not job:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Resume or job not found"
-        )
+    outcome: dict = {}
 
-    # Get LLM client
-    provider = current_user.llm_provider or settings.default_llm_provider
-    model = current_user.llm_model or settings.default_model_name
+    async def event_stream():
+        parts: List[str] = []
 
-    # Normalize to prevent provider-model mismatches
-    provider, model = normalize_llm_provider_and_model(provider, model)
+        try:
+            chunks = generator.stream(
+                resume_text=resume_text,
+                job_description=job_description,
+                job_title=job_title,
+                company=company,
+                tone=request.tone
+            )
+            async for event in sse_deltas(chunks, parts):
+                yield event
 
-    api_key = get_user_llm_api_key(current_user, provider)
+            result = generator.build_result(
+                cover_letter="".join(parts),
+                resume_text=resume_text,
+                job_title=job_title,
+                company=company,
+                tone=request.tone
+            )
+            outcome["result"] = result
+            await cache_set_json(
+                generated_content_key(user_id, match_id, "cover_letter"),
+                _generated_content_entry(result, job)
+            )
+            yield sse_event(result, event="done")
 
-    if not api_key:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"No API key configured for provider: {provider}"
-        )
+            logger.info("Cover letter streamed", match_id=match_id, tone=request.tone)
 
-    try:
-        llm_client = LLMFactory.create_client(
-            provider=provider,
-            api_key=api_key,
-            model=model
-        )
+        except Exception as e:
+            logger.error("Cover letter streaming failed", error=str(e))
+            yield sse_event(
+                {"detail": "Failed to generate cover letter. Please try again."},
+                event="error"
+            )
 
-        # Generate cover letter
-        generator = CoverLetterGenerator(llm_client)
-        result = await generator.generate(
-            resume_text=resume.raw_text,
-            job_title=job.title,
-            company=job.company or "the company",
-            job_description=f"{job.description}\n\n{job.requirements or ''}",
-            tone=request.tone
-        )
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS,
+        background=BackgroundTask(_save_streamed_cover_letter, match_id, user_id, outcome)
+    )
 
-        # Add tone to result for caching
-        result["tone"] = request.tone
 
-        # Cache the result
-        match.cover_letter_data = result
+# Anything outside this set is collapsed to "_" in download filenames, which
+# also keeps quotes and CR/LF from job titles out of Content-Disposition
+_UNSAFE_FILENAME_CHARS = re.compile(r"[^A-Za-z0-9]+")
 
-        # Increment usage counter
-        current_user.cover_letters_used += 1
+_DOCUMENT_MEDIA_TYPES = {
+    "pdf": "application/pdf",
+    "docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+}
 
-        db.commit()
 
-        logger.info(
-            "Cover letter generated and cached",
-            match_id=match_id,
-            tone=request.tone,
-            usage=current_user.cover_letters_used
-        )
+def _attachment_filename(kind: str, job_title: str, format: str) -> str:
+    """Download filename such as cover_letter_Backend_Engineer_20240131.pdf."""
+    safe_title = _UNSAFE_FILENAME_CHARS.sub("_", job_title).strip("_") or "document"
+    return f"{kind}_{safe_title}_{date.today():%Y%m%d}.{format}"
 
-        return result
 
-    except Exception as e:
-        logger.error("Cover letter generation failed", error=str(e))
-        db.rollback()
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to generate cover letter. Please try again."
-        )
+async def _document_response(
+    etag: str,
+    format: str,
+    kind: str,
+    title: str,
+    render: Callable[..., io.BytesIO],
+    **render_kwargs: Any
+) -> StreamingResponse:
+    """
+    Render a generated document, reusing cached bytes for the same ETag.
+
+    Repeat downloads of unchanged content skip reportlab/python-docx; the
+    rendered bytes are cached in Redis keyed by the ETag and format. title
+    only names the file; the renderers take their own job_title keyword.
+    """
+    file_stream = await render_document(
+        render, cache_key=document_key(etag, format), **render_kwargs
+    )
+
+    filename = _attachment_filename(kind, title, format)
+    return StreamingResponse(
+        iter_buffer(file_stream),
+        media_type=_DOCUMENT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f"attachment; filename={filename}", "ETag": etag}
+    )
 
 
 @router.get("/{match_id}/cover-letter/download")
 async def download_cover_letter(
     match_id: int,
+    request: Request,
     format: str = Query("pdf", regex="^(pdf|docx)$"),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
     Download the generated cover letter as PDF or DOCX.
-    Requires cover letter to be generated first.
+    Requires cover letter to be generated first. Responds 304 Not Modified
+    when If-None-Match carries the current ETag.
     """
-    # Get match
-    match = db.query(Match).filter(
-        Match.id == match_id,
-        Match.user_id == current_user.id
-    ).first()
+    cached = await _get_generated_content(db, current_user.id, match_id, "cover_letter")
 
-    if not match:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Match not found"
-        )
-
-    if not match.cover_letter_data:
+    if not cached["data"]:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Cover letter not generated yet. Generate it first."
         )
 
-    # Get resume for contact info
-    resume = db.query(Resume).filter(Resume.id == match.resume_id).first()
-    job = db.query(Job).filter(Job.id == match.job_id).first()
+    cover_letter_data = cached["data"]
+    cover_letter_text = cover_letter_data.get("cover_letter", "")
+    candidate_name = cover_letter_data.get("candidate_name", "Candidate")
+    company = cover_letter_data.get("company", cached["company"])
+    job_title = cover_letter_data.get("job_title", cached["job_title"])
 
-    try:
-        cover_letter_text = match.cover_letter_data.get("cover_letter", "")
-        candidate_name = match.cover_letter_data.get("candidate_name", "Candidate")
-        company = match.cover_letter_data.get("company", job.company if job else "Company")
-        job_title = match.cover_letter_data.get("job_title", job.title if job else "Position")
-
-        # Extract email from resume if available
-        candidate_email = current_user.email
-
-        if format == "pdf":
-            file_stream = CoverLetterGenerator.create_pdf(
-                cover_letter_text=cover_letter_text,
-                candidate_name=candidate_name,
-                candidate_email=candidate_email,
-                company=company,
-                job_title=job_title
-            )
-            media_type = "application/pdf"
-            filename = f"cover_letter_{job_title.replace(' ', '_')}_{datetime.now().strftime('%Y%m%d')}.pdf"
-        else:  # docx
-            file_stream = CoverLetterGenerator.create_docx(
-                cover_letter_text=cover_letter_text,
-                candidate_name=candidate_name,
-                candidate_email=candidate_email,
-                company=company,
-                job_title=job_title
-            )
-            media_type = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
-            filename = f"cover_letter_{job_title.replace(' ', '_')}_{datetime.now().strftime('%Y%m%d')}.docx"
+    # Extract email from resume if available
+    candidate_email = current_user.email
 
-        return StreamingResponse(
-            file_stream,
-            media_type=media_type,
-            headers={"Content-Disposition": f"attachment; filename={filename}"}
+    etag = make_etag(
+        "cover_letter", format, orjson.dumps(cover_letter_data, option=orjson.OPT_SORT_KEYS),
+        company, job_title, candidate_email
+    )
+    unchanged = not_modified(request, etag)
+    if unchanged is not None:
+        return unchanged
+
+    try:
+        render = (
+            CoverLetterGenerator.create_pdf if format == "pdf"
+            else CoverLetterGenerator.create_docx
+        )
+        return await _document_response(
+            etag,
+            format,
+            "cover_letter",
+            job_title,
+            render,
+            cover_letter_text=cover_letter_text,
+            candidate_name=candidate_name,
+            candidate_email=candidate_email,
+            company=company,
+            job_title=job_title
         )
 
     except Exception as e:
@@ -740,60 +1563,48 @@ async def download_cover_letter(
 @router.get("/{match_id}/interview-prep/download")
 async def download_interview_prep(
     match_id: int,
+    request: Request,
     format: str = Query("pdf", regex="^(pdf|docx)$"),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
     Download the generated interview prep as PDF or DOCX.
-    Requires interview prep to be generated first.
+    Requires interview prep to be generated first. Responds 304 Not Modified
+    when If-None-Match carries the current ETag.
     """
-    # Get match
-    match = db.query(Match).filter(
-        Match.id == match_id,
-        Match.user_id == current_user.id
-    ).first()
+    cached = await _get_generated_content(db, current_user.id, match_id, "interview_prep")
 
-    if not match:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Match not found"
-        )
-
-    if not match.interview_prep_data:
+    if not cached["data"]:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Interview prep not generated yet. Generate it first."
         )
 
-    # Get job info
-    job = db.query(Job).filter(Job.id == match.job_id).first()
-
-    try:
-        job_title = job.title if job else "Position"
-        company = job.company if job else "Company"
+    job_title = cached["job_title"]
+    company = cached["company"]
 
-        if format == "pdf":
-            file_stream = InterviewGenerator.create_pdf(
-                interview_data=match.interview_prep_data,
-                job_title=job_title,
-                company=company
-            )
-            media_type = "application/pdf"
-            filename = f"interview_prep_{job_title.replace(' ', '_')}_{datetime.now().strftime('%Y%m%d')}.pdf"
-        else:  # docx
-            file_stream = InterviewGenerator.create_docx(
-                interview_data=match.interview_prep_data,
-                job_title=job_title,
-                company=company
-            )
-            media_type = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
-            filename = f"interview_prep_{job_title.replace(' ', '_')}_{datetime.now().strftime('%Y%m%d')}.docx"
+    etag = make_etag(
+        "interview_prep", format, orjson.dumps(cached["data"], option=orjson.OPT_SORT_KEYS),
+        company, job_title
+    )
+    unchanged = not_modified(request, etag)
+    if unchanged is not None:
+        return unchanged
 
-        return StreamingResponse(
-            file_stream,
-            media_type=media_type,
-            headers={"Content-Disposition": f"attachment; filename={filename}"}
+    try:
+        render = (
+            InterviewGenerator.create_pdf if format == "pdf" else InterviewGenerator.create_docx
+        )
+        return await _document_response(
+            etag,
+            format,
+            "interview_prep",
+            job_title,
+            render,
+            interview_data=cached["data"],
+            job_title=job_title,
+            company=company
         )
 
     except Exception as e:
@@ -1,35 +1,85 @@
 """
 Resume management endpoints.
 """
+import asyncio
 import hashlib
-from typing import List, Optional
-from pydantic import BaseModel
+import os
 from datetime import datetime
-
-from fastapi import APIRouter, Depends, File, HTTPException, UploadFile, status, Query
-from sqlalchemy.orm import Session
-
-from app.api.schemas import ResumeResponse, ResumeUpload
+from typing import Any, Dict, List, Optional, Tuple
+
+import orjson
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    File,
+    HTTPException,
+    Query,
+    Response,
+    UploadFile,
+    status,
+)
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from sqlalchemy import Row, and_, lambda_stmt, select, tuple_
+from sqlalchemy.orm import Session, load_only
+from starlette.background import BackgroundTask
+
+from app.api.schemas import (
+    ResumeAnalysisResponse,
+    ResumeBatchUploadItem,
+    ResumeListItem,
+    ResumeResponse,
+)
 from app.core.auth import get_current_user, get_user_llm_api_key, normalize_llm_provider_and_model
+from app.core.cache import (
+    cache_delete,
+    cache_get_json,
+    cache_set_json,
+    generated_content_key,
+    shared_content_key,
+)
 from app.core.config import settings
+from app.core.downloads import iter_buffer, render_document
 from app.core.llm_providers import LLMFactory
+from app.core.logging_config import get_logger
+from app.core.pagination import decode_cursor, encode_cursor
+from app.core.quota import PLAN_LIMITS, RESUME_REWRITE_LIMITS, release_quota, reserve_quota
+from app.core.sse import SSE_HEADERS, sse_deltas, sse_event
 from app.core.storage import get_storage_client
-from app.models.database import get_db
-from app.models.models import User, Resume, Job, Match
-from app.services.resume_parser import ResumeParser, ResumeAnalyzer, ResumeParseError
-from app.services.resume_rewriter import ResumeRewriter
-from app.services.resume_rewriter_v2 import ResumeRewriterV2
+from app.core.uploads import read_upload
+from app.models.database import SessionLocal, get_db, insert_on_conflict_do_nothing
+from app.models.models import (
+    RESUME_UPLOADED,
+    RESUME_UPLOADING,
+    Application,
+    Job,
+    Match,
+    Resume,
+    User,
+    content_hash,
+)
 from app.services.ats_analyzer import ATSAnalyzer
+from app.services.cover_letter_generator import CoverLetterGenerator
+from app.services.interview_generator import InterviewGenerator
 from app.services.job_matcher import JobMatcher
 from app.services.resume_generator import ResumeGenerator
-from app.services.interview_generator import InterviewGenerator
-from app.services.cover_letter_generator import CoverLetterGenerator
-from fastapi.responses import StreamingResponse
-from app.core.logging_config import get_logger
+from app.services.resume_parser import ResumeAnalyzer, ResumeParseError, ResumeParser
+from app.services.resume_rewriter_v2 import ResumeRewriterV2
 
 router = APIRouter()
 logger = get_logger(__name__)
 
+_ALLOWED_EXTENSIONS = frozenset(settings.allowed_extensions)
+
+# Content types stored with uploaded files, by extension
+_UPLOAD_CONTENT_TYPES = {
+    "pdf": "application/pdf",
+    "docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    "txt": "text/plain"
+}
+
 
 def _generate_validation_message(estimated: float, actual: float, gap: float, actual_improvement: float) -> str:
     """
@@ -57,149 +107,490 @@ def _generate_validation_message(estimated: float, actual: float, gap: float, ac
         return f"Score remains {actual:.0f}%. Most recommended skills were already present or inferred by the matcher. Focus on experience alignment and achievements."
 
 
+def _load_resume_job_match(
+    db: Session,
+    user_id: int,
+    resume_id: int,
+    job_id: int,
+    match_id: Optional[int] = None
+) -> Tuple[Resume, Job, Optional[Match]]:
+    """
+    Load the resume, job and the requested (or most recent) match in one query.
+
+    Raises 404 if the resume or job does not exist or belongs to another user.
+    """
+    if match_id:
+        match_on = and_(Match.id == match_id, Match.user_id == user_id)
+    else:
+        match_on = and_(
+            Match.resume_id == Resume.id,
+            Match.job_id == Job.id,
+            Match.user_id == user_id
+        )
+
+    row = db.query(Resume, Job, Match).select_from(Resume).join(
+        Job, and_(Job.id == job_id, Job.user_id == user_id)
+    ).outerjoin(Match, match_on).filter(
+        Resume.id == resume_id,
+        Resume.user_id == user_id,
+        RESUME_UPLOADED
+    ).order_by(Match.created_at.desc(), Match.id.desc()).first()
+
+    if not row:
+        resume_exists = db.query(Resume.id).filter(
+            Resume.id == resume_id,
+            Resume.user_id == user_id,
+            RESUME_UPLOADED
+        ).first()
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found" if resume_exists else "Resume not found"
+        )
+
+    return tuple(row)
+
+
+def _user_llm_choice(user: User) -> Tuple[str, str]:
+    """The user's preferred (provider, model), falling back to the defaults."""
+    # Normalize to prevent provider-model mismatches
+    return normalize_llm_provider_and_model(
+        user.llm_provider or settings.default_llm_provider,
+        user.llm_model or settings.default_model_name
+    )
+
+
+def _get_llm_client(current_user: User):
+    """Get a shared LLM client for the user's preferred provider and model."""
+    provider, model = _user_llm_choice(current_user)
+
+    api_key = get_user_llm_api_key(current_user, provider)
+    return LLMFactory.get_client(
+        provider=provider,
+        api_key=api_key,
+        model=model
+    )
+
+
+async def _get_or_generate_interview_prep(
+    db: Session,
+    current_user: User,
+    resume: Resume,
+    job: Job,
+    match: Optional[Match],
+    regenerate: bool = False
+) -> Dict[str, Any]:
+    """
+    Get interview prep for a resume/job pair.
+
+    Reuses the copy cached on the match (as the match endpoints do) and only
+    calls the LLM on a cache miss or regenerate, caching the result on the
+    match so the DOCX and PDF downloads render it without another LLM call.
+    """
+    if match and match.interview_prep_data and not regenerate:
+        logger.info("Using cached interview prep", match_id=match.id)
+        return match.interview_prep_data
+
+    generator = InterviewGenerator(_get_llm_client(current_user))
+    interview_data = await generator.generate_questions(
+        resume_text=resume.raw_text,
+        job_description=job.description,
+        job_title=job.title,
+        company=job.company or "the company",
+        match_score=match.match_score if match else None,
+        missing_skills=match.missing_skills if match else None,
+        recommendations=match.recommendations if match else None
+    )
+
+    if match:
+        cache_key = generated_content_key(current_user.id, match.id, "interview_prep")
+        match.interview_prep_data = interview_data
+        db.commit()
+        await cache_delete(cache_key)
+
+    return interview_data
+
+
+async def _get_or_generate_cover_letter(
+    db: Session,
+    current_user: User,
+    resume: Resume,
+    job: Job,
+    match: Optional[Match],
+    tone: str,
+    regenerate: bool = False
+) -> Dict[str, Any]:
+    """
+    Get a cover letter for a resume/job pair.
+
+    Reuses the copy cached on the match when it was written in the same tone
+    and only calls the LLM on a cache miss or regenerate, caching the result
+    on the match.
+    """
+    cached = match.cover_letter_data if match else None
+    if cached and cached.get("tone", "professional") == tone and not regenerate:
+        logger.info("Using cached cover letter", match_id=match.id)
+        return cached
+
+    generator = CoverLetterGenerator(_get_llm_client(current_user))
+    cover_letter_data = await generator.generate(
+        resume_text=resume.raw_text,
+        job_description=job.description,
+        job_title=job.title,
+        company=job.company or "the company",
+        tone=tone
+    )
+    cover_letter_data["tone"] = tone
+
+    if match:
+        cache_key = generated_content_key(current_user.id, match.id, "cover_letter")
+        match.cover_letter_data = cover_letter_data
+        db.commit()
+        await cache_delete(cache_key)
+
+    return cover_letter_data
+
+
 # Schema for improved resume download
 class ImprovedResumeDownloadRequest(BaseModel):
     match_id: int
     format: str = "pdf"  # pdf or docx
 
 
-@router.post("/upload", response_model=ResumeResponse, status_code=status.HTTP_201_CREATED)
-async def upload_resume(
-    file: UploadFile = File(...),
-    analyze: bool = True,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
-):
+def _resume_analysis_key(user: User, text: str) -> str:
     """
-    Upload and parse a resume.
-    Optionally analyze it with LLM.
+    Shared cache key for the LLM analysis of resume text.
+
+    Analysis depends only on the text and model, so identical resumes
+    (re-uploads, common templates) are analyzed once across all users.
     """
-    # Validate file size
-    content = await file.read()
-    if len(content) > settings.max_upload_size_bytes:
-        raise HTTPException(
-            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
-            detail=f"File too large. Max size: {settings.max_upload_size_mb}MB"
-        )
+    provider, model = _user_llm_choice(user)
+    return shared_content_key("resume_analysis", content_hash(text), provider, model)
 
-    # Validate file extension
-    file_extension = file.filename.split(".")[-1].lower() if "." in file.filename else ""
-    if file_extension not in settings.allowed_extensions:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Invalid file type. Allowed: {', '.join(settings.allowed_extensions)}"
-        )
 
-    # Parse resume
+def _save_resume_analysis(resume_id: int, parsed_data: dict, analysis_status: str) -> None:
+    """Store a finished analysis using a short-lived session."""
+    db = SessionLocal()
     try:
-        text = ResumeParser.parse(content, file.filename)
-    except ResumeParseError as e:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=str(e)
+        db.query(Resume).filter(Resume.id == resume_id).update(
+            {Resume.parsed_data: parsed_data, Resume.analysis_status: analysis_status},
+            synchronize_session=False
         )
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        logger.error("Failed to save resume analysis", resume_id=resume_id, error=str(e))
+    finally:
+        db.close()
 
-    # Calculate hash for deduplication
-    file_hash = hashlib.sha256(content).hexdigest()
 
-    # Check for duplicate
-    existing = db.query(Resume).filter(
-        Resume.user_id == current_user.id,
-        Resume.upload_hash == file_hash
-    ).first()
+async def _run_resume_analysis(
+    resume_id: int,
+    analyzer: ResumeAnalyzer,
+    text: str,
+    cache_key: str
+) -> None:
+    """
+    Analyze an uploaded resume after the upload response has been sent.
 
-    if existing:
-        raise HTTPException(
-            status_code=status.HTTP_409_CONFLICT,
-            detail="This resume has already been uploaded"
-        )
+    Failures are stored as {"analysis_error": ...}, as the synchronous
+    upload did; clients poll GET /resumes/{id}/analysis for the result.
+    """
+    try:
+        parsed_data = await analyzer.analyze(text)
+        analysis_status = "completed"
+        await cache_set_json(cache_key, parsed_data, ttl=settings.shared_content_cache_ttl)
+    except Exception as e:
+        logger.warning("Resume analysis failed", resume_id=resume_id, error=str(e))
+        parsed_data = {"analysis_error": str(e)}
+        analysis_status = "failed"
 
-    # Upload file to cloud storage
-    storage = get_storage_client()
-    content_type_map = {
-        "pdf": "application/pdf",
-        "docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-        "txt": "text/plain"
-    }
-    content_type = content_type_map.get(file_extension, "application/octet-stream")
+    await run_in_threadpool(_save_resume_analysis, resume_id, parsed_data, analysis_status)
 
+
+def _insert_resume_unless_duplicate(db: Session, **values: Any) -> Optional[Resume]:
+    """
+    Insert a resume, skipping it if the user already has one with the same upload_hash.
+
+    INSERT ... ON CONFLICT DO NOTHING RETURNING checks and claims the hash in
+    one statement, so concurrent saves of the same file or text cannot both
+    pass. Returns the new (uncommitted) resume, or None for a duplicate.
+    """
+    stmt = insert_on_conflict_do_nothing(db, Resume, ["user_id", "upload_hash"]).values(
+        **values,
+        # Core inserts bypass the before_insert listener that sets this
+        content_hash=content_hash(values["raw_text"])
+    ).returning(Resume)
+    return db.scalars(stmt).first()
+
+
+def _discard_upload_claim(db: Session, resume_id: int) -> None:
+    """Delete the placeholder record of an upload that failed after claiming its hash."""
     try:
-        file_path = storage.upload_file(
-            file_content=content,
-            filename=file.filename,
-            content_type=content_type,
-            user_id=current_user.id
-        )
+        db.rollback()
+        db.query(Resume).filter(Resume.id == resume_id).delete(synchronize_session=False)
+        db.commit()
     except Exception as e:
+        db.rollback()
+        logger.error("Failed to discard upload placeholder", resume_id=resume_id, error=str(e))
+
+
+AnalysisJob = Tuple[int, ResumeAnalyzer, str, str]
+
+
+async def _create_resume_from_upload(
+    file: UploadFile,
+    analyze: bool,
+    user: User,
+    db: Session
+) -> Tuple[Resume, Optional[AnalysisJob]]:
+    """
+    Validate, parse and store an uploaded resume.
+
+    Returns the committed resume and, if an LLM analysis still has to run,
+    the arguments for _run_resume_analysis. Raises HTTPException for invalid,
+    oversized or duplicate files.
+    """
+    # Validate file extension
+    file_extension = os.path.splitext(file.filename)[1][1:].lower()
+    if file_extension not in _ALLOWED_EXTENSIONS:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to upload file to storage: {str(e)}"
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid file type. Allowed: {', '.join(settings.allowed_extensions)}"
         )
 
-    # Create resume record
-    resume = Resume(
-        user_id=current_user.id,
+    # Read in chunks, enforcing the size limit and hashing for deduplication
+    content, file_hash = await read_upload(file, settings.max_upload_size_bytes)
+
+    # Claim the hash with a committed placeholder record first, so duplicates
+    # are rejected atomically before any parsing or storage work without
+    # holding a transaction (and the index lock) open across them; text and
+    # file path are filled in below
+    resume = await run_in_threadpool(
+        _insert_resume_unless_duplicate,
+        db,
+        user_id=user.id,
         filename=file.filename,
         file_type=file_extension,
-        raw_text=text,
+        raw_text="",
+        analysis_status=RESUME_UPLOADING,
         file_size=len(content),
-        upload_hash=file_hash,
-        file_path=file_path
+        upload_hash=file_hash
     )
 
-    # Analyze with LLM if requested
-    if analyze:
+    if resume is None:
+        await run_in_threadpool(db.rollback)
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="This resume has already been uploaded"
+        )
+
+    resume_id = resume.id
+    await run_in_threadpool(db.commit)
+
+    try:
+        # Parse resume
         try:
-            # Use user's preferred provider and model if set, otherwise use defaults
-            # Normalize to prevent provider-model mismatches
-            provider, model = normalize_llm_provider_and_model(
-                current_user.llm_provider or settings.default_llm_provider,
-                current_user.llm_model or settings.default_model_name
+            text = await ResumeParser.parse_async(content, file.filename)
+        except ResumeParseError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
             )
 
-            api_key = get_user_llm_api_key(current_user, provider)
-            llm_client = LLMFactory.create_client(
-                provider=provider,
-                api_key=api_key,
-                model=model
+        # Upload file to cloud storage
+        storage = get_storage_client()
+        content_type = _UPLOAD_CONTENT_TYPES.get(file_extension, "application/octet-stream")
+
+        try:
+            # Storage SDKs are blocking; run off the event loop
+            file_path = await run_in_threadpool(
+                storage.upload_file,
+                file_content=content,
+                filename=file.filename,
+                content_type=content_type,
+                user_id=user.id,
+                content_hash=file_hash
             )
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Failed to upload file to storage: {str(e)}"
+            )
+    except BaseException:
+        # Drop the placeholder so the file can be uploaded again
+        await run_in_threadpool(_discard_upload_claim, db, resume_id)
+        raise
 
-            analyzer = ResumeAnalyzer(llm_client)
-            analysis = await analyzer.analyze(text)
-            resume.parsed_data = analysis
+    resume.raw_text = text
+    resume.file_path = file_path
+    resume.analysis_status = None
 
+    # Analyze with LLM if requested, after the response is sent
+    analyzer = None
+    if analyze:
+        try:
+            analysis_key = _resume_analysis_key(user, text)
+            cached_analysis = await cache_get_json(analysis_key)
+            if cached_analysis is not None:
+                resume.parsed_data = cached_analysis
+                resume.analysis_status = "completed"
+            else:
+                analyzer = ResumeAnalyzer(_get_llm_client(user))
+                resume.analysis_status = "pending"
         except Exception as e:
             # Continue without analysis if it fails
             resume.parsed_data = {"analysis_error": str(e)}
+            resume.analysis_status = "failed"
+
+    try:
+        await run_in_threadpool(db.commit)
+    except Exception:
+        # The record was never completed, so don't leave it or its file behind
+        await run_in_threadpool(_discard_upload_claim, db, resume_id)
+        try:
+            await run_in_threadpool(storage.delete_file, file_path)
+        except Exception as e:
+            logger.warning("Failed to delete orphaned upload", file_path=file_path, error=str(e))
+        raise
+    await run_in_threadpool(db.refresh, resume)
+
+    if analyzer is not None:
+        return resume, (resume.id, analyzer, text, analysis_key)
+    return resume, None
+
+
+async def _run_resume_analyses(jobs: List[AnalysisJob]) -> None:
+    """Run the background analyses of a batch upload concurrently."""
+    await asyncio.gather(*(_run_resume_analysis(*job) for job in jobs))
 
-    db.add(resume)
-    db.commit()
-    db.refresh(resume)
+
+@router.post("/upload", response_model=ResumeResponse, status_code=status.HTTP_201_CREATED)
+async def upload_resume(
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(...),
+    analyze: bool = True,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Upload and parse a resume.
+    Optionally analyze it with LLM. The analysis runs after the response is
+    sent (analysis_status "pending"); poll GET /resumes/{id}/analysis for it.
+    """
+    resume, analysis_job = await _create_resume_from_upload(file, analyze, current_user, db)
+
+    if analysis_job is not None:
+        background_tasks.add_task(_run_resume_analysis, *analysis_job)
 
     return resume
 
 
-@router.get("/", response_model=List[ResumeResponse])
-async def list_resumes(
+@router.post("/upload/batch", response_model=List[ResumeBatchUploadItem])
+async def upload_resumes_batch(
+    background_tasks: BackgroundTasks,
+    files: List[UploadFile] = File(...),
+    analyze: bool = True,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Upload several resumes in one request.
+    Files are processed concurrently (up to upload_concurrency at a time),
+    each in its own database session, and reported individually; one bad
+    file does not fail the others. Analyses run after the response is sent.
+    """
+    if len(files) > settings.max_batch_upload_files:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Too many files. Max per batch: {settings.max_batch_upload_files}"
+        )
+
+    semaphore = asyncio.Semaphore(settings.upload_concurrency)
+    analysis_jobs: List[AnalysisJob] = []
+
+    async def upload_one(file: UploadFile) -> ResumeBatchUploadItem:
+        async with semaphore:
+            db = SessionLocal()
+            try:
+                resume, analysis_job = await _create_resume_from_upload(
+                    file, analyze, current_user, db
+                )
+                if analysis_job is not None:
+                    analysis_jobs.append(analysis_job)
+                return ResumeBatchUploadItem(
+                    filename=file.filename,
+                    success=True,
+                    resume=ResumeResponse.model_validate(resume)
+                )
+            except HTTPException as e:
+                return ResumeBatchUploadItem(filename=file.filename, success=False, error=e.detail)
+            except Exception as e:
+                logger.error("Batch resume upload failed", filename=file.filename, error=str(e))
+                await run_in_threadpool(db.rollback)
+                return ResumeBatchUploadItem(
+                    filename=file.filename, success=False, error="Failed to process file"
+                )
+            finally:
+                await run_in_threadpool(db.close)
+
+    results = await asyncio.gather(*(upload_one(file) for file in files))
+
+    if analysis_jobs:
+        background_tasks.add_task(_run_resume_analyses, analysis_jobs)
+
+    return results
+
+
+# Columns returned by list_resumes; raw_text is only sent by get_resume
+_RESUME_LIST_COLUMNS = tuple(getattr(Resume, field) for field in ResumeListItem.model_fields)
+
+
+@router.get("/", response_model=List[ResumeListItem])
+def list_resumes(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
-    List all resumes for the current user.
+    List all resumes for the current user, newest first.
     Excludes soft-deleted resumes.
+
+    Pass the X-Next-Cursor header of a page back as `cursor` to fetch the
+    next page; unlike `skip`, this costs the same for every page.
     """
-    resumes = db.query(Resume).filter(
-        Resume.user_id == current_user.id,
-        Resume.deleted_at.is_(None)
-    ).offset(skip).limit(limit).all()
+    user_id = current_user.id
+
+    # Plain column rows rather than Resume instances: the list only feeds the
+    # response model, so ORM identity-map and attribute bookkeeping is wasted.
+    # Lambda statements are built once and reused with new parameter values.
+    stmt = lambda_stmt(lambda: select(*_RESUME_LIST_COLUMNS).where(
+        Resume.user_id == user_id,
+        Resume.deleted_at.is_(None),
+        RESUME_UPLOADED
+    ))
+
+    if cursor:
+        # Seek past the previous page instead of scanning and discarding rows
+        created_at, last_id = decode_cursor(cursor)
+        stmt += lambda s: s.where(
+            tuple_(Resume.created_at, Resume.id) < tuple_(created_at, last_id)
+        )
+    elif skip:
+        stmt += lambda s: s.offset(skip)
+
+    stmt += lambda s: s.order_by(Resume.created_at.desc(), Resume.id.desc()).limit(limit)
+    resumes = db.execute(stmt).all()
+
+    if len(resumes) == limit and resumes[-1].created_at is not None:
+        response.headers["X-Next-Cursor"] = encode_cursor(resumes[-1])
 
     return resumes
 
 
 @router.get("/{resume_id}", response_model=ResumeResponse)
-async def get_resume(
+def get_resume(
     resume_id: int,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -208,10 +599,40 @@ async def get_resume(
     Get a specific resume by ID.
     Excludes soft-deleted resumes.
     """
-    resume = db.query(Resume).filter(
+    user_id = current_user.id
+    resume = db.scalars(lambda_stmt(lambda: select(Resume).where(
+        Resume.id == resume_id,
+        Resume.user_id == user_id,
+        Resume.deleted_at.is_(None),
+        RESUME_UPLOADED
+    ))).first()
+
+    if not resume:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Resume not found"
+        )
+
+    return resume
+
+
+@router.get("/{resume_id}/analysis", response_model=ResumeAnalysisResponse)
+def get_resume_analysis(
+    resume_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Get the LLM analysis of a resume.
+    Poll this after upload until analysis_status is no longer "pending".
+    """
+    resume = db.query(Resume).options(
+        load_only(Resume.id, Resume.parsed_data, Resume.analysis_status)
+    ).filter(
         Resume.id == resume_id,
         Resume.user_id == current_user.id,
-        Resume.deleted_at.is_(None)
+        Resume.deleted_at.is_(None),
+        RESUME_UPLOADED
     ).first()
 
     if not resume:
@@ -224,7 +645,7 @@ async def get_resume(
 
 
 @router.get("/{resume_id}/matches-count")
-async def get_resume_matches_count(
+def get_resume_matches_count(
     resume_id: int,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -233,9 +654,10 @@ async def get_resume_matches_count(
     Get the count of matches associated with a resume.
     Used before deletion to inform the user.
     """
-    resume = db.query(Resume).filter(
+    resume = db.query(Resume.id).filter(
         Resume.id == resume_id,
-        Resume.user_id == current_user.id
+        Resume.user_id == current_user.id,
+        RESUME_UPLOADED
     ).first()
 
     if not resume:
@@ -253,7 +675,7 @@ async def get_resume_matches_count(
 
 
 @router.delete("/{resume_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_resume(
+def delete_resume(
     resume_id: int,
     keep_matches: bool = False,
     current_user: User = Depends(get_current_user),
@@ -264,9 +686,11 @@ async def delete_resume(
     If keep_matches=true, performs soft delete (sets deleted_at timestamp).
     If keep_matches=false, performs hard delete (removes from database).
     """
-    resume = db.query(Resume).filter(
+    # Only the storage path is needed; the resume text and analysis are not loaded
+    resume = db.query(Resume.file_path).filter(
         Resume.id == resume_id,
-        Resume.user_id == current_user.id
+        Resume.user_id == current_user.id,
+        RESUME_UPLOADED
     ).first()
 
     if not resume:
@@ -276,14 +700,19 @@ async def delete_resume(
         )
 
     # Check if there are matches
-    matches_count = db.query(Match).filter(
-        Match.resume_id == resume_id,
-        Match.user_id == current_user.id
-    ).count()
+    has_matches = keep_matches and db.query(
+        db.query(Match.id).filter(
+            Match.resume_id == resume_id,
+            Match.user_id == current_user.id
+        ).exists()
+    ).scalar()
 
-    if matches_count > 0 and keep_matches:
+    if has_matches:
         # Soft delete: set deleted_at timestamp
-        resume.deleted_at = datetime.utcnow()
+        db.query(Resume).filter(Resume.id == resume_id).update(
+            {Resume.deleted_at: datetime.utcnow()},
+            synchronize_session=False
+        )
         db.commit()
     else:
         # Hard delete: remove from database
@@ -294,14 +723,239 @@ async def delete_resume(
                 storage.delete_file(resume.file_path)
             except Exception as e:
                 # Log error but continue with database deletion
-                print(f"Warning: Failed to delete file from storage: {str(e)}")
+                logger.warning(
+                    "Failed to delete file from storage", resume_id=resume_id, error=str(e)
+                )
 
-        db.delete(resume)
+        # Delete the resume's matches without loading them, detaching
+        # applications that point at them first, as the ORM cascade did
+        resume_matches = select(Match.id).where(Match.resume_id == resume_id)
+        db.query(Application).filter(Application.match_id.in_(resume_matches)).update(
+            {Application.match_id: None},
+            synchronize_session=False
+        )
+        db.query(Match).filter(Match.resume_id == resume_id).delete(synchronize_session=False)
+        db.query(Resume).filter(Resume.id == resume_id).delete(synchronize_session=False)
         db.commit()
 
     return None
 
 
+def _rewrite_inputs(match: Optional[Match]) -> Dict[str, Any]:
+    """Match findings passed to the rewriter (neutral defaults without a match)."""
+    # TODO: Once Match model stores score_breakdown, use it here
+    # For now, create a basic breakdown from available data
+    score_breakdown = None
+    if match:
+        # Basic breakdown based on what we have
+        # Future: Match model should store full score_breakdown from matcher
+        score_breakdown = {
+            "skills_match": {"points": 0},  # Will be estimated by rewriter
+            "keyword_optimization": {"points": 0},
+            "experience_relevance": {"points": 0},
+            "achievements": {"points": 0},
+            "education": {"points": 0}
+        }
+
+    return {
+        "match_score": match.match_score if match else 50,
+        "recommendations": match.recommendations if match else [],
+        "missing_skills": match.missing_skills if match else [],
+        "score_breakdown": score_breakdown
+    }
+
+
+def _rewrite_shared_key(
+    resume: Resume, job: Job, inputs: Dict[str, Any], provider: str, model: str
+) -> str:
+    """
+    Shared cache key for a rewrite.
+
+    The same resume, job description and match findings yield the same
+    rewrite for any user, so it is reused without LLM calls or a quota charge.
+    """
+    return shared_content_key(
+        "resume_rewrite",
+        content_hash(resume.raw_text),
+        content_hash(job.description),
+        str(inputs["match_score"]),
+        orjson.dumps(inputs["recommendations"]).decode(),
+        orjson.dumps(inputs["missing_skills"]).decode(),
+        "match" if inputs["score_breakdown"] else "",
+        provider,
+        model
+    )
+
+
+def _rewrite_ats_analysis(
+    llm_client, resume_text: str, job_description: str
+) -> Optional[Dict[str, Any]]:
+    """Run ATS analysis for the v2 rewriter, or None if it fails."""
+    try:
+        ats_analyzer = ATSAnalyzer(llm_client)
+        ats_analysis = ats_analyzer.analyze_ats_score(
+            resume_text=resume_text,
+            job_description=job_description
+        )
+        logger.info(
+            "ATS analysis completed for resume rewrite", ats_score=ats_analysis.get('ats_score')
+        )
+        return ats_analysis
+    except Exception as e:
+        logger.warning(
+            "ATS analysis failed for resume rewrite, continuing without it", error=str(e)
+        )
+        return None
+
+
+async def _rewrite_response(
+    result: Dict[str, Any],
+    llm_client,
+    job_description: str,
+    match_score: float,
+    resume_id: int,
+    job_id: int,
+    match_id: Optional[int]
+) -> Dict[str, Any]:
+    """
+    Validate a rewrite by re-scoring it and build the endpoint response.
+
+    The improved resume is matched against the job again so the response
+    reports the actual score change rather than only the LLM's estimate.
+    """
+    # POST-RESCAN VALIDATION: Verify actual vs estimated scores
+    validation_data = None
+    ceiling_reached = False
+    ceiling_reasons = []
+
+    try:
+        improved_resume_text = result.get("improved_resume", "")
+        if improved_resume_text:
+            logger.info("Running post-rescan validation to verify estimated scores")
+
+            # Re-run matcher on improved resume
+            matcher = JobMatcher(llm_client)
+            rescan_result = await matcher.match(
+                resume_text=improved_resume_text,
+                job_description=job_description,
+                detailed=True
+            )
+
+            actual_new_score = rescan_result.get("match_score", match_score)
+            estimated_score = result.get("final_scores", {}).get("match_score", {}).get(
+                "projected", match_score
+            )
+
+            # Calculate accuracy
+            accuracy_gap = abs(estimated_score - actual_new_score)
+            actual_improvement = actual_new_score - match_score
+
+            # Ceiling detection: if improvement ≤2 points, likely hit optimization ceiling
+            if actual_improvement <= 2:
+                ceiling_reached = True
+
+                # Analyze why ceiling was reached
+                warnings = result.get("warnings", [])
+                blockers = result.get("blockers", [])
+
+                if blockers:
+                    ceiling_reasons.extend(blockers)
+
+                if warnings:
+                    ceiling_reasons.extend(warnings)
+
+                # Default reason if none specified
+                if not ceiling_reasons:
+                    if actual_improvement > 0:
+                        ceiling_reasons.append(
+                            "Skills already saturated - keywords present but not heavily weighted"
+                        )
+                    else:
+                        ceiling_reasons.append("Resume already well-optimized for this role")
+
+            validation_data = {
+                "estimated_score": estimated_score,
+                "actual_score": actual_new_score,
+                "estimated_improvement": estimated_score - match_score,
+                "actual_improvement": actual_improvement,
+                "accuracy_gap": round(accuracy_gap, 1),
+                "reliable": accuracy_gap <= 5,  # Within 5 points = good estimate
+                "ceiling_reached": ceiling_reached,
+                "ceiling_reasons": ceiling_reasons,
+                "validation_message": _generate_validation_message(
+                    estimated=estimated_score,
+                    actual=actual_new_score,
+                    gap=accuracy_gap,
+                    actual_improvement=actual_improvement
+                )
+            }
+
+            logger.info(
+                "Post-rescan validation complete",
+                estimated=estimated_score,
+                actual=actual_new_score,
+                gap=accuracy_gap,
+                ceiling_reached=ceiling_reached,
+                reliable=validation_data["reliable"]
+            )
+
+    except Exception as e:
+        logger.warning("Post-rescan validation failed, continuing without it", error=str(e))
+
+    # Map field names to match frontend expectations (supporting both v1 and v2 output)
+    final_scores = result.get("final_scores", {})
+    match_score_data = final_scores.get("match_score", {})
+    ats_score_data = final_scores.get("ats_score", {})
+
+    # Get changes summary from v2 format or fall back to v1
+    if "summary_of_changes" in result:
+        changes_summary = result.get("summary_of_changes", [])
+    else:
+        changes_summary = [
+            change.get("change", str(change))
+            for change in result.get("changes_made", [])
+        ]
+
+    # Use validated score if available, otherwise use estimated score from LLM
+    final_score = match_score_data.get(
+        "projected", result.get("projected_total_score", match_score)
+    )
+    final_improvement = match_score_data.get("improvement", result.get("projected_improvement", 0))
+
+    if validation_data:
+        final_score = validation_data["actual_score"]
+        final_improvement = validation_data["actual_improvement"]
+
+    response_data = {
+        "resume_id": resume_id,
+        "job_id": job_id,
+        "match_id": match_id,
+        "original_score": match_score,
+        "improved_resume": result.get("improved_resume", ""),
+        "changes_summary": changes_summary,
+        "estimated_new_score": final_score,  # Use validated score (actual) if available
+        "score_improvement": final_improvement,  # Use validated improvement (actual) if available
+        "key_improvements": changes_summary[:5],  # Top 5 changes
+        # v2 specific fields
+        "ats_score_original": ats_score_data.get("original"),
+        "ats_score_estimated": ats_score_data.get("projected"),  # Uses "estimated" terminology
+        "ats_score_improvement": ats_score_data.get("improvement"),
+        "warnings": result.get("warnings", []),
+        "blockers": result.get("blockers", []),
+        "ceiling_reached": ceiling_reached,  # GPT recommendation: helps prevent retry-spamming
+        "ceiling_reasons": ceiling_reasons if ceiling_reached else [],
+        "hallucination_risk": result.get("hallucination_risk"),
+        "confidence": result.get("confidence"),
+        "confidence_notes": result.get("confidence_notes"),
+        # Post-rescan validation data (NEW)
+        "validation": validation_data,
+        # Include all original data for reference
+        "_raw_response": result
+    }
+
+    return response_data
+
+
 @router.post("/{resume_id}/rewrite")
 async def rewrite_resume(
     resume_id: int,
@@ -316,263 +970,253 @@ async def rewrite_resume(
     Requires a job ID to tailor the resume to.
     Returns cached data if available unless regenerate=true.
     """
-    # Get resume
-    resume = db.query(Resume).filter(
-        Resume.id == resume_id,
-        Resume.user_id == current_user.id
-    ).first()
-
-    if not resume:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Resume not found"
-        )
-
-    # Get job
-    job = db.query(Job).filter(
-        Job.id == job_id,
-        Job.user_id == current_user.id
-    ).first()
-
-    if not job:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Job not found"
-        )
-
-    # Get match if provided, or find the most recent one
-    if match_id:
-        match = db.query(Match).filter(
-            Match.id == match_id,
-            Match.user_id == current_user.id
-        ).first()
-    else:
-        match = db.query(Match).filter(
-            Match.resume_id == resume_id,
-            Match.job_id == job_id,
-            Match.user_id == current_user.id
-        ).order_by(Match.created_at.desc()).first()
+    resume, job, match = _load_resume_job_match(db, current_user.id, resume_id, job_id, match_id)
 
     # Return cached data if available and not regenerating
     if match and match.improved_resume_data and not regenerate:
         logger.info("Returning cached improved resume", match_id=match.id if match else None)
         return match.improved_resume_data
 
-    # Check usage limits for free tier (only when generating new content)
-    RESUME_REWRITE_LIMITS = {
-        "free": 3,
-        "pro": 999999,
-        "enterprise": 999999
-    }
-
+    # Get match data if available
+    inputs = _rewrite_inputs(match)
+
+    # Use user's preferred provider and model if set, otherwise use defaults
+    provider, model = _user_llm_choice(current_user)
+
+    shared_key = _rewrite_shared_key(resume, job, inputs, provider, model)
+    if not regenerate:
+        shared = await cache_get_json(shared_key)
+        if shared is not None:
+            response_data = {
+                **shared,
+                "resume_id": resume_id,
+                "job_id": job_id,
+                "match_id": match.id if match else None
+            }
+            if match:
+                match.improved_resume_data = response_data
+                await run_in_threadpool(db.commit)
+            logger.info("Reusing shared improved resume", match_id=match.id if match else None)
+            return response_data
+
+    llm_client = _get_llm_client(current_user)
+
+    # Values used after the quota commit below, which expires loaded rows
+    resume_text = resume.raw_text
+    job_description = job.description
+    match_id = match.id if match else None
+    user_id = current_user.id
+
+    # Check usage limits for free tier (only when generating new content),
+    # reserving the usage before the LLM call in the same UPDATE
     limit = RESUME_REWRITE_LIMITS.get(current_user.plan, 3)
-    # Admin users bypass usage limits
-    if not current_user.is_admin and current_user.resume_rewrites_used >= limit:
+    reserved = await run_in_threadpool(
+        reserve_quota, db, current_user, User.resume_rewrites_used, limit
+    )
+    if reserved is None:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail=f"Free tier limit reached ({limit} resume rewrites). Please upgrade to Pro for unlimited access."
         )
 
-    # Get match data if available
-    match_score = match.match_score if match else 50
-    recommendations = match.recommendations if match else []
-    missing_skills = match.missing_skills if match else []
+    try:
+        # Run ATS analysis for v2 rewriter
+        ats_analysis = _rewrite_ats_analysis(llm_client, resume_text, job_description)
 
-    # TODO: Once Match model stores score_breakdown, use it here
-    # For now, create a basic breakdown from available data
-    score_breakdown = None
-    if match:
-        # Basic breakdown based on what we have
-        # Future: Match model should store full score_breakdown from matcher
-        score_breakdown = {
-            "skills_match": {"points": 0},  # Will be estimated by rewriter
-            "keyword_optimization": {"points": 0},
-            "experience_relevance": {"points": 0},
-            "achievements": {"points": 0},
-            "education": {"points": 0}
-        }
+        # Use v2 rewriter with ATS optimization
+        rewriter = ResumeRewriterV2(llm_client)
+        result = await rewriter.rewrite_resume(
+            resume_text=resume_text,
+            job_description=job_description,
+            ats_analysis=ats_analysis,
+            **inputs
+        )
 
-    try:
-        # Use user's preferred provider and model if set, otherwise use defaults
-        # Normalize to prevent provider-model mismatches
-        provider, model = normalize_llm_provider_and_model(
-            current_user.llm_provider or settings.default_llm_provider,
-            current_user.llm_model or settings.default_model_name
+        response_data = await _rewrite_response(
+            result, llm_client, job_description, inputs["match_score"],
+            resume_id, job_id, match_id
         )
 
-        # Get LLM client
-        api_key = get_user_llm_api_key(current_user, provider)
-        llm_client = LLMFactory.create_client(
-            provider=provider,
-            api_key=api_key,
-            model=model
+    except Exception as e:
+        await run_in_threadpool(release_quota, db, user_id, User.resume_rewrites_used)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to rewrite resume: {str(e)}"
         )
 
-        # Run ATS analysis for v2 rewriter
-        ats_analysis = None
-        try:
-            ats_analyzer = ATSAnalyzer(llm_client)
-            ats_analysis = ats_analyzer.analyze_ats_score(
-                resume_text=resume.raw_text,
-                job_description=job.description
-            )
-            logger.info("ATS analysis completed for resume rewrite", ats_score=ats_analysis.get('ats_score'))
-        except Exception as e:
-            logger.warning("ATS analysis failed for resume rewrite, continuing without it", error=str(e))
+    # Cache the result if we have a match
+    if match_id:
+        await run_in_threadpool(_store_improved_resume, db, match_id, response_data)
+    await cache_set_json(shared_key, response_data, ttl=settings.shared_content_cache_ttl)
 
-        # Use v2 rewriter with ATS optimization
-        rewriter = ResumeRewriterV2(llm_client)
-        result = await rewriter.rewrite_resume(
-            resume_text=resume.raw_text,
-            job_description=job.description,
-            match_score=match_score,
-            recommendations=recommendations,
-            missing_skills=missing_skills,
-            score_breakdown=score_breakdown,
-            ats_analysis=ats_analysis
+    return response_data
+
+
+def _store_improved_resume(db: Session, match_id: int, response_data: dict) -> None:
+    """Write a rewrite onto its match without loading the match."""
+    db.query(Match).filter(Match.id == match_id).update(
+        {Match.improved_resume_data: response_data},
+        synchronize_session=False
+    )
+    db.commit()
+
+
+def _save_streamed_rewrite(match_id: Optional[int], user_id: int, outcome: dict) -> None:
+    """
+    Cache a streamed rewrite on the match.
+
+    Runs after the stream has been sent. If the stream failed or the client
+    disconnected before the rewrite was complete, the usage reserved for it
+    is released instead.
+    """
+    response_data = outcome.get("response")
+
+    db = SessionLocal()
+    try:
+        if response_data is None:
+            release_quota(db, user_id, User.resume_rewrites_used)
+            return
+
+        if match_id:
+            _store_improved_resume(db, match_id, response_data)
+    except Exception as e:
+        db.rollback()
+        logger.error("Failed to cache streamed rewrite", match_id=match_id, error=str(e))
+    finally:
+        db.close()
+
+
+@router.post("/{resume_id}/rewrite/stream")
+async def stream_rewrite_resume(
+    resume_id: int,
+    job_id: int,
+    match_id: Optional[int] = None,
+    regenerate: bool = False,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Stream a resume rewrite as server-sent events.
+    Emits "data" events with deltas of the raw LLM output, then a "done"
+    event with the same response as POST /rewrite once the rewrite has been
+    validated. Cached rewrites are replayed as a single "done" event.
+    """
+    resume, job, match = _load_resume_job_match(db, current_user.id, resume_id, job_id, match_id)
+    match_id = match.id if match else None
+
+    # Replay cached data as a single event
+    if match and match.improved_resume_data and not regenerate:
+        logger.info("Returning cached improved resume", match_id=match_id)
+        return StreamingResponse(
+            iter([sse_event(match.improved_resume_data, event="done")]),
+            media_type="text/event-stream",
+            headers=SSE_HEADERS
         )
 
-        # POST-RESCAN VALIDATION: Verify actual vs estimated scores
-        validation_data = None
-        ceiling_reached = False
-        ceiling_reasons = []
+    inputs = _rewrite_inputs(match)
+    provider, model = _user_llm_choice(current_user)
 
-        try:
-            improved_resume_text = result.get("improved_resume", "")
-            if improved_resume_text:
-                logger.info("Running post-rescan validation to verify estimated scores")
-
-                # Re-run matcher on improved resume
-                matcher = JobMatcher(llm_client)
-                rescan_result = await matcher.match(
-                    resume_text=improved_resume_text,
-                    job_description=job.description,
-                    detailed=True
-                )
+    shared_key = _rewrite_shared_key(resume, job, inputs, provider, model)
+    if not regenerate:
+        shared = await cache_get_json(shared_key)
+        if shared is not None:
+            response_data = {
+                **shared, "resume_id": resume_id, "job_id": job_id, "match_id": match_id
+            }
+            if match:
+                match.improved_resume_data = response_data
+                await run_in_threadpool(db.commit)
+            logger.info("Reusing shared improved resume", match_id=match_id)
+            return StreamingResponse(
+                iter([sse_event(response_data, event="done")]),
+                media_type="text/event-stream",
+                headers=SSE_HEADERS
+            )
 
-                actual_new_score = rescan_result.get("match_score", match_score)
-                estimated_score = result.get("final_scores", {}).get("match_score", {}).get("projected", match_score)
-
-                # Calculate accuracy
-                accuracy_gap = abs(estimated_score - actual_new_score)
-                actual_improvement = actual_new_score - match_score
-
-                # Ceiling detection: if improvement ≤2 points, likely hit optimization ceiling
-                if actual_improvement <= 2:
-                    ceiling_reached = True
-
-                    # Analyze why ceiling was reached
-                    warnings = result.get("warnings", [])
-                    blockers = result.get("blockers", [])
-
-                    if blockers:
-                        ceiling_reasons.extend(blockers)
-
-                    if warnings:
-                        ceiling_reasons.extend(warnings)
-
-                    # Default reason if none specified
-                    if not ceiling_reasons:
-                        if actual_improvement > 0:
-                            ceiling_reasons.append("Skills already saturated - keywords present but not heavily weighted")
-                        else:
-                            ceiling_reasons.append("Resume already well-optimized for this role")
-
-                validation_data = {
-                    "estimated_score": estimated_score,
-                    "actual_score": actual_new_score,
-                    "estimated_improvement": estimated_score - match_score,
-                    "actual_improvement": actual_improvement,
-                    "accuracy_gap": round(accuracy_gap, 1),
-                    "reliable": accuracy_gap <= 5,  # Within 5 points = good estimate
-                    "ceiling_reached": ceiling_reached,
-                    "ceiling_reasons": ceiling_reasons,
-                    "validation_message": _generate_validation_message(
-                        estimated=estimated_score,
-                        actual=actual_new_score,
-                        gap=accuracy_gap,
-                        actual_improvement=actual_improvement
-                    )
-                }
-
-                logger.info(
-                    "Post-rescan validation complete",
-                    estimated=estimated_score,
-                    actual=actual_new_score,
-                    gap=accuracy_gap,
-                    ceiling_reached=ceiling_reached,
-                    reliable=validation_data["reliable"]
-                )
+    llm_client = _get_llm_client(current_user)
 
-        except Exception as e:
-            logger.warning("Post-rescan validation failed, continuing without it", error=str(e))
+    # Reserve the usage before the LLM call; released if the stream fails
+    limit = RESUME_REWRITE_LIMITS.get(current_user.plan, 3)
+    reserved = await run_in_threadpool(
+        reserve_quota, db, current_user, User.resume_rewrites_used, limit
+    )
+    if reserved is None:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=f"Free tier limit reached ({limit} resume rewrites). Please upgrade to Pro for unlimited access."
+        )
 
-        # Map field names to match frontend expectations (supporting both v1 and v2 output)
-        final_scores = result.get("final_scores", {})
-        match_score_data = final_scores.get("match_score", {})
-        ats_score_data = final_scores.get("ats_score", {})
+    resume_text = resume.raw_text
+    job_description = job.description
+    user_id = current_user.id
 
-        # Get changes summary from v2 format or fall back to v1
-        if "summary_of_changes" in result:
-            changes_summary = result.get("summary_of_changes", [])
-        else:
-            changes_summary = [
-                change.get("change", str(change))
-                for change in result.get("changes_made", [])
-            ]
+    # Don't hold a pooled connection for the length of the stream
+    await run_in_threadpool(db.close)
 
-        # Use validated score if available, otherwise use estimated score from LLM
-        final_score = match_score_data.get("projected", result.get("projected_total_score", match_score))
-        final_improvement = match_score_data.get("improvement", result.get("projected_improvement", 0))
+    outcome: dict = {}
 
-        if validation_data:
-            final_score = validation_data["actual_score"]
-            final_improvement = validation_data["actual_improvement"]
+    async def event_stream():
+        parts: List[str] = []
 
-        response_data = {
-            "resume_id": resume_id,
-            "job_id": job_id,
-            "match_id": match.id if match else None,
-            "original_score": match_score,
-            "improved_resume": result.get("improved_resume", ""),
-            "changes_summary": changes_summary,
-            "estimated_new_score": final_score,  # Use validated score (actual) if available
-            "score_improvement": final_improvement,  # Use validated improvement (actual) if available
-            "key_improvements": changes_summary[:5],  # Top 5 changes
-            # v2 specific fields
-            "ats_score_original": ats_score_data.get("original"),
-            "ats_score_estimated": ats_score_data.get("projected"),  # Uses "estimated" terminology
-            "ats_score_improvement": ats_score_data.get("improvement"),
-            "warnings": result.get("warnings", []),
-            "blockers": result.get("blockers", []),
-            "ceiling_reached": ceiling_reached,  # GPT recommendation: helps prevent retry-spamming
-            "ceiling_reasons": ceiling_reasons if ceiling_reached else [],
-            "hallucination_risk": result.get("hallucination_risk"),
-            "confidence": result.get("confidence"),
-            "confidence_notes": result.get("confidence_notes"),
-            # Post-rescan validation data (NEW)
-            "validation": validation_data,
-            # Include all original data for reference
-            "_raw_response": result
-        }
+        try:
+            ats_analysis = _rewrite_ats_analysis(llm_client, resume_text, job_description)
+
+            rewriter = ResumeRewriterV2(llm_client)
+            chunks = rewriter.stream(
+                resume_text=resume_text,
+                job_description=job_description,
+                ats_analysis=ats_analysis,
+                **inputs
+            )
+            async for event in sse_deltas(chunks, parts):
+                yield event
+
+            result = rewriter.build_result("".join(parts), {
+                "model": model,
+                "provider": provider,
+                "tokens_used": None,
+                "cost_estimate": None
+            })
+            response_data = await _rewrite_response(
+                result, llm_client, job_description, inputs["match_score"],
+                resume_id, job_id, match_id
+            )
+            outcome["response"] = response_data
+            await cache_set_json(shared_key, response_data, ttl=settings.shared_content_cache_ttl)
+            yield sse_event(response_data, event="done")
 
-        # Cache the result if we have a match
-        if match:
-            match.improved_resume_data = response_data
+            logger.info("Resume rewrite streamed", match_id=match_id)
 
-        # Increment usage counter
-        current_user.resume_rewrites_used += 1
+        except Exception as e:
+            logger.error("Resume rewrite streaming failed", error=str(e))
+            yield sse_event(
+                {"detail": "Failed to rewrite resume. Please try again."}, event="error"
+            )
 
-        db.commit()
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS,
+        background=BackgroundTask(_save_streamed_rewrite, match_id, user_id, outcome)
+    )
 
-        return response_data
 
-    except Exception as e:
+def _load_resume_text(db: Session, user_id: int, resume_id: int) -> Row:
+    """Load the filename and text of a user's resume, raising 404 if it is missing."""
+    resume = db.query(Resume.filename, Resume.raw_text).filter(
+        Resume.id == resume_id,
+        Resume.user_id == user_id,
+        RESUME_UPLOADED
+    ).first()
+
+    if not resume:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to rewrite resume: {str(e)}"
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Resume not found"
         )
 
+    return resume
+
 
 @router.get("/{resume_id}/download-docx")
 async def download_resume_docx(
@@ -585,25 +1229,15 @@ async def download_resume_docx(
     Download resume as DOCX file.
     Can download original resume or improved version if improved_text is provided.
     """
-    # Get resume
-    resume = db.query(Resume).filter(
-        Resume.id == resume_id,
-        Resume.user_id == current_user.id
-    ).first()
-
-    if not resume:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Resume not found"
-        )
+    resume = await run_in_threadpool(_load_resume_text, db, current_user.id, resume_id)
 
     try:
         # Use improved text if provided, otherwise use original
         resume_text = improved_text if improved_text else resume.raw_text
 
         # Generate DOCX
-        generator = ResumeGenerator()
-        docx_file = generator.create_professional_docx(
+        docx_file = await render_document(
+            ResumeGenerator.create_professional_docx,
             resume_text=resume_text,
             candidate_name=None,  # Could extract from resume
             filename=f"{resume.filename.rsplit('.', 1)[0]}.docx"
@@ -611,7 +1245,7 @@ async def download_resume_docx(
 
         # Return as downloadable file
         return StreamingResponse(
-            docx_file,
+            iter_buffer(docx_file),
             media_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
             headers={
                 "Content-Disposition": f"attachment; filename={resume.filename.rsplit('.', 1)[0]}.docx"
@@ -636,65 +1270,18 @@ async def download_resume_pdf(
     Download resume as PDF file.
     Can download original resume or improved version if improved_text is provided.
     """
-    # Get resume
-    resume = db.query(Resume).filter(
-        Resume.id == resume_id,
-        Resume.user_id == current_user.id
-    ).first()
-
-    if not resume:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Resume not found"
-        )
+    resume = await run_in_threadpool(_load_resume_text, db, current_user.id, resume_id)
 
     try:
-        from reportlab.lib.pagesizes import letter
-        from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
-        from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-        from reportlab.lib.units import inch
-        from io import BytesIO
-
         # Use improved text if provided, otherwise use original
         resume_text = improved_text if improved_text else resume.raw_text
 
-        # Create PDF
-        pdf_buffer = BytesIO()
-        doc = SimpleDocTemplate(pdf_buffer, pagesize=letter,
-                                rightMargin=0.75*inch, leftMargin=0.75*inch,
-                                topMargin=0.75*inch, bottomMargin=0.75*inch)
-
-        styles = getSampleStyleSheet()
-        story = []
-
-        # Parse and add content
-        lines = resume_text.split('\n')
-        for line in lines:
-            line = line.strip()
-            if not line:
-                story.append(Spacer(1, 0.2*inch))
-                continue
-
-            # Detect headers
-            is_header = any(keyword in line.upper() for keyword in [
-                'SUMMARY', 'EXPERIENCE', 'EDUCATION', 'SKILLS',
-                'PROJECTS', 'CERTIFICATIONS'
-            ])
-
-            if is_header:
-                p = Paragraph(line, styles['Heading2'])
-            else:
-                p = Paragraph(line, styles['Normal'])
-
-            story.append(p)
-            story.append(Spacer(1, 0.1*inch))
-
-        doc.build(story)
-        pdf_buffer.seek(0)
+        # Render off the event loop (reportlab is CPU-bound)
+        pdf_buffer = await render_document(ResumeGenerator.create_pdf, resume_text=resume_text)
 
         # Return as downloadable file
         return StreamingResponse(
-            pdf_buffer,
+            iter_buffer(pdf_buffer),
             media_type="application/pdf",
             headers={
                 "Content-Disposition": f"attachment; filename={resume.filename.rsplit('.', 1)[0]}.pdf"
@@ -713,82 +1300,21 @@ async def generate_interview_questions(
     resume_id: int,
     job_id: int,
     match_id: Optional[int] = None,
+    regenerate: bool = False,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
-    Generate interview preparation questions and talking points.
-    Tailored to the resume and specific job posting.
-    """
-    # Get resume
-    resume = db.query(Resume).filter(
-        Resume.id == resume_id,
-        Resume.user_id == current_user.id
-    ).first()
-
-    if not resume:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Resume not found"
-        )
-
-    # Get job
-    job = db.query(Job).filter(
-        Job.id == job_id,
-        Job.user_id == current_user.id
-    ).first()
-
-    if not job:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Job not found"
-        )
-
-    # Get match if provided, or find the most recent one
-    match = None
-    if match_id:
-        match = db.query(Match).filter(
-            Match.id == match_id,
-            Match.user_id == current_user.id
-        ).first()
-    else:
-        match = db.query(Match).filter(
-            Match.resume_id == resume_id,
-            Match.job_id == job_id,
-            Match.user_id == current_user.id
-        ).order_by(Match.created_at.desc()).first()
-
-    # Get match data if available
-    match_score = match.match_score if match else None
-    missing_skills = match.missing_skills if match else None
-    recommendations = match.recommendations if match else None
-
-    try:
-        # Use user's preferred provider and model if set, otherwise use defaults
-        # Normalize to prevent provider-model mismatches
-        provider, model = normalize_llm_provider_and_model(
-            current_user.llm_provider or settings.default_llm_provider,
-            current_user.llm_model or settings.default_model_name
-        )
-
-        # Get LLM client
-        api_key = get_user_llm_api_key(current_user, provider)
-        llm_client = LLMFactory.create_client(
-            provider=provider,
-            api_key=api_key,
-            model=model
-        )
+    Generate interview preparation questions and talking points.
+    Tailored to the resume and specific job posting. Returns the copy cached
+    on the match, which the downloads also use, unless regenerate=true.
+    """
+    # Get resume, job and the requested (or most recent) match in one query
+    resume, job, match = _load_resume_job_match(db, current_user.id, resume_id, job_id, match_id)
 
-        # Generate interview questions
-        generator = InterviewGenerator(llm_client)
-        result = await generator.generate_questions(
-            resume_text=resume.raw_text,
-            job_description=job.description,
-            job_title=job.title,
-            company=job.company or "the company",
-            match_score=match_score,
-            missing_skills=missing_skills,
-            recommendations=recommendations
+    try:
+        result = await _get_or_generate_interview_prep(
+            db, current_user, resume, job, match, regenerate
         )
 
         return {
@@ -819,78 +1345,16 @@ async def download_interview_prep_docx(
     Download interview preparation guide as DOCX.
     Generates questions and talking points tailored to the resume and job.
     """
-    # Get resume
-    resume = db.query(Resume).filter(
-        Resume.id == resume_id,
-        Resume.user_id == current_user.id
-    ).first()
-
-    if not resume:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Resume not found"
-        )
-
-    # Get job
-    job = db.query(Job).filter(
-        Job.id == job_id,
-        Job.user_id == current_user.id
-    ).first()
-
-    if not job:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Job not found"
-        )
-
-    # Get match if available
-    match = None
-    if match_id:
-        match = db.query(Match).filter(
-            Match.id == match_id,
-            Match.user_id == current_user.id
-        ).first()
-    else:
-        match = db.query(Match).filter(
-            Match.resume_id == resume_id,
-            Match.job_id == job_id,
-            Match.user_id == current_user.id
-        ).order_by(Match.created_at.desc()).first()
-
-    match_score = match.match_score if match else None
-    missing_skills = match.missing_skills if match else None
-    recommendations = match.recommendations if match else None
+    # Get resume, job and the requested (or most recent) match in one query
+    resume, job, match = _load_resume_job_match(db, current_user.id, resume_id, job_id, match_id)
 
     try:
-        # Use user's preferred provider and model if set, otherwise use defaults
-        # Normalize to prevent provider-model mismatches
-        provider, model = normalize_llm_provider_and_model(
-            current_user.llm_provider or settings.default_llm_provider,
-            current_user.llm_model or settings.default_model_name
-        )
-
-        # Get LLM client
-        api_key = get_user_llm_api_key(current_user, provider)
-        llm_client = LLMFactory.create_client(
-            provider=provider,
-            api_key=api_key,
-            model=model
-        )
-
-        # Generate interview questions
-        generator = InterviewGenerator(llm_client)
-        interview_data = await generator.generate_questions(
-            resume_text=resume.raw_text,
-            job_description=job.description,
-            job_title=job.title,
-            company=job.company or "Company",
-            match_score=match_score,
-            missing_skills=missing_skills,
-            recommendations=recommendations
-        )
+        # Reuse interview prep cached on the match; only call the LLM on a miss
+        interview_data = await _get_or_generate_interview_prep(db, current_user, resume, job, match)
 
         # Create DOCX
-        docx_file = InterviewGenerator.create_docx(
+        docx_file = await render_document(
+            InterviewGenerator.create_docx,
             interview_data=interview_data,
             job_title=job.title,
             company=job.company or "Company"
@@ -899,7 +1363,7 @@ async def download_interview_prep_docx(
         # Return as downloadable file
         filename = f"interview_prep_{job.title.replace(' ', '_')}.docx"
         return StreamingResponse(
-            docx_file,
+            iter_buffer(docx_file),
             media_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
             headers={
                 "Content-Disposition": f"attachment; filename={filename}"
@@ -925,78 +1389,16 @@ async def download_interview_prep_pdf(
     Download interview preparation guide as PDF.
     Generates questions and talking points tailored to the resume and job.
     """
-    # Get resume
-    resume = db.query(Resume).filter(
-        Resume.id == resume_id,
-        Resume.user_id == current_user.id
-    ).first()
-
-    if not resume:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Resume not found"
-        )
-
-    # Get job
-    job = db.query(Job).filter(
-        Job.id == job_id,
-        Job.user_id == current_user.id
-    ).first()
-
-    if not job:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Job not found"
-        )
-
-    # Get match if available
-    match = None
-    if match_id:
-        match = db.query(Match).filter(
-            Match.id == match_id,
-            Match.user_id == current_user.id
-        ).first()
-    else:
-        match = db.query(Match).filter(
-            Match.resume_id == resume_id,
-            Match.job_id == job_id,
-            Match.user_id == current_user.id
-        ).order_by(Match.created_at.desc()).first()
-
-    match_score = match.match_score if match else None
-    missing_skills = match.missing_skills if match else None
-    recommendations = match.recommendations if match else None
+    # Get resume, job and the requested (or most recent) match in one query
+    resume, job, match = _load_resume_job_match(db, current_user.id, resume_id, job_id, match_id)
 
     try:
-        # Use user's preferred provider and model if set, otherwise use defaults
-        # Normalize to prevent provider-model mismatches
-        provider, model = normalize_llm_provider_and_model(
-            current_user.llm_provider or settings.default_llm_provider,
-            current_user.llm_model or settings.default_model_name
-        )
-
-        # Get LLM client
-        api_key = get_user_llm_api_key(current_user, provider)
-        llm_client = LLMFactory.create_client(
-            provider=provider,
-            api_key=api_key,
-            model=model
-        )
-
-        # Generate interview questions
-        generator = InterviewGenerator(llm_client)
-        interview_data = await generator.generate_questions(
-            resume_text=resume.raw_text,
-            job_description=job.description,
-            job_title=job.title,
-            company=job.company or "Company",
-            match_score=match_score,
-            missing_skills=missing_skills,
-            recommendations=recommendations
-        )
+        # Reuse interview prep cached on the match; only call the LLM on a miss
+        interview_data = await _get_or_generate_interview_prep(db, current_user, resume, job, match)
 
         # Create PDF
-        pdf_file = InterviewGenerator.create_pdf(
+        pdf_file = await render_document(
+            InterviewGenerator.create_pdf,
             interview_data=interview_data,
             job_title=job.title,
             company=job.company or "Company"
@@ -1005,7 +1407,7 @@ async def download_interview_prep_pdf(
         # Return as downloadable file
         filename = f"interview_prep_{job.title.replace(' ', '_')}.pdf"
         return StreamingResponse(
-            pdf_file,
+            iter_buffer(pdf_file),
             media_type="application/pdf",
             headers={
                 "Content-Disposition": f"attachment; filename={filename}"
@@ -1024,63 +1426,24 @@ async def generate_cover_letter(
     resume_id: int,
     job_id: int,
     tone: str = "professional",
+    regenerate: bool = False,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
     Generate a tailored cover letter for a specific job.
+    Returns the copy cached on the most recent match when it has the same
+    tone, which the downloads also use, unless regenerate=true.
 
     Args:
         tone: One of 'professional', 'enthusiastic', or 'formal'
     """
-    # Get resume
-    resume = db.query(Resume).filter(
-        Resume.id == resume_id,
-        Resume.user_id == current_user.id
-    ).first()
-
-    if not resume:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Resume not found"
-        )
-
-    # Get job
-    job = db.query(Job).filter(
-        Job.id == job_id,
-        Job.user_id == current_user.id
-    ).first()
-
-    if not job:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Job not found"
-        )
+    # Generated content is cached on the most recent match for this pair
+    resume, job, match = _load_resume_job_match(db, current_user.id, resume_id, job_id)
 
     try:
-        # Use user's preferred provider and model if set, otherwise use defaults
-        # Normalize to prevent provider-model mismatches
-        provider, model = normalize_llm_provider_and_model(
-            current_user.llm_provider or settings.default_llm_provider,
-            current_user.llm_model or settings.default_model_name
-        )
-
-        # Get LLM client
-        api_key = get_user_llm_api_key(current_user, provider)
-        llm_client = LLMFactory.create_client(
-            provider=provider,
-            api_key=api_key,
-            model=model
-        )
-
-        # Generate cover letter
-        generator = CoverLetterGenerator(llm_client)
-        result = await generator.generate(
-            resume_text=resume.raw_text,
-            job_description=job.description,
-            job_title=job.title,
-            company=job.company or "the company",
-            tone=tone
+        result = await _get_or_generate_cover_letter(
+            db, current_user, resume, job, match, tone, regenerate
         )
 
         return {
@@ -1109,58 +1472,18 @@ async def download_cover_letter_docx(
     """
     Download cover letter as DOCX.
     """
-    # Get resume
-    resume = db.query(Resume).filter(
-        Resume.id == resume_id,
-        Resume.user_id == current_user.id
-    ).first()
-
-    if not resume:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Resume not found"
-        )
-
-    # Get job
-    job = db.query(Job).filter(
-        Job.id == job_id,
-        Job.user_id == current_user.id
-    ).first()
-
-    if not job:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Job not found"
-        )
+    # Generated content is cached on the most recent match for this pair
+    resume, job, match = _load_resume_job_match(db, current_user.id, resume_id, job_id)
 
     try:
-        # Use user's preferred provider and model if set, otherwise use defaults
-        # Normalize to prevent provider-model mismatches
-        provider, model = normalize_llm_provider_and_model(
-            current_user.llm_provider or settings.default_llm_provider,
-            current_user.llm_model or settings.default_model_name
-        )
-
-        # Get LLM client
-        api_key = get_user_llm_api_key(current_user, provider)
-        llm_client = LLMFactory.create_client(
-            provider=provider,
-            api_key=api_key,
-            model=model
-        )
-
-        # Generate cover letter
-        generator = CoverLetterGenerator(llm_client)
-        cover_letter_data = await generator.generate(
-            resume_text=resume.raw_text,
-            job_description=job.description,
-            job_title=job.title,
-            company=job.company or "Company",
-            tone=tone
+        # Reuse a cover letter cached for the same tone; only call the LLM on a miss
+        cover_letter_data = await _get_or_generate_cover_letter(
+            db, current_user, resume, job, match, tone
         )
 
         # Create DOCX
-        docx_file = CoverLetterGenerator.create_docx(
+        docx_file = await render_document(
+            CoverLetterGenerator.create_docx,
             cover_letter_text=cover_letter_data["cover_letter"],
             candidate_name=cover_letter_data["candidate_name"],
             company=job.company or "Company",
@@ -1170,7 +1493,7 @@ async def download_cover_letter_docx(
         # Return as downloadable file
         filename = f"cover_letter_{job.company or 'Company'}_{job.title.replace(' ', '_')}.docx"
         return StreamingResponse(
-            docx_file,
+            iter_buffer(docx_file),
             media_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
             headers={
                 "Content-Disposition": f"attachment; filename={filename}"
@@ -1195,58 +1518,18 @@ async def download_cover_letter_pdf(
     """
     Download cover letter as PDF.
     """
-    # Get resume
-    resume = db.query(Resume).filter(
-        Resume.id == resume_id,
-        Resume.user_id == current_user.id
-    ).first()
-
-    if not resume:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Resume not found"
-        )
-
-    # Get job
-    job = db.query(Job).filter(
-        Job.id == job_id,
-        Job.user_id == current_user.id
-    ).first()
-
-    if not job:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Job not found"
-        )
+    # Generated content is cached on the most recent match for this pair
+    resume, job, match = _load_resume_job_match(db, current_user.id, resume_id, job_id)
 
     try:
-        # Use user's preferred provider and model if set, otherwise use defaults
-        # Normalize to prevent provider-model mismatches
-        provider, model = normalize_llm_provider_and_model(
-            current_user.llm_provider or settings.default_llm_provider,
-            current_user.llm_model or settings.default_model_name
-        )
-
-        # Get LLM client
-        api_key = get_user_llm_api_key(current_user, provider)
-        llm_client = LLMFactory.create_client(
-            provider=provider,
-            api_key=api_key,
-            model=model
-        )
-
-        # Generate cover letter
-        generator = CoverLetterGenerator(llm_client)
-        cover_letter_data = await generator.generate(
-            resume_text=resume.raw_text,
-            job_description=job.description,
-            job_title=job.title,
-            company=job.company or "Company",
-            tone=tone
+        # Reuse a cover letter cached for the same tone; only call the LLM on a miss
+        cover_letter_data = await _get_or_generate_cover_letter(
+            db, current_user, resume, job, match, tone
         )
 
         # Create PDF
-        pdf_file = CoverLetterGenerator.create_pdf(
+        pdf_file = await render_document(
+            CoverLetterGenerator.create_pdf,
             cover_letter_text=cover_letter_data["cover_letter"],
             candidate_name=cover_letter_data["candidate_name"],
             company=job.company or "Company",
@@ -1256,7 +1539,7 @@ async def download_cover_letter_pdf(
         # Return as downloadable file
         filename = f"cover_letter_{job.company or 'Company'}_{job.title.replace(' ', '_')}.pdf"
         return StreamingResponse(
-            pdf_file,
+            iter_buffer(pdf_file),
             media_type="application/pdf",
             headers={
                 "Content-Disposition": f"attachment; filename={filename}"
@@ -1270,36 +1553,32 @@ async def download_cover_letter_pdf(
         )
 
 
-@router.get("/improved/{match_id}/download")
-async def download_improved_resume(
-    match_id: int,
-    format: str = Query("pdf", regex="^(pdf|docx)$"),
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
-):
+def _load_improved_resume(
+    db: Session, user_id: int, match_id: int
+) -> Tuple[Match, Optional[Job], str]:
     """
-    Download the improved resume from a match as PDF or DOCX.
-    Requires the resume to have been rewritten first.
+    Load a match, its job and the text of its improved resume.
+
+    Raises 404 if the match does not exist and 400 if it has no improved resume yet.
     """
-    # Get match
-    match = db.query(Match).filter(
+    row = db.query(Match, Job).outerjoin(Job, Job.id == Match.job_id).filter(
         Match.id == match_id,
-        Match.user_id == current_user.id
+        Match.user_id == user_id
     ).first()
 
-    if not match:
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Match not found"
         )
 
+    match, job = row
     if not match.improved_resume_data:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Improved resume not generated yet. Generate it first via /resumes/{id}/rewrite endpoint."
         )
 
-    # Get the improved text
     improved_text = match.improved_resume_data.get("improved_resume", "")
     if not improved_text:
         raise HTTPException(
@@ -1307,62 +1586,40 @@ async def download_improved_resume(
             detail="No improved resume text available"
         )
 
-    # Get resume and job for metadata
-    resume = db.query(Resume).filter(Resume.id == match.resume_id).first()
-    job = db.query(Job).filter(Job.id == match.job_id).first()
+    return match, job, improved_text
+
+
+@router.get("/improved/{match_id}/download")
+async def download_improved_resume(
+    match_id: int,
+    format: str = Query("pdf", regex="^(pdf|docx)$"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Download the improved resume from a match as PDF or DOCX.
+    Requires the resume to have been rewritten first.
+    """
+    _, job, improved_text = await run_in_threadpool(
+        _load_improved_resume, db, current_user.id, match_id
+    )
 
     try:
         if format == "pdf":
-            from reportlab.lib.pagesizes import letter
-            from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
-            from reportlab.lib.styles import getSampleStyleSheet
-            from reportlab.lib.units import inch
-            from io import BytesIO
-
-            # Create PDF
-            pdf_buffer = BytesIO()
-            doc = SimpleDocTemplate(pdf_buffer, pagesize=letter,
-                                    rightMargin=0.75*inch, leftMargin=0.75*inch,
-                                    topMargin=0.75*inch, bottomMargin=0.75*inch)
-
-            styles = getSampleStyleSheet()
-            story = []
-
-            # Parse and add content
-            lines = improved_text.split('\n')
-            for line in lines:
-                line = line.strip()
-                if not line:
-                    story.append(Spacer(1, 0.2*inch))
-                    continue
-
-                # Detect headers
-                is_header = any(keyword in line.upper() for keyword in [
-                    'SUMMARY', 'EXPERIENCE', 'EDUCATION', 'SKILLS',
-                    'PROJECTS', 'CERTIFICATIONS'
-                ])
-
-                if is_header:
-                    p = Paragraph(line, styles['Heading2'])
-                else:
-                    p = Paragraph(line, styles['Normal'])
-
-                story.append(p)
-                story.append(Spacer(1, 0.1*inch))
-
-            doc.build(story)
-            pdf_buffer.seek(0)
+            pdf_buffer = await render_document(
+                ResumeGenerator.create_pdf, resume_text=improved_text
+            )
 
             filename = f"improved_resume_{job.title.replace(' ', '_') if job else 'optimized'}_{datetime.now().strftime('%Y%m%d')}.pdf"
 
             return StreamingResponse(
-                pdf_buffer,
+                iter_buffer(pdf_buffer),
                 media_type="application/pdf",
                 headers={"Content-Disposition": f"attachment; filename={filename}"}
             )
         else:  # docx
-            generator = ResumeGenerator()
-            docx_file = generator.create_professional_docx(
+            docx_file = await render_document(
+                ResumeGenerator.create_professional_docx,
                 resume_text=improved_text,
                 candidate_name=None,
                 filename=f"improved_resume_{job.title.replace(' ', '_') if job else 'optimized'}.docx"
@@ -1371,7 +1628,7 @@ async def download_improved_resume(
             filename = f"improved_resume_{job.title.replace(' ', '_') if job else 'optimized'}_{datetime.now().strftime('%Y%m%d')}.docx"
 
             return StreamingResponse(
-                docx_file,
+                iter_buffer(docx_file),
                 media_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
                 headers={"Content-Disposition": f"attachment; filename={filename}"}
             )
@@ -1385,7 +1642,7 @@ async def download_improved_resume(
 
 
 @router.post("/improved/{match_id}/save")
-async def save_improved_resume(
+def save_improved_resume(
     match_id: int,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -1394,56 +1651,20 @@ async def save_improved_resume(
     Save the improved resume from a match as a new resume in user's collection.
     This creates a new resume entry that can be used for future job matches.
     """
-    # Get match
-    match = db.query(Match).filter(
-        Match.id == match_id,
-        Match.user_id == current_user.id
-    ).first()
-
-    if not match:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Match not found"
-        )
-
-    if not match.improved_resume_data:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Improved resume not generated yet. Generate it first via /resumes/{id}/rewrite endpoint."
-        )
-
-    # Get the improved text
-    improved_text = match.improved_resume_data.get("improved_resume", "")
-    if not improved_text:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="No improved resume text available"
-        )
+    match, job, improved_text = _load_improved_resume(db, current_user.id, match_id)
 
-    # Get original resume and job for metadata
+    # Get original resume for metadata
     original_resume = db.query(Resume).filter(Resume.id == match.resume_id).first()
-    job = db.query(Job).filter(Job.id == match.job_id).first()
 
     try:
         # Calculate hash for deduplication
         text_hash = hashlib.sha256(improved_text.encode()).hexdigest()
 
-        # Check if this improved resume was already saved
-        existing = db.query(Resume).filter(
-            Resume.user_id == current_user.id,
-            Resume.upload_hash == text_hash
-        ).first()
-
-        if existing:
-            raise HTTPException(
-                status_code=status.HTTP_409_CONFLICT,
-                detail="This improved resume has already been saved to your collection"
-            )
-
-        # Create new resume record
+        # Create new resume record, unless this improved resume was already saved
         new_filename = f"improved_{original_resume.filename.rsplit('.', 1)[0]}_{job.title.replace(' ', '_') if job else 'optimized'}.txt"
 
-        new_resume = Resume(
+        new_resume = _insert_resume_unless_duplicate(
+            db,
             user_id=current_user.id,
             filename=new_filename,
             file_type="txt",
@@ -1460,7 +1681,12 @@ async def save_improved_resume(
             }
         )
 
-        db.add(new_resume)
+        if new_resume is None:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="This improved resume has already been saved to your collection"
+            )
+
         db.commit()
         db.refresh(new_resume)
 
@@ -1488,6 +1714,100 @@ async def save_improved_resume(
         )
 
 
+def _reserve_rescan(
+    db: Session,
+    user: User,
+    match_id: int,
+    save_to_collection: bool
+) -> Tuple[Any, str, Optional[str], Optional[str]]:
+    """
+    Load what a rescan needs and reserve the match it counts as.
+
+    Returns (llm_client, improved_text, job_text, new_filename) as plain
+    values, so the session can be closed before the LLM calls. job_text is
+    None if the job was deleted; new_filename is None unless the improved
+    resume is to be saved.
+    """
+    match, job, improved_text = _load_improved_resume(db, user.id, match_id)
+
+    new_filename = None
+    if save_to_collection:
+        original_filename = db.query(Resume.filename).filter(Resume.id == match.resume_id).scalar()
+        job_part = job.title.replace(' ', '_') if job else 'optimized'
+        new_filename = f"improved_{original_filename.rsplit('.', 1)[0]}_{job_part}.txt"
+
+    llm_client = _get_llm_client(user)
+    job_text = job.full_text if job else None
+
+    # Check usage limits for free tier (rescanning counts toward match limit),
+    # reserving the usage before the LLM calls
+    limit = PLAN_LIMITS.get(user.plan, 10)
+    if reserve_quota(db, user, User.matches_used, limit) is None:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=f"Free tier limit reached ({limit} matches). Rescanning counts toward your match limit. Please upgrade to Pro for unlimited access."
+        )
+
+    return llm_client, improved_text, job_text, new_filename
+
+
+def _save_rescan(
+    db: Session,
+    match_id: int,
+    user_id: int,
+    improved_text: str,
+    analysis: dict,
+    match_result: Optional[dict],
+    new_filename: Optional[str]
+) -> Optional[ResumeResponse]:
+    """
+    Store the rescanned scores on the match and optionally save the improved resume.
+
+    Returns the saved resume, or None if it was not requested or had
+    already been saved.
+    """
+    if match_result is not None:
+        # The row now describes the improved text, not the original
+        # resume; rekey it so create_match never reuses it for the original
+        metadata = match_result.get("_metadata", {})
+        values = {
+            column: match_result.get(column.key, column)
+            for column in (
+                Match.match_score, Match.ats_score, Match.missing_skills, Match.recommendations,
+                Match.explanation, Match.keyword_matches, Match.ats_issues
+            )
+        }
+        values.update({
+            Match.resume_hash: content_hash(improved_text),
+            Match.detailed: True,
+            Match.llm_provider: metadata.get("provider", Match.llm_provider),
+            Match.llm_model: metadata.get("model", Match.llm_model)
+        })
+        db.query(Match).filter(Match.id == match_id).update(values, synchronize_session=False)
+
+    new_resume = None
+    if new_filename:
+        # Skipped if this improved resume was already saved
+        new_resume = _insert_resume_unless_duplicate(
+            db,
+            user_id=user_id,
+            filename=new_filename,
+            file_type="txt",
+            raw_text=improved_text,
+            parsed_data=analysis,
+            file_size=len(improved_text.encode()),
+            upload_hash=hashlib.sha256(improved_text.encode()).hexdigest(),
+            file_path=None
+        )
+
+    db.commit()
+    if new_resume is None:
+        return None
+
+    db.refresh(new_resume)
+    return ResumeResponse.from_orm(new_resume)
+
+
 @router.post("/improved/{match_id}/rescan")
 async def rescan_improved_resume(
     match_id: int,
@@ -1504,153 +1824,58 @@ async def rescan_improved_resume(
     2. Get a fresh analysis with structured data
     3. Optionally save it for future job matches
     """
-    # Get match
-    match = db.query(Match).filter(
-        Match.id == match_id,
-        Match.user_id == current_user.id
-    ).first()
-
-    if not match:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Match not found"
-        )
-
-    if not match.improved_resume_data:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Improved resume not generated yet. Generate it first via /resumes/{id}/rewrite endpoint."
-        )
-
-    # Check usage limits for free tier (rescanning counts toward match limit)
-    PLAN_LIMITS = {
-        "free": 10,
-        "pro": 999999,
-        "enterprise": 999999
-    }
-
-    limit = PLAN_LIMITS.get(current_user.plan, 10)
-    # Admin users bypass usage limits
-    if not current_user.is_admin and current_user.matches_used >= limit:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail=f"Free tier limit reached ({limit} matches). Rescanning counts toward your match limit. Please upgrade to Pro for unlimited access."
-        )
+    llm_client, improved_text, job_text, new_filename = await run_in_threadpool(
+        _reserve_rescan, db, current_user, match_id, save_to_collection
+    )
+    user_id = current_user.id
 
-    # Get the improved text
-    improved_text = match.improved_resume_data.get("improved_resume", "")
-    if not improved_text:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="No improved resume text available"
-        )
+    # Don't hold a pooled connection across the LLM calls
+    await run_in_threadpool(db.close)
 
     try:
-        # Use user's preferred provider and model if set, otherwise use defaults
-        provider = current_user.llm_provider or settings.default_llm_provider
-        model = current_user.llm_model or settings.default_model_name
-
         # Analyze the improved resume
-        api_key = get_user_llm_api_key(current_user, provider)
-        llm_client = LLMFactory.create_client(
-            provider=provider,
-            api_key=api_key,
-            model=model
-        )
-
         analyzer = ResumeAnalyzer(llm_client)
         analysis = await analyzer.analyze(improved_text)
 
         # Recalculate match scores with the improved resume
-        job = db.query(Job).filter(Job.id == match.job_id).first()
-        if job:
-            from app.services.job_matcher import JobMatcher
+        match_result = None
+        if job_text is not None:
             matcher = JobMatcher(llm_client)
-            job_text = f"{job.description}\n\n{job.requirements or ''}"
-
             match_result = await matcher.match(
                 resume_text=improved_text,
                 job_description=job_text,
                 detailed=True
             )
 
-            # Update match scores with improved resume results
-            match.match_score = match_result.get("match_score", match.match_score)
-            match.ats_score = match_result.get("ats_score", match.ats_score)
-            match.missing_skills = match_result.get("missing_skills", match.missing_skills)
-            match.recommendations = match_result.get("recommendations", match.recommendations)
-            match.explanation = match_result.get("explanation", match.explanation)
-            match.keyword_matches = match_result.get("keyword_matches", match.keyword_matches)
-            match.ats_issues = match_result.get("ats_issues", match.ats_issues)
+        saved_resume = await run_in_threadpool(
+            _save_rescan, db, match_id, user_id, improved_text, analysis, match_result, new_filename
+        )
 
+        if match_result is not None:
             logger.info(
                 "Match scores updated after rescan",
                 match_id=match_id,
-                new_match_score=match.match_score,
-                new_ats_score=match.ats_score
+                new_match_score=match_result.get("match_score"),
+                new_ats_score=match_result.get("ats_score")
+            )
+        if saved_resume is not None:
+            logger.info(
+                "Improved resume rescanned and saved",
+                new_resume_id=saved_resume.id,
+                match_id=match_id
             )
-
-            # Commit the updated match scores
-            db.commit()
-            db.refresh(match)
-
-        # Increment user's match usage counter (rescan counts as a match)
-        current_user.matches_used += 1
-        db.commit()
-
-        # If user wants to save it, create a new resume
-        saved_resume = None
-        if save_to_collection:
-            # Calculate hash for deduplication
-            text_hash = hashlib.sha256(improved_text.encode()).hexdigest()
-
-            # Check if already saved
-            existing = db.query(Resume).filter(
-                Resume.user_id == current_user.id,
-                Resume.upload_hash == text_hash
-            ).first()
-
-            if not existing:
-                # Get original resume and job for metadata
-                original_resume = db.query(Resume).filter(Resume.id == match.resume_id).first()
-                job = db.query(Job).filter(Job.id == match.job_id).first()
-
-                new_filename = f"improved_{original_resume.filename.rsplit('.', 1)[0]}_{job.title.replace(' ', '_') if job else 'optimized'}.txt"
-
-                new_resume = Resume(
-                    user_id=current_user.id,
-                    filename=new_filename,
-                    file_type="txt",
-                    raw_text=improved_text,
-                    parsed_data=analysis,
-                    file_size=len(improved_text.encode()),
-                    upload_hash=text_hash,
-                    file_path=None
-                )
-
-                db.add(new_resume)
-                db.commit()
-                db.refresh(new_resume)
-
-                saved_resume = new_resume
-
-                logger.info(
-                    "Improved resume rescanned and saved",
-                    new_resume_id=new_resume.id,
-                    match_id=match_id
-                )
 
         return {
             "analysis": analysis,
             "improved_text": improved_text,
-            "saved": save_to_collection and saved_resume is not None,
-            "saved_resume": ResumeResponse.from_orm(saved_resume) if saved_resume else None,
+            "saved": saved_resume is not None,
+            "saved_resume": saved_resume,
             "message": "Resume analyzed successfully!" + (" Saved to your collection." if saved_resume else "")
         }
 
     except Exception as e:
         logger.error("Failed to rescan improved resume", error=str(e))
-        db.rollback()
+        await run_in_threadpool(release_quota, db, user_id, User.matches_used)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to analyze improved resume. Please try again."
@@ -6,6 +6,8 @@ from typing import List, Optional, Dict, Any
 
 from pydantic import BaseModel, EmailStr, Field, field_validator
 
+from app.core.config import settings
+
 
 # User schemas
 class UserCreate(BaseModel):
@@ -98,18 +100,41 @@ class ResumeUpload(BaseModel):
     analyze: bool = Field(default=True, description="Run LLM analysis on upload")
 
 
-class ResumeResponse(BaseModel):
+class ResumeListItem(BaseModel):
+    """Resume summary for list views; omits the full resume text."""
     id: int
     filename: str
     file_type: str
-    raw_text: str
     parsed_data: Optional[Dict[str, Any]] = None
+    analysis_status: Optional[str] = None
     created_at: datetime
 
     class Config:
         from_attributes = True
 
 
+class ResumeResponse(ResumeListItem):
+    raw_text: str
+
+
+class ResumeBatchUploadItem(BaseModel):
+    """Outcome of one file in a batch upload."""
+    filename: str
+    success: bool
+    resume: Optional[ResumeResponse] = None
+    error: Optional[str] = None
+
+
+class ResumeAnalysisResponse(BaseModel):
+    """LLM analysis of an uploaded resume, polled while it runs in the background."""
+    id: int
+    analysis_status: Optional[str] = None
+    parsed_data: Optional[Dict[str, Any]] = None
+
+    class Config:
+        from_attributes = True
+
+
 # Job schemas
 class JobCreate(BaseModel):
     title: str = Field(min_length=1, max_length=255)
@@ -147,14 +172,28 @@ class MatchRequest(BaseModel):
     )
     llm_model: Optional[str] = Field(None, description="Specific model to use")
 
+    class Config:
+        extra = "forbid"
+        frozen = True
+
 
 class BatchMatchRequest(BaseModel):
-    resume_ids: List[int] = Field(..., min_length=1, max_length=100)
+    resume_ids: List[int] = Field(..., min_length=1, max_length=settings.max_batch_size)
     job_id: int
     detailed: bool = False
     llm_provider: Optional[str] = None
     llm_model: Optional[str] = None
 
+    class Config:
+        extra = "forbid"
+        frozen = True
+
+
+class BatchMatchQueuedResponse(BaseModel):
+    batch_job_id: int
+    task_ids: List[int]
+    status: str
+
 
 class MatchResponse(BaseModel):
     id: int
@@ -8,7 +8,7 @@ from datetime import datetime, timedelta
 from typing import Optional
 
 from fastapi import Depends, HTTPException, Security, status
-from fastapi.security import APIKeyHeader, HTTPBearer, HTTPAuthorizationCredentials
+from fastapi.security import APIKeyHeader, HTTPAuthorizationCredentials, HTTPBearer
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from sqlalchemy.orm import Session
@@ -230,3 +230,54 @@ def normalize_llm_provider_and_model(provider: Optional[str], model: Optional[st
         model = None
 
     return provider, model
+
+
+def resolve_user_llm(
+    user: User,
+    provider: Optional[str] = None,
+    model: Optional[str] = None
+) -> tuple[str, str, str]:
+    """
+    Resolve the LLM provider, model and API key for a request.
+
+    Priority: explicit provider/model (e.g. from the request body) > user
+    preference > system default.
+
+    Returns:
+        tuple[str, str, str]: (provider, model, api_key)
+
+    Raises:
+        HTTPException: 400 if no API key is configured for the provider
+    """
+    provider, model = normalize_llm_provider_and_model(
+        provider or user.llm_provider or settings.default_llm_provider,
+        model or user.llm_model or settings.default_model_name
+    )
+
+    api_key = get_user_llm_api_key(user, provider)
+
+    if not api_key:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"No API key configured for provider: {provider}"
+        )
+
+    return provider, model, api_key
+
+
+def get_user_llm_client(
+    user: User,
+    provider: Optional[str] = None,
+    model: Optional[str] = None
+):
+    """
+    Get the shared LLM client for a request (see resolve_user_llm).
+
+    Returns:
+        tuple: (BaseLLMClient, provider, model)
+    """
+    from app.core.llm_providers import LLMFactory
+
+    provider, model, api_key = resolve_user_llm(user, provider, model)
+    llm_client = LLMFactory.get_client(provider=provider, api_key=api_key, model=model)
+    return llm_client, provider, model
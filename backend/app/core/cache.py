@@ -0,0 +1,113 @@
+"""
+JSON cache in Redis for data that is expensive to load or compute.
+Every helper fails open: a cache miss or Redis outage falls back to the
+database, it never fails the request.
+"""
+import base64
+import hashlib
+from typing import Any, Optional
+
+import orjson
+
+from app.core.config import settings
+from app.core.redis_client import get_redis, report_redis_error
+
+
+def generated_content_key(user_id: int, match_id: int, kind: str) -> str:
+    """
+    Cache key for content generated for a match.
+
+    Scoped by user so a cache hit implies ownership of the match.
+
+    Args:
+        user_id: Owner of the match
+        match_id: Match ID
+        kind: Content type, e.g. "interview_prep" or "cover_letter"
+    """
+    return f"generated:{user_id}:{match_id}:{kind}"
+
+
+def shared_content_key(kind: str, *inputs: Optional[str]) -> str:
+    """
+    Content-addressed cache key for LLM output derived only from its inputs.
+
+    Identical resume and job text produce the same key for every user, so
+    the output is generated once and reused across accounts.
+
+    Args:
+        kind: Content type, e.g. "interview_prep" or "cover_letter"
+        inputs: Generation inputs (resume/job hashes, title, provider, model, tone)
+    """
+    digest = hashlib.sha256("\x1f".join(i or "" for i in inputs).encode("utf-8")).hexdigest()
+    return f"shared:{kind}:{digest}"
+
+
+def document_key(etag: str, format: str) -> str:
+    """
+    Cache key for a rendered PDF/DOCX document.
+
+    The ETag hashes everything the document is rendered from, so the key
+    changes whenever the content does and needs no explicit invalidation.
+
+    Args:
+        etag: ETag of the download response
+        format: Document format, "pdf" or "docx"
+    """
+    digest = hashlib.sha256(etag.encode("utf-8")).hexdigest()
+    return f"document:{digest}:{format}"
+
+
+async def cache_get_json(key: str) -> Optional[Any]:
+    """Get a cached JSON value, or None on a miss or Redis error."""
+    redis = get_redis()
+    if redis is None:
+        return None
+
+    try:
+        value = await redis.get(key)
+    except Exception as e:
+        report_redis_error(e)
+        return None
+
+    return orjson.loads(value) if value is not None else None
+
+
+async def cache_set_json(key: str, value: Any, ttl: Optional[int] = None) -> None:
+    """Cache a JSON-serializable value (default TTL: generated_content_cache_ttl)."""
+    redis = get_redis()
+    if redis is None:
+        return
+
+    try:
+        await redis.set(key, orjson.dumps(value), ex=ttl or settings.generated_content_cache_ttl)
+    except Exception as e:
+        report_redis_error(e)
+
+
+async def cache_delete(*keys: str) -> None:
+    """Remove cached values, e.g. after the underlying data changed."""
+    redis = get_redis()
+    if redis is None or not keys:
+        return
+
+    try:
+        await redis.delete(*keys)
+    except Exception as e:
+        report_redis_error(e)
+
+
+async def cache_get_bytes(key: str) -> Optional[bytes]:
+    """Get cached binary data, or None on a miss or Redis error."""
+    # The shared client decodes responses, so binary values are stored as base64
+    value = await cache_get_json(key)
+    if not isinstance(value, str):
+        return None
+    try:
+        return base64.b64decode(value)
+    except ValueError:
+        return None
+
+
+async def cache_set_bytes(key: str, value: bytes, ttl: Optional[int] = None) -> None:
+    """Cache binary data (default TTL: generated_content_cache_ttl)."""
+    await cache_set_json(key, base64.b64encode(value).decode("ascii"), ttl)
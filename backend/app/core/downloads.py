@@ -0,0 +1,68 @@
+"""
+Helpers for returning generated documents (PDF/DOCX) as file downloads.
+"""
+from io import BytesIO
+from typing import Any, AsyncIterator, Callable, Optional
+
+import orjson
+
+from app.core.cache import cache_get_bytes, cache_set_bytes, document_key
+from app.core.executors import run_in_process
+from app.core.http_cache import make_etag
+
+# Large enough that a typical document goes out in a handful of sends
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+
+async def iter_buffer(
+    buffer: BytesIO, chunk_size: int = DOWNLOAD_CHUNK_SIZE
+) -> AsyncIterator[bytes]:
+    """
+    Yield an in-memory document in fixed-size chunks.
+
+    Passing a BytesIO straight to StreamingResponse iterates it line by line,
+    which for binary files means many tiny sends, each dispatched through the
+    threadpool. Reading the buffer here is non-blocking, so the chunks are
+    sent from the event loop without extra copies of the document.
+
+    Args:
+        buffer: Document buffer positioned at the start
+        chunk_size: Maximum bytes per chunk
+    """
+    try:
+        while True:
+            chunk = buffer.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+    finally:
+        buffer.close()
+
+
+async def render_document(
+    render: Callable[..., BytesIO],
+    cache_key: Optional[str] = None,
+    **render_kwargs: Any
+) -> BytesIO:
+    """
+    Render a PDF/DOCX in the process pool, reusing cached bytes for the same inputs.
+
+    Repeat downloads of unchanged content skip reportlab/python-docx. Without
+    an explicit cache_key, the key hashes the renderer and its arguments, so
+    any change to the content renders a fresh document.
+
+    Args:
+        render: Picklable module-level function returning the document buffer
+        cache_key: Cache key for the rendered bytes (see document_key)
+        render_kwargs: Arguments passed to render
+    """
+    if cache_key is None:
+        inputs = orjson.dumps(render_kwargs, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS)
+        cache_key = document_key(make_etag(render.__qualname__, inputs), render.__qualname__)
+
+    content = await cache_get_bytes(cache_key)
+    if content is None:
+        content = (await run_in_process(render, **render_kwargs)).getvalue()
+        await cache_set_bytes(cache_key, content)
+
+    return BytesIO(content)
@@ -0,0 +1,66 @@
+"""
+Process pool for CPU-bound work (document parsing and rendering) that would otherwise
+hold the GIL and stall every other request handled by the same worker.
+"""
+import asyncio
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Any, Callable, Optional
+
+from app.core.config import settings
+from app.core.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Singleton instance
+_process_pool: Optional[ProcessPoolExecutor] = None
+_process_pool_lock = threading.Lock()
+
+
+def get_process_pool() -> ProcessPoolExecutor:
+    """
+    Get or create the shared process pool.
+
+    Workers are spawned rather than forked so they never inherit the parent's
+    open sockets, DB connections or threads.
+
+    Returns:
+        ProcessPoolExecutor instance
+    """
+    global _process_pool
+
+    if _process_pool is None:
+        with _process_pool_lock:
+            if _process_pool is None:
+                # Every web process has its own pool; split the cores between them
+                max_workers = settings.render_workers or max(
+                    1, (os.cpu_count() or 1) // settings.web_concurrency
+                )
+                _process_pool = ProcessPoolExecutor(
+                    max_workers=max_workers,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+                logger.info("Process pool started", max_workers=max_workers)
+
+    return _process_pool
+
+
+async def run_in_process(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """
+    Run a picklable module-level function in the process pool without
+    blocking the event loop.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_process_pool(), partial(func, *args, **kwargs))
+
+
+def shutdown_process_pool() -> None:
+    """Shut down the process pool if it was started."""
+    global _process_pool
+
+    if _process_pool is not None:
+        _process_pool.shutdown(wait=False, cancel_futures=True)
+        _process_pool = None
@@ -0,0 +1,45 @@
+"""
+Conditional GET support (ETag / If-None-Match) for responses that clients
+re-fetch without the underlying data having changed.
+"""
+import hashlib
+from typing import Optional, Union
+
+from fastapi import Request, Response, status
+
+
+def make_etag(*parts: Union[str, bytes]) -> str:
+    """
+    Weak ETag over the values a response is rendered from.
+
+    Args:
+        parts: Inputs that fully determine the response body
+    """
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part if isinstance(part, bytes) else part.encode("utf-8"))
+        digest.update(b"\x1f")
+    return f'W/"{digest.hexdigest()}"'
+
+
+def not_modified(request: Request, etag: str) -> Optional[Response]:
+    """
+    Return an empty 304 response if the client already has this version.
+
+    If-None-Match uses weak comparison, so W/ prefixes are ignored and a
+    comma-separated list or "*" is accepted.
+
+    Args:
+        request: Incoming request
+        etag: Current ETag of the resource
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return None
+
+    current = etag.removeprefix("W/")
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == current:
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    return None
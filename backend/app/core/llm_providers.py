@@ -2,19 +2,275 @@
 Multi-LLM provider system with support for Claude, OpenAI, Gemini, and OpenAI-compatible APIs.
 Implements a modular design pattern for easy addition of new LLM providers.
 """
+import asyncio
+import contextvars
+import hashlib
+import threading
+import time
+import weakref
 from abc import ABC, abstractmethod
-from typing import Any, Optional
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
+from functools import partial
+from typing import Any, AsyncIterator, Callable, Iterator, Optional
 
+import google.generativeai as genai
+import httpx
 from anthropic import Anthropic
+from google.ai import generativelanguage as glm
 from openai import OpenAI
-import google.generativeai as genai
 
 from app.core.config import settings
 from app.core.logging_config import get_logger
 
 logger = get_logger(__name__)
 
+# Shared HTTP transport for the OpenAI and Anthropic SDKs
+_http_client: Optional[httpx.Client] = None
+_http_client_lock = threading.Lock()
+
+# Threads running the blocking SDK calls and streams. Sized by
+# llm_max_concurrency rather than the loop's default executor, which is
+# capped at min(32, CPUs + 4) threads and shared with everything else
+_llm_executor: Optional[ThreadPoolExecutor] = None
+_llm_executor_lock = threading.Lock()
+
+# Shared client instances keyed by (provider, model, api key hash). Reusing a
+# client keeps its HTTP connection pool warm across requests.
+CLIENT_CACHE_SIZE = 256
+_client_cache: "OrderedDict[tuple[str, Optional[str], str], BaseLLMClient]" = OrderedDict()
+_client_cache_lock = threading.Lock()
+
+
+def get_http_client() -> httpx.Client:
+    """
+    Get the process-wide HTTP client shared by the provider SDKs.
+
+    A single connection pool keeps TLS connections to each provider alive
+    across requests and clients. HTTP/2 is used when the h2 package is installed.
+    """
+    global _http_client
+    with _http_client_lock:
+        if _http_client is None:
+            try:
+                import h2  # noqa: F401
+                http2 = True
+            except ImportError:
+                http2 = False
+
+            _http_client = httpx.Client(
+                http2=http2,
+                limits=httpx.Limits(
+                    max_connections=settings.llm_max_connections,
+                    max_keepalive_connections=settings.llm_max_connections
+                ),
+                timeout=httpx.Timeout(600.0, connect=10.0)
+            )
+        return _http_client
+
+
+def get_llm_executor() -> ThreadPoolExecutor:
+    """Get the thread pool that runs blocking provider SDK calls."""
+    global _llm_executor
+    with _llm_executor_lock:
+        if _llm_executor is None:
+            _llm_executor = ThreadPoolExecutor(
+                max_workers=settings.llm_max_concurrency,
+                thread_name_prefix="llm"
+            )
+        return _llm_executor
+
+
+def close_http_client() -> None:
+    """
+    Drop cached provider clients and close the shared HTTP connection pool.
+
+    Also stops the LLM thread pool. Called once on application shutdown.
+    """
+    global _http_client, _llm_executor
+    with _client_cache_lock:
+        _client_cache.clear()
+    with _http_client_lock:
+        if _http_client is not None:
+            _http_client.close()
+            _http_client = None
+    with _llm_executor_lock:
+        if _llm_executor is not None:
+            _llm_executor.shutdown(wait=False, cancel_futures=True)
+            _llm_executor = None
+
+
+def _key_digest(api_key: Optional[str]) -> str:
+    """Digest identifying an API key, so raw keys are never kept as cache keys."""
+    return hashlib.blake2b((api_key or "").encode(), digest_size=16).hexdigest()
+
+
+class ProviderLimiter:
+    """
+    Cap in-flight calls on one provider API key and pace them to a requests-per-minute budget.
+
+    Bursts beyond the budget wait here instead of failing with provider 429s.
+    asyncio primitives belong to one event loop, so limiters are per loop.
+    """
+
+    def __init__(self, max_concurrency: int, requests_per_minute: int):
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._rate = requests_per_minute / 60.0
+        self._capacity = float(min(max_concurrency, requests_per_minute or 1))
+        self._tokens = self._capacity
+        self._updated = time.monotonic()
+
+    async def _take_token(self) -> None:
+        """Wait for a token from the requests-per-minute bucket."""
+        while True:
+            now = time.monotonic()
+            self._tokens = min(self._capacity, self._tokens + (now - self._updated) * self._rate)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            await asyncio.sleep((1 - self._tokens) / self._rate)
+
+    async def acquire(self) -> None:
+        """Wait for a free slot and, if paced, a request token."""
+        await self._semaphore.acquire()
+        if self._rate:
+            try:
+                await self._take_token()
+            except BaseException:
+                self._semaphore.release()
+                raise
+
+    def release(self) -> None:
+        """Give back a slot taken by acquire; must run on the limiter's event loop."""
+        self._semaphore.release()
+
+    async def __aenter__(self) -> "ProviderLimiter":
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        self.release()
+
+
+# Per event loop, limiters keyed by (provider, api key digest), since provider
+# rate limits apply per key. All calls use the system key of each provider
+# (get_user_llm_api_key), so today this is one limiter per provider; keying
+# on the key keeps limits separate if a key is rotated or more keys are added
+_provider_limiters: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, OrderedDict]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def provider_limiter(provider: str, api_key: Optional[str]) -> ProviderLimiter:
+    """Get the running event loop's limiter for a provider API key."""
+    limiters = _provider_limiters.setdefault(asyncio.get_running_loop(), OrderedDict())
+    key = (provider, _key_digest(api_key))
+    limiter = limiters.get(key)
+    if limiter is None:
+        limiter = limiters[key] = ProviderLimiter(
+            settings.llm_max_concurrency, settings.llm_requests_per_minute
+        )
+        while len(limiters) > CLIENT_CACHE_SIZE:
+            limiters.popitem(last=False)
+    else:
+        limiters.move_to_end(key)
+    return limiter
+
+
+def _release_threadsafe(loop: asyncio.AbstractEventLoop, limiter: ProviderLimiter) -> None:
+    """Give a limiter slot back from a worker thread."""
+    try:
+        loop.call_soon_threadsafe(limiter.release)
+    except RuntimeError:
+        # The loop is already closed; its limiters are gone with it
+        pass
+
+
+async def _run_in_thread(
+    limiter: ProviderLimiter,
+    func: Callable[..., Any],
+    *args: Any,
+    **kwargs: Any
+) -> Any:
+    """
+    Run a blocking SDK call on the LLM thread pool, within a limiter's slot.
+
+    The slot is held until the thread finishes, even if the caller is
+    cancelled first, so the limit counts every running call.
+    """
+    loop = asyncio.get_running_loop()
+    await limiter.acquire()
+    try:
+        future = loop.run_in_executor(
+            get_llm_executor(), partial(contextvars.copy_context().run, func, *args, **kwargs)
+        )
+    except BaseException:
+        limiter.release()
+        raise
+    future.add_done_callback(lambda _: limiter.release())
+    return await asyncio.shield(future)
+
+
+async def _iterate_in_thread(
+    limiter: ProviderLimiter,
+    make_iterator: Callable[[], Iterator[str]]
+) -> AsyncIterator[str]:
+    """
+    Drive a blocking SDK stream on the LLM thread pool and yield its chunks on the event loop.
+
+    The provider SDKs only offer synchronous streaming, so chunks are handed
+    over through an asyncio.Queue as they arrive. If the consumer stops
+    early the producer closes the stream at its next chunk; the limiter slot
+    is held until the producer thread has finished.
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+    finished = object()
+    stop = threading.Event()
+
+    def produce() -> None:
+        iterator = None
+        try:
+            iterator = make_iterator()
+            for chunk in iterator:
+                if stop.is_set():
+                    break
+                loop.call_soon_threadsafe(queue.put_nowait, chunk)
+        except Exception as e:
+            loop.call_soon_threadsafe(queue.put_nowait, e)
+        finally:
+            try:
+                close = getattr(iterator, "close", None)
+                if close is not None:
+                    close()
+            except Exception as e:
+                logger.warning("Failed to close LLM stream", error=str(e))
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, finished)
+            except RuntimeError:
+                pass
+            _release_threadsafe(loop, limiter)
+
+    await limiter.acquire()
+    try:
+        loop.run_in_executor(get_llm_executor(), produce)
+    except BaseException:
+        limiter.release()
+        raise
+
+    try:
+        while True:
+            item = await queue.get()
+            if item is finished:
+                break
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        stop.set()
+
 
 class LLMProvider(str, Enum):
     """Supported LLM providers."""
@@ -68,6 +324,10 @@ class BaseLLMClient(ABC):
         """Get the default model name for this provider."""
         pass
 
+    def _limiter(self) -> ProviderLimiter:
+        """Limiter shared by all calls made with this client's provider and API key."""
+        return provider_limiter(self.provider_name, self.api_key)
+
     @abstractmethod
     async def generate(
         self,
@@ -84,13 +344,33 @@ class BaseLLMClient(ABC):
         """Estimate the cost for the given number of tokens."""
         pass
 
+    async def stream(
+        self,
+        prompt: str,
+        temperature: float = 0.3,
+        max_tokens: int = 4096,
+        **kwargs: Any
+    ) -> AsyncIterator[str]:
+        """
+        Stream response text as it is generated.
+
+        Providers without native streaming yield the full response once.
+        """
+        response = await self.generate(
+            prompt, temperature=temperature, max_tokens=max_tokens, **kwargs
+        )
+        yield response.content
+
 
 class ClaudeClient(BaseLLMClient):
     """Client for Anthropic Claude API."""
 
     def __init__(self, api_key: Optional[str] = None, model: Optional[str] = None):
         super().__init__(api_key, model)
-        self.client = Anthropic(api_key=self.api_key or settings.anthropic_api_key)
+        self.client = Anthropic(
+            api_key=self.api_key or settings.anthropic_api_key,
+            http_client=get_http_client()
+        )
 
     def get_default_model(self) -> str:
         return "claude-sonnet-4-20250514"  # Claude Sonnet 4.5
@@ -106,7 +386,10 @@ class ClaudeClient(BaseLLMClient):
         try:
             logger.info("Generating response with Claude", model=self.model)
 
-            response = self.client.messages.create(
+            # The SDK call is blocking; run it off the event loop
+            response = await _run_in_thread(
+                self._limiter(),
+                self.client.messages.create,
                 model=self.model,
                 max_tokens=max_tokens,
                 temperature=temperature,
@@ -143,6 +426,29 @@ class ClaudeClient(BaseLLMClient):
             logger.error("Claude API error", error=str(e))
             raise
 
+    async def stream(
+        self,
+        prompt: str,
+        temperature: float = 0.3,
+        max_tokens: int = 4096,
+        **kwargs: Any
+    ) -> AsyncIterator[str]:
+        """Stream response text using Claude API."""
+        logger.info("Streaming response with Claude", model=self.model)
+
+        def make_iterator() -> Iterator[str]:
+            with self.client.messages.stream(
+                model=self.model,
+                max_tokens=max_tokens,
+                temperature=temperature,
+                messages=[{"role": "user", "content": prompt}],
+                **kwargs
+            ) as stream:
+                yield from stream.text_stream
+
+        async for chunk in _iterate_in_thread(self._limiter(), make_iterator):
+            yield chunk
+
     def estimate_cost(self, tokens: int) -> float:
         """Estimate cost based on Claude pricing (approximate)."""
         # Claude 3.5 Sonnet: $3/$15 per million tokens (input/output)
@@ -155,7 +461,10 @@ class OpenAIClient(BaseLLMClient):
 
     def __init__(self, api_key: Optional[str] = None, model: Optional[str] = None):
         super().__init__(api_key, model)
-        self.client = OpenAI(api_key=self.api_key or settings.openai_api_key)
+        self.client = OpenAI(
+            api_key=self.api_key or settings.openai_api_key,
+            http_client=get_http_client()
+        )
 
     def get_default_model(self) -> str:
         return "gpt-5-mini-2025-08-07"  # GPT-5 Mini - efficient and cost-effective
@@ -171,21 +480,11 @@ class OpenAIClient(BaseLLMClient):
         try:
             logger.info("Generating response with OpenAI", model=self.model)
 
-            request_params = {
-                "model": self.model,
-                "messages": [{"role": "user", "content": prompt}],
-                "temperature": temperature,
-                **kwargs
-            }
-
-            # GPT-5 and O1 models don't support max_tokens parameter
-            # They use automatic token management instead
-            model_lower = self.model.lower()
-            if not any(prefix in model_lower for prefix in ["gpt-5", "o1-", "o3-"]):
-                # Only add max_tokens for GPT-4 and earlier models
-                request_params["max_tokens"] = max_tokens
+            request_params = self._request_params(prompt, temperature, max_tokens, **kwargs)
 
-            response = self.client.chat.completions.create(**request_params)
+            response = await _run_in_thread(
+                self._limiter(), self.client.chat.completions.create, **request_params
+            )
 
             content = response.choices[0].message.content
             total_tokens = response.usage.total_tokens
@@ -214,6 +513,51 @@ class OpenAIClient(BaseLLMClient):
             logger.error("OpenAI API error", error=str(e))
             raise
 
+    async def stream(
+        self,
+        prompt: str,
+        temperature: float = 0.3,
+        max_tokens: int = 4096,
+        **kwargs: Any
+    ) -> AsyncIterator[str]:
+        """Stream response text using OpenAI API."""
+        logger.info("Streaming response with OpenAI", model=self.model)
+        request_params = self._request_params(
+            prompt, temperature, max_tokens, stream=True, **kwargs
+        )
+
+        def make_iterator() -> Iterator[str]:
+            for chunk in self.client.chat.completions.create(**request_params):
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+
+        async for chunk in _iterate_in_thread(self._limiter(), make_iterator):
+            yield chunk
+
+    def _request_params(
+        self,
+        prompt: str,
+        temperature: float,
+        max_tokens: int,
+        **kwargs: Any
+    ) -> dict[str, Any]:
+        """Build chat completion parameters for the configured model."""
+        request_params = {
+            "model": self.model,
+            "messages": [{"role": "user", "content": prompt}],
+            "temperature": temperature,
+            **kwargs
+        }
+
+        # GPT-5 and O1 models don't support max_tokens parameter
+        # They use automatic token management instead
+        model_lower = self.model.lower()
+        if not any(prefix in model_lower for prefix in ["gpt-5", "o1-", "o3-"]):
+            # Only add max_tokens for GPT-4 and earlier models
+            request_params["max_tokens"] = max_tokens
+
+        return request_params
+
     def estimate_cost(self, tokens: int) -> float:
         """Estimate cost based on GPT-4 pricing (approximate)."""
         # GPT-4 Turbo: ~$10/$30 per million tokens (input/output)
@@ -226,8 +570,14 @@ class GeminiClient(BaseLLMClient):
 
     def __init__(self, api_key: Optional[str] = None, model: Optional[str] = None):
         super().__init__(api_key, model)
-        genai.configure(api_key=self.api_key or settings.google_api_key)
         self.client = genai.GenerativeModel(self.model)
+        # genai.configure() sets one key for the whole process, which cached
+        # clients for different keys would overwrite under each other; give
+        # the model its own service client (GenerativeModel takes no client
+        # argument, it otherwise falls back to the process default)
+        self.client._client = glm.GenerativeServiceClient(
+            client_options={"api_key": self.api_key or settings.google_api_key}
+        )
 
     def get_default_model(self) -> str:
         return "gemini-2.5-flash"  # Gemini 2.5 Flash - best price-performance
@@ -248,7 +598,9 @@ class GeminiClient(BaseLLMClient):
                 "max_output_tokens": max_tokens,
             }
 
-            response = self.client.generate_content(
+            response = await _run_in_thread(
+                self._limiter(),
+                self.client.generate_content,
                 prompt,
                 generation_config=generation_config,
                 **kwargs
@@ -279,6 +631,34 @@ class GeminiClient(BaseLLMClient):
             logger.error("Gemini API error", error=str(e))
             raise
 
+    async def stream(
+        self,
+        prompt: str,
+        temperature: float = 0.3,
+        max_tokens: int = 4096,
+        **kwargs: Any
+    ) -> AsyncIterator[str]:
+        """Stream response text using Gemini API."""
+        logger.info("Streaming response with Gemini", model=self.model)
+
+        generation_config = {
+            "temperature": temperature,
+            "max_output_tokens": max_tokens,
+        }
+
+        def make_iterator() -> Iterator[str]:
+            for chunk in self.client.generate_content(
+                prompt,
+                generation_config=generation_config,
+                stream=True,
+                **kwargs
+            ):
+                if chunk.parts:
+                    yield chunk.text
+
+        async for chunk in _iterate_in_thread(self._limiter(), make_iterator):
+            yield chunk
+
     def estimate_cost(self, tokens: int) -> float:
         """Estimate cost based on Gemini pricing (approximate)."""
         # Gemini Pro: Free tier available, paid ~$0.5/$1.5 per million
@@ -299,7 +679,8 @@ class OpenAICompatibleClient(BaseLLMClient):
         self.base_url = base_url or settings.openai_compatible_base_url
         self.client = OpenAI(
             api_key=self.api_key or settings.openai_compatible_api_key or "dummy-key",
-            base_url=self.base_url
+            base_url=self.base_url,
+            http_client=get_http_client()
         )
 
     def get_default_model(self) -> str:
@@ -320,7 +701,9 @@ class OpenAICompatibleClient(BaseLLMClient):
                 base_url=self.base_url
             )
 
-            response = self.client.chat.completions.create(
+            response = await _run_in_thread(
+                self._limiter(),
+                self.client.chat.completions.create,
                 model=self.model,
                 messages=[{"role": "user", "content": prompt}],
                 temperature=temperature,
@@ -352,6 +735,35 @@ class OpenAICompatibleClient(BaseLLMClient):
             logger.error("OpenAI-compatible API error", error=str(e))
             raise
 
+    async def stream(
+        self,
+        prompt: str,
+        temperature: float = 0.3,
+        max_tokens: int = 4096,
+        **kwargs: Any
+    ) -> AsyncIterator[str]:
+        """Stream response text using OpenAI-compatible API."""
+        logger.info(
+            "Streaming response with OpenAI-compatible API",
+            model=self.model,
+            base_url=self.base_url
+        )
+
+        def make_iterator() -> Iterator[str]:
+            for chunk in self.client.chat.completions.create(
+                model=self.model,
+                messages=[{"role": "user", "content": prompt}],
+                temperature=temperature,
+                max_tokens=max_tokens,
+                stream=True,
+                **kwargs
+            ):
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+
+        async for chunk in _iterate_in_thread(self._limiter(), make_iterator):
+            yield chunk
+
     def estimate_cost(self, tokens: int) -> float:
         """Estimate cost (often $0 for local or custom deployments)."""
         return 0.0
@@ -451,3 +863,37 @@ class LLMFactory:
             raise ValueError(f"Unsupported LLM provider: {provider}")
 
         return client_class(api_key=api_key, model=model, **kwargs)
+
+    @staticmethod
+    def get_client(
+        provider: str | LLMProvider,
+        api_key: Optional[str] = None,
+        model: Optional[str] = None
+    ) -> BaseLLMClient:
+        """
+        Get a shared LLM client, creating it on first use.
+
+        Clients are cached per (provider, model, api key) so SDK setup and
+        connection pools are paid once per process instead of per request.
+        The LRU cache keys on a blake2b digest of the API key, never the raw key.
+        """
+        provider_name = (
+            provider.value if isinstance(provider, LLMProvider) else str(provider).lower()
+        )
+        cache_key = (provider_name, model, _key_digest(api_key))
+
+        with _client_cache_lock:
+            client = _client_cache.get(cache_key)
+            if client is not None:
+                _client_cache.move_to_end(cache_key)
+                return client
+
+        client = LLMFactory.create_client(provider=provider, api_key=api_key, model=model)
+
+        with _client_cache_lock:
+            client = _client_cache.setdefault(cache_key, client)
+            _client_cache.move_to_end(cache_key)
+            while len(_client_cache) > CLIENT_CACHE_SIZE:
+                _client_cache.popitem(last=False)
+
+        return client
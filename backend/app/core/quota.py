@@ -0,0 +1,103 @@
+"""
+Plan usage quotas (matches, interview preps, cover letters).
+
+Quota is reserved with a single conditional UPDATE before any LLM work, so
+concurrent requests cannot both pass a stale limit check, and released
+again if the work does not complete.
+"""
+from types import MappingProxyType
+from typing import Optional
+
+from sqlalchemy import update
+from sqlalchemy.orm import InstrumentedAttribute, Session
+
+from app.core.logging_config import get_logger
+from app.models.models import User
+
+logger = get_logger(__name__)
+
+# Per-plan usage limits, built once at import (read-only)
+PLAN_LIMITS = MappingProxyType({
+    "free": 10,  # 10 free job matches
+    "pro": 999999,  # Unlimited for pro
+    "enterprise": 999999
+})
+
+INTERVIEW_PREP_LIMITS = MappingProxyType({
+    "free": 3,
+    "pro": 999999,
+    "enterprise": 999999
+})
+
+COVER_LETTER_LIMITS = MappingProxyType({
+    "free": 3,
+    "pro": 999999,
+    "enterprise": 999999
+})
+
+RESUME_REWRITE_LIMITS = MappingProxyType({
+    "free": 3,
+    "pro": 999999,
+    "enterprise": 999999
+})
+
+
+def reserve_quota(
+    db: Session,
+    user: User,
+    counter: InstrumentedAttribute,
+    limit: int,
+    amount: int = 1
+) -> Optional[int]:
+    """
+    Atomically add `amount` to a user's usage counter if it stays within limit.
+
+    Admin users bypass the limit but are still counted. The reservation is
+    committed immediately so no row lock is held during the LLM call.
+
+    Args:
+        db: Database session
+        user: User to charge
+        counter: Usage column, e.g. User.matches_used
+        limit: Maximum value the counter may reach
+        amount: Units to reserve
+
+    Returns:
+        The new counter value, or None if the limit would be exceeded
+    """
+    stmt = update(User).where(User.id == user.id)
+    if not user.is_admin:
+        stmt = stmt.where(counter + amount <= limit)
+
+    used = db.execute(
+        stmt.values({counter: counter + amount}).returning(counter)
+    ).scalar_one_or_none()
+    db.commit()
+
+    return used
+
+
+def release_quota(
+    db: Session, user_id: int, counter: InstrumentedAttribute, amount: int = 1
+) -> None:
+    """
+    Give back quota reserved by reserve_quota for work that did not complete.
+
+    Args:
+        db: Database session
+        user_id: User that was charged
+        counter: Usage column passed to reserve_quota
+        amount: Units to release
+    """
+    if amount <= 0:
+        return
+
+    try:
+        db.rollback()
+        db.execute(
+            update(User).where(User.id == user_id).values({counter: counter - amount})
+        )
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        logger.error("Failed to release quota", user_id=user_id, counter=counter.key, error=str(e))
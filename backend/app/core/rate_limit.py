@@ -0,0 +1,100 @@
+"""
+Request guards that reject abusive traffic before any expensive work.
+Counters live in Redis so limits hold across all API workers.
+"""
+import secrets
+import time
+from typing import Optional
+
+from fastapi import Depends, HTTPException, status
+
+from app.core.auth import get_current_user
+from app.core.config import settings
+from app.core.logging_config import get_logger
+from app.core.redis_client import get_redis, report_redis_error
+from app.models.models import User
+
+logger = get_logger(__name__)
+
+# Each in-flight request is a member of a per-user sorted set scored by its
+# start time. Entries older than this are ignored, so a crashed worker cannot
+# hold a slot forever; it is kept above the 600s LLM HTTP timeout so a slow
+# batch does not lose its slot while still running
+INFLIGHT_TTL_SECONDS = 900
+
+
+def _inflight_key(user_id: int) -> str:
+    return f"user:{user_id}:inflight"
+
+
+async def acquire_match_slot(user_id: int) -> Optional[str]:
+    """
+    Take one of a user's in-flight match slots.
+
+    Fails open when Redis is unavailable.
+
+    Returns:
+        Token to pass to release_match_slot, or None if no slot is being
+        tracked
+
+    Raises:
+        HTTPException: 429 if the user already has per_user_match_concurrency
+            requests running
+    """
+    redis = get_redis()
+    if redis is None:
+        return None
+
+    key = _inflight_key(user_id)
+    token = secrets.token_hex(8)
+    now = time.time()
+    try:
+        async with redis.pipeline(transaction=True) as pipe:
+            pipe.zremrangebyscore(key, "-inf", now - INFLIGHT_TTL_SECONDS)
+            pipe.zadd(key, {token: now})
+            pipe.zcard(key)
+            pipe.expire(key, INFLIGHT_TTL_SECONDS)
+            _, _, inflight, _ = await pipe.execute()
+    except Exception as e:
+        report_redis_error(e)
+        return None
+
+    if inflight > settings.per_user_match_concurrency:
+        await release_match_slot(user_id, token)
+        logger.warning("Match concurrency limit hit", user_id=user_id, inflight=inflight)
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many match requests in progress. Please wait for them to finish.",
+            headers={"Retry-After": "5"}
+        )
+
+    return token
+
+
+async def release_match_slot(user_id: int, token: str) -> None:
+    """Give back a slot taken by acquire_match_slot; a no-op once it has expired."""
+    redis = get_redis()
+    if redis is None:
+        return
+
+    try:
+        await redis.zrem(_inflight_key(user_id), token)
+    except Exception as e:
+        report_redis_error(e)
+
+
+async def limit_match_concurrency(current_user: User = Depends(get_current_user)):
+    """
+    Cap the number of in-flight match requests per user.
+
+    Holds one of the user's slots for the duration of the request. Not
+    suitable for streaming endpoints: FastAPI exits yield dependencies
+    before a StreamingResponse body is sent, so those take the slot with
+    acquire_match_slot and give it back once the stream ends.
+    """
+    token = await acquire_match_slot(current_user.id)
+    try:
+        yield
+    finally:
+        if token:
+            await release_match_slot(current_user.id, token)
@@ -0,0 +1,65 @@
+"""
+Redis client for state shared across API workers (rate limits, caches).
+Redis is optional: when the package or server is unavailable, callers get
+None and are expected to fail open.
+"""
+import time
+from typing import Any, Optional
+
+from app.core.config import settings
+from app.core.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Seconds to stop using Redis after a connection error, so an unreachable
+# server does not add a timeout to every request
+REDIS_RETRY_SECONDS = 30
+
+# Singleton instance
+_redis_client: Optional[Any] = None
+_redis_retry_at: float = 0.0
+
+
+def get_redis() -> Optional[Any]:
+    """
+    Get or create the async Redis client singleton.
+
+    Returns:
+        redis.asyncio.Redis instance, or None if Redis is unavailable
+    """
+    global _redis_client, _redis_retry_at
+
+    if time.monotonic() < _redis_retry_at:
+        return None
+
+    if _redis_client is None:
+        try:
+            import redis.asyncio as aioredis
+        except ImportError:
+            logger.warning("redis package not installed, Redis-backed features disabled")
+            _redis_retry_at = float("inf")
+            return None
+
+        _redis_client = aioredis.from_url(
+            settings.redis_url,
+            socket_connect_timeout=0.5,
+            socket_timeout=0.5,
+            decode_responses=True,
+        )
+
+    return _redis_client
+
+
+def report_redis_error(error: Exception) -> None:
+    """Log a Redis failure and back off before trying Redis again."""
+    global _redis_retry_at
+    _redis_retry_at = time.monotonic() + REDIS_RETRY_SECONDS
+    logger.warning("Redis unavailable, failing open", error=str(error))
+
+
+async def close_redis() -> None:
+    """Close the Redis connection pool on shutdown."""
+    global _redis_client
+    if _redis_client is not None:
+        await _redis_client.aclose()
+        _redis_client = None
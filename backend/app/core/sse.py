@@ -0,0 +1,46 @@
+"""
+Server-sent event helpers for streaming LLM output to the browser.
+"""
+import time
+from typing import AsyncIterator, List, Optional
+
+import orjson
+
+# Coalesce streamed LLM chunks into one SSE event per window instead of per token
+STREAM_FLUSH_SECONDS = 0.05
+
+# Keep proxies (nginx) from buffering the stream
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+
+def sse_event(data: dict, event: Optional[str] = None) -> bytes:
+    """Encode a server-sent event with a JSON payload."""
+    prefix = f"event: {event}\n".encode() if event else b""
+    return prefix + b"data: " + orjson.dumps(data) + b"\n\n"
+
+
+async def sse_deltas(chunks: AsyncIterator[str], parts: List[str]) -> AsyncIterator[bytes]:
+    """
+    Re-emit streamed text chunks as {"delta": ...} events.
+
+    Chunks arriving within STREAM_FLUSH_SECONDS of each other are sent as
+    one event. Every chunk is also appended to `parts`, so the caller can
+    join the full text once the stream ends.
+
+    Args:
+        chunks: Text chunks from an LLM stream
+        parts: List collecting the chunks
+    """
+    pending: List[str] = []
+    last_flush = time.monotonic()
+
+    async for chunk in chunks:
+        parts.append(chunk)
+        pending.append(chunk)
+        if time.monotonic() - last_flush >= STREAM_FLUSH_SECONDS:
+            yield sse_event({"delta": "".join(pending)})
+            pending.clear()
+            last_flush = time.monotonic()
+
+    if pending:
+        yield sse_event({"delta": "".join(pending)})
@@ -2,11 +2,10 @@
 Cloud storage utilities for handling file uploads.
 Supports GCP Cloud Storage and local filesystem fallback.
 """
-import os
-import json
-from typing import Optional, BinaryIO
-from io import BytesIO
 import hashlib
+import json
+import os
+from typing import Optional
 
 from app.core.config import settings
 from app.core.logging_config import get_logger
@@ -32,7 +31,8 @@ class StorageClient:
         file_content: bytes,
         filename: str,
         content_type: str = "application/octet-stream",
-        user_id: Optional[int] = None
+        user_id: Optional[int] = None,
+        content_hash: Optional[str] = None
     ) -> str:
         """
         Upload file to storage and return the storage path/URL.
@@ -42,13 +42,19 @@ class StorageClient:
             filename: Original filename
             content_type: MIME type
             user_id: Optional user ID for organizing files
+            content_hash: Hex SHA-256 of file_content, if the caller already has it
 
         Returns:
             Storage path or public URL
         """
+        # Stored names are prefixed with the content hash; skip hashing the
+        # file a second time when the caller computed it while reading
+        if content_hash is None:
+            content_hash = hashlib.sha256(file_content).hexdigest()
+
         if self.provider == "gcs":
-            return self._upload_to_gcs(file_content, filename, content_type, user_id)
-        return self._upload_to_local(file_content, filename, user_id)
+            return self._upload_to_gcs(file_content, filename, content_type, user_id, content_hash)
+        return self._upload_to_local(file_content, filename, user_id, content_hash)
 
     def download_file(self, file_path: str) -> bytes:
         """
@@ -98,7 +104,8 @@ class StorageClient:
         file_content: bytes,
         filename: str,
         content_type: str,
-        user_id: Optional[int]
+        user_id: Optional[int],
+        content_hash: str
     ) -> str:
         """Upload file to Google Cloud Storage."""
         try:
@@ -119,7 +126,7 @@ class StorageClient:
             bucket = client.bucket(settings.gcp_bucket_name)
 
             # Generate unique path
-            file_hash = hashlib.sha256(file_content).hexdigest()[:16]
+            file_hash = content_hash[:16]
             user_prefix = f"user_{user_id}" if user_id else "uploads"
             blob_name = f"{user_prefix}/{file_hash}_{filename}"
 
@@ -203,7 +210,8 @@ class StorageClient:
         self,
         file_content: bytes,
         filename: str,
-        user_id: Optional[int]
+        user_id: Optional[int],
+        content_hash: str
     ) -> str:
         """Upload file to local filesystem."""
         # Create uploads directory
@@ -214,7 +222,7 @@ class StorageClient:
         os.makedirs(upload_dir, exist_ok=True)
 
         # Generate unique filename
-        file_hash = hashlib.sha256(file_content).hexdigest()[:16]
+        file_hash = content_hash[:16]
         unique_filename = f"{file_hash}_{filename}"
         file_path = os.path.join(upload_dir, unique_filename)
 
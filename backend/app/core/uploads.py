@@ -0,0 +1,53 @@
+"""
+Helpers for reading user file uploads.
+"""
+import hashlib
+from typing import Tuple
+
+from fastapi import HTTPException, UploadFile, status
+
+# Large enough that a typical resume is read in one or two calls
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+
+async def read_upload(
+    file: UploadFile, max_bytes: int, chunk_size: int = UPLOAD_CHUNK_SIZE
+) -> Tuple[bytes, str]:
+    """
+    Read an upload in chunks, hashing it as it is read.
+
+    The SHA-256 is updated per chunk, so no separate pass over the whole
+    file runs on the event loop afterwards, and an oversized upload is
+    rejected as soon as it crosses the limit instead of after being read
+    into memory in full.
+
+    Args:
+        file: Uploaded file
+        max_bytes: Maximum accepted size; larger uploads raise 413
+        chunk_size: Bytes read per call
+
+    Returns:
+        Tuple of (file content, hex SHA-256 of the content)
+    """
+    too_large = HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"File too large. Max size: {max_bytes // (1024 * 1024)}MB"
+    )
+
+    # The multipart parser records the size of the spooled part; reject
+    # before reading any of it back when it is known to be over the limit
+    if file.size is not None and file.size > max_bytes:
+        raise too_large
+
+    hasher = hashlib.sha256()
+    chunks = []
+    size = 0
+
+    while chunk := await file.read(chunk_size):
+        size += len(chunk)
+        if size > max_bytes:
+            raise too_large
+        hasher.update(chunk)
+        chunks.append(chunk)
+
+    return b"".join(chunks), hasher.hexdigest()
@@ -6,11 +6,15 @@ from datetime import datetime
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 from fastapi.exceptions import RequestValidationError
 
+from app.core.compression import JSONGZipMiddleware
 from app.core.config import settings
 from app.core.logging_config import configure_logging, get_logger
+from app.core.executors import shutdown_process_pool
+from app.core.llm_providers import close_http_client
+from app.core.redis_client import close_redis
 from app.api import auth, resumes, jobs, matches, health, linkedin, applications, analytics
 
 # Configure logging
@@ -30,6 +34,9 @@ async def lifespan(app: FastAPI):
     yield
     # Shutdown
     logger.info("Shutting down application")
+    await close_redis()
+    shutdown_process_pool()
+    close_http_client()
 
 
 # Create FastAPI app
@@ -40,6 +47,7 @@ app = FastAPI(
     docs_url="/docs",
     redoc_url="/redoc",
     openapi_url="/openapi.json",
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
@@ -53,6 +61,9 @@ app.add_middleware(
     max_age=3600,  # Cache preflight requests for 1 hour
 )
 
+# Compress large JSON responses (interview prep, match lists)
+app.add_middleware(JSONGZipMiddleware, minimum_size=1024, compresslevel=5)
+
 
 # Exception handlers
 @app.exception_handler(RequestValidationError)
@@ -113,5 +124,7 @@ if __name__ == "__main__":
         port=settings.port,
         reload=settings.debug,
         workers=1 if settings.debug else settings.workers,
+        loop="uvloop",
+        http="httptools",
         log_level=settings.log_level.lower()
     )
@@ -2,27 +2,33 @@
 SQLAlchemy models for the application.
 Includes support for pgvector for vector embeddings.
 """
+import hashlib
 from datetime import datetime
 from typing import Optional
 
+from pgvector.sqlalchemy import Vector
 from sqlalchemy import (
-    Column,
-    Integer,
-    String,
-    Text,
-    Float,
+    JSON,
     Boolean,
+    Column,
     DateTime,
+    Float,
     ForeignKey,
-    JSON,
     Index,
-    func,
+    Integer,
+    String,
+    Text,
+    event,
+    inspect,
 )
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
-from pgvector.sqlalchemy import Vector
 
 from app.models.database import Base
 
+# Binary JSONB on PostgreSQL (plain JSON elsewhere, e.g. SQLite in tests)
+JSONBType = JSON().with_variant(JSONB(), "postgresql")
+
 
 class User(Base):
     """User model for API authentication."""
@@ -75,6 +81,7 @@ class Resume(Base):
     file_type = Column(String(10), nullable=False)  # pdf, docx, txt
     raw_text = Column(Text, nullable=False)
     parsed_data = Column(JSON, nullable=True)  # Structured data from LLM analysis
+    analysis_status = Column(String(20), nullable=True)  # uploading, pending, completed, failed
 
     # Vector embedding for similarity search
     embedding = Column(Vector(1536), nullable=True)  # OpenAI embedding size
@@ -82,6 +89,7 @@ class Resume(Base):
     # Metadata
     file_size = Column(Integer, nullable=True)
     upload_hash = Column(String(64), nullable=True, index=True)  # For deduplication
+    content_hash = Column(String(64), nullable=True)  # SHA-256 of raw_text, for match caching
     file_path = Column(String(512), nullable=True)  # GCS file path (resumes/user_id/filename)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -94,6 +102,13 @@ class Resume(Base):
     # Indexes for vector similarity search
     __table_args__ = (
         Index("idx_resume_embedding", "embedding", postgresql_using="ivfflat"),
+        Index("idx_resume_user", "user_id"),
+        Index(
+            "idx_resume_user_created", "user_id", created_at.desc(), id.desc(),
+            postgresql_where=deleted_at.is_(None)
+        ),
+        # One resume per file per user; uploads insert with ON CONFLICT DO NOTHING
+        Index("uq_resume_user_upload_hash", "user_id", "upload_hash", unique=True),
     )
 
 
@@ -116,6 +131,8 @@ class Job(Base):
     # Metadata
     source_url = Column(Text, nullable=True)  # Changed from String(512) to Text for long URLs
     job_hash = Column(String(64), nullable=True, index=True)  # For deduplication
+    # SHA-256 of description + requirements, for match caching
+    content_hash = Column(String(64), nullable=True)
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -129,8 +146,14 @@ class Job(Base):
     # Indexes
     __table_args__ = (
         Index("idx_job_embedding", "embedding", postgresql_using="ivfflat"),
+        Index("idx_job_user", "user_id"),
     )
 
+    @property
+    def full_text(self) -> str:
+        """Description plus requirements, as sent to the LLM."""
+        return build_job_text(self.description, self.requirements)
+
 
 class Match(Base):
     """Match results between resumes and jobs."""
@@ -144,19 +167,19 @@ class Match(Base):
 
     # Match results
     match_score = Column(Float, nullable=False)  # 0-100
-    missing_skills = Column(JSON, nullable=True)
-    recommendations = Column(JSON, nullable=True)
+    missing_skills = Column(JSONBType, nullable=True)
+    recommendations = Column(JSONBType, nullable=True)
     explanation = Column(Text, nullable=True)
 
     # ATS Analysis
     ats_score = Column(Float, nullable=True)  # 0-100 ATS compatibility score
-    keyword_matches = Column(JSON, nullable=True)  # Matched and missing keywords
-    ats_issues = Column(JSON, nullable=True)  # Formatting issues and recommendations
+    keyword_matches = Column(JSONBType, nullable=True)  # Matched and missing keywords
+    ats_issues = Column(JSONBType, nullable=True)  # Formatting issues and recommendations
 
     # Generated Content (Phase 2)
-    interview_prep_data = Column(JSON, nullable=True)  # Cached interview prep questions
-    cover_letter_data = Column(JSON, nullable=True)  # Cached cover letter
-    improved_resume_data = Column(JSON, nullable=True)  # Cached improved resume
+    interview_prep_data = Column(JSONBType, nullable=True)  # Cached interview prep questions
+    cover_letter_data = Column(JSONBType, nullable=True)  # Cached cover letter
+    improved_resume_data = Column(JSONBType, nullable=True)  # Cached improved resume
 
     # LLM metadata
     llm_provider = Column(String(50), nullable=True)
@@ -164,6 +187,11 @@ class Match(Base):
     tokens_used = Column(Integer, nullable=True)
     cost_estimate = Column(Float, nullable=True)
 
+    # Content hashes of the inputs this result was computed from (match cache key)
+    resume_hash = Column(String(64), nullable=True)
+    job_hash = Column(String(64), nullable=True)
+    detailed = Column(Boolean, nullable=True)
+
     # Timestamps
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -178,6 +206,8 @@ class Match(Base):
     __table_args__ = (
         Index("idx_match_score", "match_score"),
         Index("idx_match_user_resume_job", "user_id", "resume_id", "job_id"),
+        Index("idx_match_user_job", "user_id", "job_id", created_at.desc(), id.desc()),
+        Index("idx_match_user_created", "user_id", created_at.desc(), id.desc()),
     )
 
 
@@ -251,6 +281,39 @@ class BatchJob(Base):
     )
 
 
+class MatchTask(Base):
+    """Per-resume unit of work for queued batch matching."""
+
+    __tablename__ = "match_tasks"
+
+    id = Column(Integer, primary_key=True, index=True)
+    batch_job_id = Column(Integer, ForeignKey("batch_jobs.id", ondelete="CASCADE"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    job_id = Column(Integer, ForeignKey("jobs.id", ondelete="CASCADE"), nullable=False)
+    resume_id = Column(Integer, ForeignKey("resumes.id", ondelete="CASCADE"), nullable=False)
+    status = Column(
+        String(20),
+        nullable=False,
+        default="pending"
+    )  # pending, processing, completed, failed
+
+    # Outcome
+    match_id = Column(Integer, ForeignKey("matches.id", ondelete="SET NULL"), nullable=True)
+    error_message = Column(Text, nullable=True)
+
+    # Timestamps
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    started_at = Column(DateTime, nullable=True)  # Set when a worker claims the task
+
+    # Indexes
+    __table_args__ = (
+        # Workers claim the oldest pending task of a batch:
+        # WHERE batch_job_id = ? AND status = 'pending' ORDER BY id
+        Index("idx_match_task_batch_status", "batch_job_id", "status", "id"),
+    )
+
+
 class Analytics(Base):
     """Analytics events for tracking user activity and platform usage."""
 
@@ -259,7 +322,7 @@ class Analytics(Base):
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=True)  # Nullable for anonymous events
     event_type = Column(String(100), nullable=False, index=True)  # page_view, match_created, resume_uploaded, etc.
-    event_data = Column(JSON, nullable=True)  # Additional event metadata
+    event_data = Column(JSONBType, nullable=True)  # Additional event metadata
     ip_address = Column(String(45), nullable=True)  # IPv4 or IPv6
     user_agent = Column(Text, nullable=True)
     referrer = Column(Text, nullable=True)
@@ -268,6 +331,12 @@ class Analytics(Base):
     # Relationships
     user = relationship("User")
 
+    # Indexes
+    __table_args__ = (
+        # Containment queries on event metadata, e.g. event_data @> '{"match_id": 1}'
+        Index("idx_analytics_event_data", "event_data", postgresql_using="gin"),
+    )
+
 
 class APIUsage(Base):
     """Track API usage and costs for monitoring."""
@@ -290,3 +359,54 @@ class APIUsage(Base):
         Index("idx_usage_user_created", "user_id", "created_at"),
         Index("idx_usage_endpoint", "endpoint"),
     )
+
+
+# analysis_status of the placeholder an upload commits to claim its hash,
+# until the file is parsed and stored
+RESUME_UPLOADING = "uploading"
+
+# Filter for resumes whose upload has completed; placeholders have no text yet
+RESUME_UPLOADED = Resume.analysis_status.is_distinct_from(RESUME_UPLOADING)
+
+
+def content_hash(text: Optional[str]) -> str:
+    """SHA-256 hex digest of text, used to detect unchanged resume/job content."""
+    return hashlib.sha256((text or "").encode("utf-8")).hexdigest()
+
+
+def build_job_text(description: str, requirements: Optional[str] = None) -> str:
+    """
+    Build the job text sent to the LLM.
+
+    Most jobs have no separate requirements, so the description is returned
+    as-is without copying it. Build this once per job and reuse it across a batch.
+    """
+    if not requirements:
+        return description
+    return f"{description}\n\n{requirements}"
+
+
+def job_content_hash(description: Optional[str], requirements: Optional[str]) -> str:
+    """Content hash over the job fields sent to the LLM."""
+    return content_hash(f"{description or ''}\n\n{requirements or ''}")
+
+
+@event.listens_for(Resume, "before_insert")
+@event.listens_for(Resume, "before_update")
+def _set_resume_content_hash(mapper, connection, target: Resume) -> None:
+    """Keep Resume.content_hash in sync with raw_text."""
+    if target.content_hash is None or inspect(target).attrs.raw_text.history.has_changes():
+        target.content_hash = content_hash(target.raw_text)
+
+
+@event.listens_for(Job, "before_insert")
+@event.listens_for(Job, "before_update")
+def _set_job_content_hash(mapper, connection, target: Job) -> None:
+    """Keep Job.content_hash in sync with description and requirements."""
+    state = inspect(target)
+    if (
+        target.content_hash is None
+        or state.attrs.description.history.has_changes()
+        or state.attrs.requirements.history.has_changes()
+    ):
+        target.content_hash = job_content_hash(target.description, target.requirements)
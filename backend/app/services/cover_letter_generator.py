@@ -2,7 +2,7 @@
 Cover letter generator for creating tailored cover letters.
 Uses LLM to generate professional cover letters based on resume and job description.
 """
-from typing import Dict, List, Any, Optional
+from typing import AsyncIterator, Dict, List, Any, Optional
 from io import BytesIO
 from docx import Document
 from docx.shared import Pt, Inches, RGBColor
@@ -61,17 +61,14 @@ class CoverLetterGenerator:
 
             response = await self.llm_client.generate(prompt)
 
-            # Extract name from resume if not provided
-            if not candidate_name:
-                candidate_name = self._extract_name(resume_text)
-
-            result = {
-                "cover_letter": response.content,
-                "candidate_name": candidate_name,
-                "job_title": job_title,
-                "company": company,
-                "tone": tone
-            }
+            result = self.build_result(
+                cover_letter=response.content,
+                resume_text=resume_text,
+                job_title=job_title,
+                company=company,
+                candidate_name=candidate_name,
+                tone=tone
+            )
 
             logger.info("Cover letter generated successfully")
             return result
@@ -80,6 +77,55 @@ class CoverLetterGenerator:
             logger.error("Failed to generate cover letter", error=str(e))
             raise
 
+    async def stream(
+        self,
+        resume_text: str,
+        job_description: str,
+        job_title: str,
+        company: str,
+        candidate_name: Optional[str] = None,
+        tone: str = "professional"
+    ) -> AsyncIterator[str]:
+        """
+        Stream the cover letter text as the LLM produces it.
+
+        Uses the same prompt as generate(); pass the joined text to
+        build_result() to get the cacheable result.
+        """
+        prompt = self._build_prompt(
+            resume_text=resume_text,
+            job_description=job_description,
+            job_title=job_title,
+            company=company,
+            candidate_name=candidate_name,
+            tone=tone
+        )
+
+        async for chunk in self.llm_client.stream(prompt):
+            yield chunk
+
+    def build_result(
+        self,
+        cover_letter: str,
+        resume_text: str,
+        job_title: str,
+        company: str,
+        candidate_name: Optional[str] = None,
+        tone: str = "professional"
+    ) -> Dict[str, Any]:
+        """Assemble the cover letter result dictionary."""
+        # Extract name from resume if not provided
+        if not candidate_name:
+            candidate_name = self._extract_name(resume_text)
+
+        return {
+            "cover_letter": cover_letter,
+            "candidate_name": candidate_name,
+            "job_title": job_title,
+            "company": company,
+            "tone": tone
+        }
+
     def _build_prompt(
         self,
         resume_text: str,
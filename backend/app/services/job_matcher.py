@@ -2,10 +2,14 @@
 Job matching service for scoring resumes against job descriptions.
 Uses LLMs to generate match scores, identify missing skills, and provide recommendations.
 """
-from typing import Dict, List, Optional, Any
+import asyncio
 import json
 import re
+from typing import Any, AsyncIterator, Dict, List, Tuple
 
+import orjson
+
+from app.core.config import settings
 from app.core.logging_config import get_logger
 from app.services.ats_analyzer import ATSAnalyzer
 
@@ -15,15 +19,18 @@ logger = get_logger(__name__)
 class JobMatcher:
     """Service for matching resumes to job descriptions."""
 
+    # Prompts put the job description before the resume so every request in a
+    # batch shares the same leading tokens, which providers with automatic
+    # prompt-prefix caching (OpenAI) prefill once instead of per resume.
     MATCHING_PROMPT = """
 You are an expert ATS (Applicant Tracking System) and recruiter analyzing resume-job fit. Your scoring must reflect how modern ATS systems and recruiters evaluate candidates.
 
-**Resume:**
-{resume_text}
-
 **Job Description:**
 {job_description}
 
+**Resume:**
+{resume_text}
+
 **Your Task:** Provide a detailed, objective analysis of how well this resume matches the job requirements.
 
 **SHARED SCORING CONTRACT (CRITICAL):**
@@ -184,10 +191,10 @@ Format your response as valid JSON with the following structure:
     QUICK_MATCH_PROMPT = """
 Quick analysis: Score this resume (0-100) against the job description.
 
-Resume: {resume_text}
-
 Job: {job_description}
 
+Resume: {resume_text}
+
 Respond with ONLY a JSON object:
 {{
     "match_score": <number>,
@@ -333,35 +340,71 @@ Respond with ONLY a JSON object:
         Returns:
             List of matching results
         """
-        results = []
+        results = [
+            result
+            async for result in self.iter_batch_match(resume_texts, job_description, detailed)
+        ]
 
+        # Sort by match score descending
+        results.sort(key=lambda x: x.get("match_score", 0), reverse=True)
+
+        logger.info("Batch match completed", successful=len(results))
+
+        return results
+
+    async def iter_batch_match(
+        self,
+        resume_texts: List[str],
+        job_description: str,
+        detailed: bool = False
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Match multiple resumes against a single job, yielding each result as it completes.
+
+        Results carry "resume_index" to pair them back to their input. A failed
+        match yields {"resume_index", "error", "match_score": 0} instead of raising.
+        Closing the iterator early cancels the matches still in flight.
+
+        Args:
+            resume_texts: List of resume texts
+            job_description: Job description text
+            detailed: If True, provide detailed analysis for each
+        """
         logger.info(
             "Starting batch match",
             num_resumes=len(resume_texts),
             detailed=detailed
         )
 
-        for idx, resume_text in enumerate(resume_texts):
-            try:
-                logger.info(f"Matching resume {idx + 1}/{len(resume_texts)}")
-                result = await self.match(resume_text, job_description, detailed)
-                result["resume_index"] = idx
-                results.append(result)
-
-            except Exception as e:
-                logger.error(f"Failed to match resume {idx}", error=str(e))
-                results.append({
-                    "resume_index": idx,
-                    "error": str(e),
-                    "match_score": 0
-                })
+        # Overlap provider round trips, bounded to stay within rate limits
+        semaphore = asyncio.Semaphore(settings.llm_concurrency)
 
-        # Sort by match score descending
-        results.sort(key=lambda x: x.get("match_score", 0), reverse=True)
+        async def match_one(idx: int, resume_text: str) -> Dict[str, Any]:
+            async with semaphore:
+                try:
+                    logger.info(f"Matching resume {idx + 1}/{len(resume_texts)}")
+                    result = await self.match(resume_text, job_description, detailed)
+                    result["resume_index"] = idx
+                    return result
 
-        logger.info("Batch match completed", successful=len(results))
+                except Exception as e:
+                    logger.error(f"Failed to match resume {idx}", error=str(e))
+                    return {
+                        "resume_index": idx,
+                        "error": str(e),
+                        "match_score": 0
+                    }
 
-        return results
+        tasks = [
+            asyncio.create_task(match_one(idx, resume_text))
+            for idx, resume_text in enumerate(resume_texts)
+        ]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
 
     def _parse_response(self, content: str) -> Dict[str, Any]:
         """
@@ -392,7 +435,7 @@ Respond with ONLY a JSON object:
 
             # Step 2: Try direct parsing first
             try:
-                data = json.loads(content)
+                data = orjson.loads(content)
                 return data
             except json.JSONDecodeError as e:
                 logger.warn(
@@ -405,7 +448,7 @@ Respond with ONLY a JSON object:
                 fixed_content = self._fix_json_issues(content)
 
                 try:
-                    data = json.loads(fixed_content)
+                    data = orjson.loads(fixed_content)
                     logger.info("Successfully parsed JSON after fixing issues")
                     return data
                 except json.JSONDecodeError as e2:
@@ -510,6 +553,66 @@ Respond with ONLY a JSON object:
         return fallback
 
 
+def match_result_rows(
+    result: Dict[str, Any],
+    user_id: int,
+    resume_id: int,
+    job_id: int,
+    resume_hash: str,
+    job_hash: str,
+    detailed: bool,
+    endpoint: str
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    Match row and APIUsage row for one successful match result.
+
+    Shared by the API and the batch workers so every stored match carries
+    the same columns, including the hashes create_match reuses results by.
+
+    Args:
+        result: Result of JobMatcher.match
+        user_id: Owner of the match
+        resume_id: Matched resume
+        job_id: Matched job
+        resume_hash: Content hash of the resume text that was matched
+        job_hash: Content hash of the job text that was matched
+        detailed: Whether a detailed analysis was requested
+        endpoint: Endpoint recorded in the usage row
+
+    Returns:
+        Tuple of (Match column values, APIUsage column values)
+    """
+    metadata = result["_metadata"]
+    match_row = {
+        "user_id": user_id,
+        "resume_id": resume_id,
+        "job_id": job_id,
+        "match_score": result.get("match_score", 0),
+        "missing_skills": result.get("missing_skills"),
+        "recommendations": result.get("recommendations"),
+        "explanation": result.get("explanation"),
+        "ats_score": result.get("ats_score"),
+        "keyword_matches": result.get("keyword_matches"),
+        "ats_issues": result.get("ats_issues"),
+        "llm_provider": metadata["provider"],
+        "llm_model": metadata["model"],
+        "tokens_used": metadata["tokens_used"],
+        "cost_estimate": metadata["cost_estimate"],
+        "resume_hash": resume_hash,
+        "job_hash": job_hash,
+        "detailed": detailed
+    }
+    usage_row = {
+        "user_id": user_id,
+        "endpoint": endpoint,
+        "llm_provider": metadata["provider"],
+        "llm_model": metadata["model"],
+        "tokens_used": metadata["tokens_used"],
+        "cost_estimate": metadata["cost_estimate"]
+    }
+    return match_row, usage_row
+
+
 class SkillExtractor:
     """Service for extracting skills from job descriptions."""
 
@@ -576,7 +679,7 @@ Format as JSON:
             else:
                 content = response.content
 
-            skills_data = json.loads(content.strip())
+            skills_data = orjson.loads(content.strip())
 
             logger.info("Skills extracted successfully")
 
@@ -1,16 +1,35 @@
 """
 Resume document generator for creating downloadable resume files.
-Converts resume text to formatted DOCX files.
+Converts resume text to formatted DOCX and PDF files.
 """
+import re
 from io import BytesIO
 from docx import Document
 from docx.shared import Pt, Inches, RGBColor
 from docx.enum.text import WD_ALIGN_PARAGRAPH
+from reportlab.lib.pagesizes import letter
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.lib.units import inch
 
 from app.core.logging_config import get_logger
 
 logger = get_logger(__name__)
 
+# Section header keywords, matched anywhere in the upper-cased line
+_DOCX_HEADER_RE = re.compile("SUMMARY|EXPERIENCE|EDUCATION|SKILLS|PROJECTS|CERTIFICATIONS|CONTACT")
+_PROFESSIONAL_HEADER_RE = re.compile(
+    "SUMMARY|OBJECTIVE|EXPERIENCE|EDUCATION|SKILLS|PROJECTS|CERTIFICATIONS|ACHIEVEMENTS"
+)
+_PDF_HEADER_RE = re.compile("SUMMARY|EXPERIENCE|EDUCATION|SKILLS|PROJECTS|CERTIFICATIONS")
+
+# PDF styles are read-only during a build, so they are created once per
+# worker process and shared by every document. Spacers are not: platypus
+# records layout state on each flowable, so every line gets its own.
+_PDF_STYLES = getSampleStyleSheet()
+_PDF_HEADER_STYLE = _PDF_STYLES['Heading2']
+_PDF_TEXT_STYLE = _PDF_STYLES['Normal']
+
 
 class ResumeGenerator:
     """Generate formatted resume documents."""
@@ -53,10 +72,7 @@ class ResumeGenerator:
                 is_header = (
                     line.isupper() or
                     line.endswith(':') or
-                    any(keyword in line.upper() for keyword in [
-                        'SUMMARY', 'EXPERIENCE', 'EDUCATION', 'SKILLS',
-                        'PROJECTS', 'CERTIFICATIONS', 'CONTACT'
-                    ])
+                    _DOCX_HEADER_RE.search(line.upper()) is not None
                 )
 
                 if is_header:
@@ -136,12 +152,7 @@ class ResumeGenerator:
                     continue
 
                 # Detect section headers
-                is_major_header = any(keyword in line.upper() for keyword in [
-                    'PROFESSIONAL SUMMARY', 'SUMMARY', 'OBJECTIVE',
-                    'WORK EXPERIENCE', 'EXPERIENCE', 'PROFESSIONAL EXPERIENCE',
-                    'EDUCATION', 'SKILLS', 'TECHNICAL SKILLS',
-                    'PROJECTS', 'CERTIFICATIONS', 'ACHIEVEMENTS'
-                ])
+                is_major_header = _PROFESSIONAL_HEADER_RE.search(line.upper()) is not None
 
                 if is_major_header:
                     # Major section header
@@ -185,3 +196,49 @@ class ResumeGenerator:
         except Exception as e:
             logger.error("Failed to create professional DOCX", error=str(e))
             raise
+
+    @staticmethod
+    def create_pdf(resume_text: str) -> BytesIO:
+        """
+        Convert resume text to a simple PDF file.
+
+        Args:
+            resume_text: Plain text resume content
+
+        Returns:
+            BytesIO object containing the PDF file
+        """
+        try:
+            pdf_buffer = BytesIO()
+            doc = SimpleDocTemplate(pdf_buffer, pagesize=letter,
+                                    rightMargin=0.75*inch, leftMargin=0.75*inch,
+                                    topMargin=0.75*inch, bottomMargin=0.75*inch)
+
+            story = []
+
+            # Parse and add content
+            lines = resume_text.split('\n')
+            for line in lines:
+                line = line.strip()
+                if not line:
+                    story.append(Spacer(1, 0.2*inch))
+                    continue
+
+                # Detect headers
+                if _PDF_HEADER_RE.search(line.upper()):
+                    p = Paragraph(line, _PDF_HEADER_STYLE)
+                else:
+                    p = Paragraph(line, _PDF_TEXT_STYLE)
+
+                story.append(p)
+                story.append(Spacer(1, 0.1*inch))
+
+            doc.build(story)
+            pdf_buffer.seek(0)
+
+            logger.info("Resume PDF created successfully")
+            return pdf_buffer
+
+        except Exception as e:
+            logger.error("Failed to create PDF", error=str(e))
+            raise
@@ -2,13 +2,17 @@
 Resume parsing service for extracting text from PDF, DOCX, and TXT files.
 Supports multiple parsing strategies with fallbacks for robustness.
 """
+import asyncio
 import io
+import time
 from pathlib import Path
 from typing import Optional
 
 import fitz  # PyMuPDF
 from docx import Document
 
+from app.core.config import settings
+from app.core.executors import run_in_process
 from app.core.logging_config import get_logger
 
 logger = get_logger(__name__)
@@ -25,13 +29,14 @@ class ResumeParser:
     SUPPORTED_FORMATS = {".pdf", ".docx", ".txt"}
 
     @staticmethod
-    def parse(file_content: bytes, filename: str) -> str:
+    def parse(file_content: bytes, filename: str, timeout: Optional[float] = None) -> str:
         """
         Parse resume from file content.
 
         Args:
             file_content: Raw file bytes
             filename: Original filename with extension
+            timeout: Seconds after which PDF/DOCX extraction gives up
 
         Returns:
             Extracted text content
@@ -48,12 +53,13 @@ class ResumeParser:
             )
 
         logger.info("Parsing resume", filename=filename, format=file_extension)
+        deadline = time.monotonic() + timeout if timeout is not None else None
 
         try:
             if file_extension == ".pdf":
-                text = ResumeParser._parse_pdf(file_content)
+                text = ResumeParser._parse_pdf(file_content, deadline)
             elif file_extension == ".docx":
-                text = ResumeParser._parse_docx(file_content)
+                text = ResumeParser._parse_docx(file_content, deadline)
             elif file_extension == ".txt":
                 text = ResumeParser._parse_txt(file_content)
             else:
@@ -75,12 +81,46 @@ class ResumeParser:
             raise ResumeParseError(f"Failed to parse {filename}: {str(e)}")
 
     @staticmethod
-    def _parse_pdf(file_content: bytes) -> str:
+    async def parse_async(file_content: bytes, filename: str) -> str:
+        """
+        Parse resume from file content without blocking the event loop.
+
+        PDF and DOCX extraction is CPU-bound, so it runs in the shared process
+        pool; plain text is decoded inline. The worker itself stops once
+        resume_parse_timeout_seconds have passed (checked between pages and
+        paragraphs) so a pathological file cannot keep a pool process busy;
+        the wait is bounded as well in case a single page runs long.
+
+        Raises:
+            ResumeParseError: If parsing fails or exceeds resume_parse_timeout_seconds
+        """
+        if Path(filename).suffix.lower() == ".txt":
+            return ResumeParser.parse(file_content, filename)
+
+        timeout = settings.resume_parse_timeout_seconds
+        try:
+            return await asyncio.wait_for(
+                run_in_process(ResumeParser.parse, file_content, filename, timeout),
+                timeout=timeout + 1
+            )
+        except asyncio.TimeoutError:
+            logger.error("Resume parsing timed out", filename=filename)
+            raise ResumeParseError(f"Timed out parsing {filename}")
+
+    @staticmethod
+    def _check_deadline(deadline: Optional[float]) -> None:
+        """Abort extraction once the parse deadline has passed."""
+        if deadline is not None and time.monotonic() > deadline:
+            raise ResumeParseError("Timed out extracting text")
+
+    @staticmethod
+    def _parse_pdf(file_content: bytes, deadline: Optional[float] = None) -> str:
         """
         Parse PDF file using PyMuPDF.
 
         Args:
             file_content: PDF file bytes
+            deadline: time.monotonic() value after which to give up
 
         Returns:
             Extracted text
@@ -90,11 +130,20 @@ class ResumeParser:
             pdf_document = fitz.open(stream=file_content, filetype="pdf")
             text_parts = []
 
-            for page_num in range(pdf_document.page_count):
-                page = pdf_document[page_num]
-                text_parts.append(page.get_text())
-
-            pdf_document.close()
+            try:
+                # Resumes are a few pages; refuse documents far beyond that
+                # before extracting anything
+                if pdf_document.page_count > settings.resume_parse_max_pages:
+                    raise ResumeParseError(
+                        f"PDF has too many pages (max {settings.resume_parse_max_pages})"
+                    )
+
+                for page_num in range(pdf_document.page_count):
+                    ResumeParser._check_deadline(deadline)
+                    page = pdf_document[page_num]
+                    text_parts.append(page.get_text())
+            finally:
+                pdf_document.close()
 
             text = "\n\n".join(text_parts)
             return text
@@ -104,12 +153,13 @@ class ResumeParser:
             raise ResumeParseError(f"Failed to parse PDF: {str(e)}")
 
     @staticmethod
-    def _parse_docx(file_content: bytes) -> str:
+    def _parse_docx(file_content: bytes, deadline: Optional[float] = None) -> str:
         """
         Parse DOCX file using python-docx.
 
         Args:
             file_content: DOCX file bytes
+            deadline: time.monotonic() value after which to give up
 
         Returns:
             Extracted text
@@ -121,11 +171,13 @@ class ResumeParser:
 
             # Extract text from paragraphs
             for paragraph in doc.paragraphs:
+                ResumeParser._check_deadline(deadline)
                 if paragraph.text.strip():
                     text_parts.append(paragraph.text)
 
             # Extract text from tables
             for table in doc.tables:
+                ResumeParser._check_deadline(deadline)
                 for row in table.rows:
                     row_text = [cell.text.strip() for cell in row.cells if cell.text.strip()]
                     if row_text:
@@ -2,7 +2,7 @@
 Resume rewriting service v2 with ATS optimization and anti-hallucination controls.
 Uses LLMs to rewrite resumes based on match recommendations and job requirements.
 """
-from typing import Dict, Any, Optional, List
+from typing import AsyncIterator, Dict, Any, Optional, List
 import json
 import re
 
@@ -759,67 +759,137 @@ Now rewrite the resume following ALL instructions above. Ensure BOTH Match Score
             Dictionary with improved resume and detailed analysis
         """
         try:
-            logger.info(
-                "Starting resume rewrite v2",
+            prompt = self._build_prompt(
+                resume_text=resume_text,
+                job_description=job_description,
                 match_score=match_score,
-                ats_score=ats_analysis.get('ats_score') if ats_analysis else None,
-                num_recommendations=len(recommendations) if recommendations else 0
+                recommendations=recommendations,
+                missing_skills=missing_skills,
+                score_breakdown=score_breakdown,
+                ats_analysis=ats_analysis
             )
 
-            # Format recommendations
-            if recommendations:
-                rec_text = "\n".join([
-                    f"- {rec.get('action', rec) if isinstance(rec, dict) else rec}"
-                    for rec in recommendations
-                ])
-            else:
-                rec_text = "No specific recommendations provided"
+            response = await self.llm_client.generate(
+                prompt=prompt,
+                temperature=0.3,
+                max_tokens=4096
+            )
 
-            # Format missing skills
-            skills_text = ", ".join(missing_skills) if missing_skills else "None specified"
+            logger.info("Resume rewrite v2 completed")
+
+            return self.build_result(response.content, {
+                "model": response.model,
+                "provider": response.provider,
+                "tokens_used": response.tokens_used,
+                "cost_estimate": response.cost_estimate
+            })
+
+        except Exception as e:
+            logger.error("Resume rewriting v2 failed", error=str(e))
+            raise
 
-            # Extract category scores and calculate headroom
-            if score_breakdown:
-                skills_breakdown = score_breakdown.get('skills_match', {})
-                skills_points = skills_breakdown.get('points', 0) if isinstance(skills_breakdown, dict) else score_breakdown.get('skills_match', 0)
+    async def stream(
+        self,
+        resume_text: str,
+        job_description: str,
+        match_score: float,
+        recommendations: Optional[List[Dict[str, Any]]] = None,
+        missing_skills: Optional[List[str]] = None,
+        score_breakdown: Optional[Dict[str, Any]] = None,
+        ats_analysis: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream the raw rewrite response (JSON text) as the LLM produces it.
 
-                keyword_breakdown = score_breakdown.get('keyword_optimization', {})
-                keyword_points = keyword_breakdown.get('points', 0) if isinstance(keyword_breakdown, dict) else score_breakdown.get('keyword_optimization', 0)
+        Uses the same prompt as rewrite_resume(); pass the joined text to
+        build_result() to get the parsed, post-processed result.
+        """
+        prompt = self._build_prompt(
+            resume_text=resume_text,
+            job_description=job_description,
+            match_score=match_score,
+            recommendations=recommendations,
+            missing_skills=missing_skills,
+            score_breakdown=score_breakdown,
+            ats_analysis=ats_analysis
+        )
+
+        async for chunk in self.llm_client.stream(prompt, temperature=0.3, max_tokens=4096):
+            yield chunk
+
+    def _build_prompt(
+        self,
+        resume_text: str,
+        job_description: str,
+        match_score: float,
+        recommendations: Optional[List[Dict[str, Any]]] = None,
+        missing_skills: Optional[List[str]] = None,
+        score_breakdown: Optional[Dict[str, Any]] = None,
+        ats_analysis: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """Build the rewrite prompt from the resume, job and match analysis."""
+        logger.info(
+            "Starting resume rewrite v2",
+            match_score=match_score,
+            ats_score=ats_analysis.get('ats_score') if ats_analysis else None,
+            num_recommendations=len(recommendations) if recommendations else 0
+        )
+
+        # Format recommendations
+        if recommendations:
+            rec_text = "\n".join([
+                f"- {rec.get('action', rec) if isinstance(rec, dict) else rec}"
+                for rec in recommendations
+            ])
+        else:
+            rec_text = "No specific recommendations provided"
 
-                experience_breakdown = score_breakdown.get('experience_relevance', {})
-                experience_points = experience_breakdown.get('points', 0) if isinstance(experience_breakdown, dict) else score_breakdown.get('experience_relevance', 0)
+        # Format missing skills
+        skills_text = ", ".join(missing_skills) if missing_skills else "None specified"
 
-                achievement_breakdown = score_breakdown.get('achievements', {})
-                achievement_points = achievement_breakdown.get('points', 0) if isinstance(achievement_breakdown, dict) else score_breakdown.get('achievements', 0)
+        # Extract category scores and calculate headroom
+        if score_breakdown:
+            def category_points(category: str) -> float:
+                # Categories are either {"points": ...} or a bare number
+                breakdown = score_breakdown.get(category, {})
+                return breakdown.get('points', 0) if isinstance(breakdown, dict) else breakdown
 
-                education_breakdown = score_breakdown.get('education', {})
-                education_points = education_breakdown.get('points', 0) if isinstance(education_breakdown, dict) else score_breakdown.get('education', 0)
+            skills_points = category_points('skills_match')
+            keyword_points = category_points('keyword_optimization')
+            experience_points = category_points('experience_relevance')
+            achievement_points = category_points('achievements')
+            education_points = category_points('education')
 
-                score_breakdown_text = json.dumps(score_breakdown, indent=2)
+            score_breakdown_text = json.dumps(score_breakdown, indent=2)
+        else:
+            skills_points = keyword_points = experience_points = 0
+            achievement_points = education_points = 0
+            score_breakdown_text = "Score breakdown not available"
+
+        # Calculate headroom
+        skills_headroom = 40 - skills_points
+        keyword_headroom = 15 - keyword_points
+        experience_headroom = 30 - experience_points
+        achievement_headroom = 10 - achievement_points
+        education_headroom = 5 - education_points
+
+        # Format ATS analysis and extract components
+        if ats_analysis:
+            ats_score = ats_analysis.get('ats_score', 0)
+            formatting_score = ats_analysis.get('formatting_score', 0)
+            section_score = ats_analysis.get('section_score', 0)
+            contact_score = ats_analysis.get('contact_score', 0)
+            keyword_analysis = ats_analysis.get('keyword_analysis', {})
+            keyword_match_percentage = keyword_analysis.get('match_percentage', 0)
+
+            # Format issues list
+            issues_list = ats_analysis.get('issues', [])
+            if issues_list:
+                ats_issues = '\n'.join(f"- {issue}" for issue in issues_list[:10])
             else:
-                skills_points = keyword_points = experience_points = achievement_points = education_points = 0
-                score_breakdown_text = "Score breakdown not available"
-
-            # Calculate headroom
-            skills_headroom = 40 - skills_points
-            keyword_headroom = 15 - keyword_points
-            experience_headroom = 30 - experience_points
-            achievement_headroom = 10 - achievement_points
-            education_headroom = 5 - education_points
-
-            # Format ATS analysis and extract components
-            if ats_analysis:
-                ats_score = ats_analysis.get('ats_score', 0)
-                formatting_score = ats_analysis.get('formatting_score', 0)
-                section_score = ats_analysis.get('section_score', 0)
-                contact_score = ats_analysis.get('contact_score', 0)
-                keyword_match_percentage = ats_analysis.get('keyword_analysis', {}).get('match_percentage', 0)
-
-                # Format issues list
-                issues_list = ats_analysis.get('issues', [])
-                ats_issues = '\n'.join(f"- {issue}" for issue in issues_list[:10]) if issues_list else "No major issues detected"
-
-                ats_text = f"""
+                ats_issues = "No major issues detected"
+
+            ats_text = f"""
 **Current ATS Score:** {ats_score}/100
 
 **ATS Component Scores:**
@@ -834,105 +904,103 @@ Now rewrite the resume following ALL instructions above. Ensure BOTH Match Score
 **Missing Keywords:**
 {', '.join(ats_analysis.get('keyword_analysis', {}).get('missing_keywords', [])[:15])}
 """
-            else:
-                ats_score = 0
-                formatting_score = 0
-                section_score = 0
-                contact_score = 0
-                keyword_match_percentage = 0
-                ats_issues = "ATS analysis not performed"
-                ats_text = "ATS analysis not available"
-
-            prompt = self.REWRITE_PROMPT.format(
-                resume_text=resume_text,
-                job_description=job_description,
-                match_score=match_score,
-                score_breakdown=score_breakdown_text,
-                ats_score=ats_score,
-                formatting_score=formatting_score,
-                section_score=section_score,
-                contact_score=contact_score,
-                keyword_match_percentage=keyword_match_percentage,
-                ats_issues=ats_issues,
-                ats_analysis=ats_text,
-                recommendations=rec_text,
-                missing_skills=skills_text,
-                skills_points=skills_points,
-                skills_headroom=skills_headroom,
-                keyword_points=keyword_points,
-                keyword_headroom=keyword_headroom,
-                experience_points=experience_points,
-                experience_headroom=experience_headroom,
-                achievement_points=achievement_points,
-                achievement_headroom=achievement_headroom,
-                education_points=education_points,
-                education_headroom=education_headroom
-            )
-
-            response = await self.llm_client.generate(
-                prompt=prompt,
-                temperature=0.3,
-                max_tokens=4096
-            )
-
-            logger.info("Resume rewrite v2 completed")
-
-            # Parse JSON response
-            result = self._parse_response(response.content)
-
-            # Post-process: Apply ATS safety transformations (safety net)
-            if "improved_resume" in result:
-                original_resume = result["improved_resume"]
-                processed_resume = original_resume
-                changes_made = []
-
-                # 1. Remove tables
-                cleaned_resume = remove_tables_from_resume(processed_resume)
-                if cleaned_resume != processed_resume:
-                    logger.info("Removed tables from improved resume (post-processing)")
-                    changes_made.append("Removed table formatting for ATS compatibility")
-                    processed_resume = cleaned_resume
-
-                # 2. Normalize bullets
-                normalized_resume = normalize_bullets(processed_resume)
-                if normalized_resume != processed_resume:
-                    logger.info("Normalized bullet characters (post-processing)")
-                    changes_made.append("Standardized all bullets to • for ATS compatibility")
-                    processed_resume = normalized_resume
-
-                # 3. Fix line lengths
-                wrapped_resume = fix_line_lengths(processed_resume, max_length=100)
-                if wrapped_resume != processed_resume:
-                    logger.info("Wrapped long lines (post-processing)")
-                    changes_made.append("Wrapped lines exceeding 100 characters")
-                    processed_resume = wrapped_resume
-
-                # Update result if any changes were made
-                if changes_made:
-                    result["improved_resume"] = processed_resume
-
-                    # Add notes about post-processing
-                    if "summary_of_changes" not in result:
-                        result["summary_of_changes"] = []
-
-                    for change in changes_made:
-                        result["summary_of_changes"].append(f"Post-processing: {change}")
-
-            # Add metadata
-            result["_metadata"] = {
-                "model": response.model,
-                "provider": response.provider,
-                "tokens_used": response.tokens_used,
-                "cost_estimate": response.cost_estimate,
-                "version": "v2",
-                "post_processed": True
-            }
+        else:
+            ats_score = 0
+            formatting_score = 0
+            section_score = 0
+            contact_score = 0
+            keyword_match_percentage = 0
+            ats_issues = "ATS analysis not performed"
+            ats_text = "ATS analysis not available"
+
+        prompt = self.REWRITE_PROMPT.format(
+            resume_text=resume_text,
+            job_description=job_description,
+            match_score=match_score,
+            score_breakdown=score_breakdown_text,
+            ats_score=ats_score,
+            formatting_score=formatting_score,
+            section_score=section_score,
+            contact_score=contact_score,
+            keyword_match_percentage=keyword_match_percentage,
+            ats_issues=ats_issues,
+            ats_analysis=ats_text,
+            recommendations=rec_text,
+            missing_skills=skills_text,
+            skills_points=skills_points,
+            skills_headroom=skills_headroom,
+            keyword_points=keyword_points,
+            keyword_headroom=keyword_headroom,
+            experience_points=experience_points,
+            experience_headroom=experience_headroom,
+            achievement_points=achievement_points,
+            achievement_headroom=achievement_headroom,
+            education_points=education_points,
+            education_headroom=education_headroom
+        )
+
+        return prompt
+
+    def build_result(self, content: str, metadata: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Parse a rewrite response and apply the ATS post-processing.
 
-            return result
+        Args:
+            content: Raw LLM response text
+            metadata: model, provider, tokens_used and cost_estimate of the call
 
-        except Exception as e:
-            logger.error("Resume rewriting v2 failed", error=str(e))
-            raise
+        Returns:
+            Dictionary with improved resume and detailed analysis
+        """
+        # Parse JSON response
+        result = self._parse_response(content)
+
+        # Post-process: Apply ATS safety transformations (safety net)
+        if "improved_resume" in result:
+            original_resume = result["improved_resume"]
+            processed_resume = original_resume
+            changes_made = []
+
+            # 1. Remove tables
+            cleaned_resume = remove_tables_from_resume(processed_resume)
+            if cleaned_resume != processed_resume:
+                logger.info("Removed tables from improved resume (post-processing)")
+                changes_made.append("Removed table formatting for ATS compatibility")
+                processed_resume = cleaned_resume
+
+            # 2. Normalize bullets
+            normalized_resume = normalize_bullets(processed_resume)
+            if normalized_resume != processed_resume:
+                logger.info("Normalized bullet characters (post-processing)")
+                changes_made.append("Standardized all bullets to • for ATS compatibility")
+                processed_resume = normalized_resume
+
+            # 3. Fix line lengths
+            wrapped_resume = fix_line_lengths(processed_resume, max_length=100)
+            if wrapped_resume != processed_resume:
+                logger.info("Wrapped long lines (post-processing)")
+                changes_made.append("Wrapped lines exceeding 100 characters")
+                processed_resume = wrapped_resume
+
+            # Update result if any changes were made
+            if changes_made:
+                result["improved_resume"] = processed_resume
+
+                # Add notes about post-processing
+                if "summary_of_changes" not in result:
+                    result["summary_of_changes"] = []
+
+                for change in changes_made:
+                    result["summary_of_changes"].append(f"Post-processing: {change}")
+
+        # Add metadata
+        result["_metadata"] = {
+            **metadata,
+            "version": "v2",
+            "post_processed": True
+        }
+
+        return result
 
     def _parse_response(self, content: str) -> Dict[str, Any]:
         """
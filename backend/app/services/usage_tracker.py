@@ -0,0 +1,56 @@
+"""
+Usage tracking for LLM-backed endpoints.
+Writes telemetry rows (API usage, analytics events) outside the
+request/response critical path.
+"""
+from typing import Any, Dict, List
+
+from sqlalchemy import insert
+
+from app.core.logging_config import get_logger
+from app.models.database import SessionLocal
+from app.models.models import Analytics, APIUsage
+
+logger = get_logger(__name__)
+
+
+def _insert_rows(model, rows: List[Dict[str, Any]], what: str) -> None:
+    """Bulk insert telemetry rows in a short-lived session, logging failures."""
+    if not rows:
+        return
+
+    db = SessionLocal()
+    try:
+        db.execute(insert(model), rows)
+        db.commit()
+    except Exception as e:
+        # Telemetry must never surface as a user-facing failure
+        db.rollback()
+        logger.error(f"Failed to record {what}", error=str(e), rows=len(rows))
+    finally:
+        db.close()
+
+
+def record_usage(usage_rows: List[Dict[str, Any]]) -> None:
+    """
+    Persist APIUsage rows using a short-lived session.
+
+    Meant to be scheduled with FastAPI's BackgroundTasks so the HTTP response
+    is returned as soon as the user-facing data is committed.
+
+    Args:
+        usage_rows: APIUsage column values, one dict per row
+    """
+    _insert_rows(APIUsage, usage_rows, "API usage")
+
+
+def record_events(event_rows: List[Dict[str, Any]]) -> None:
+    """
+    Persist Analytics event rows using a short-lived session.
+
+    Scheduled like record_usage, after the response is sent.
+
+    Args:
+        event_rows: Analytics column values, one dict per row
+    """
+    _insert_rows(Analytics, event_rows, "analytics events")
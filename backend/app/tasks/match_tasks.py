@@ -1,13 +1,30 @@
 """
 Celery tasks for batch matching operations.
 """
-from typing import List
+import asyncio
+from datetime import datetime, timedelta
+from typing import List, Optional
 
+from sqlalchemy import and_, func, insert, or_
+from sqlalchemy.orm import Session
+
+from app.core.auth import get_user_llm_api_key
+from app.core.config import settings
+from app.core.llm_providers import LLMFactory
 from app.core.logging_config import get_logger
 from app.models.database import SessionLocal
-from app.models.models import Resume, Job, Match, BatchJob
-from app.services.job_matcher import JobMatcher
-from app.core.llm_providers import LLMFactory
+from app.models.models import (
+    APIUsage,
+    BatchJob,
+    Job,
+    Match,
+    MatchTask,
+    Resume,
+    User,
+    content_hash,
+    job_content_hash,
+)
+from app.services.job_matcher import JobMatcher, match_result_rows
 from app.tasks.celery_app import celery_app
 
 logger = get_logger(__name__)
@@ -63,13 +80,13 @@ def process_batch_matching(
             raise ValueError("No resumes found")
 
         # Initialize LLM client and matcher
-        llm_client = LLMFactory.create_client(
+        llm_client = LLMFactory.get_client(
             provider=llm_provider,
             api_key=llm_api_key
         )
         matcher = JobMatcher(llm_client)
 
-        job_text = f"{job.description}\n\n{job.requirements or ''}"
+        job_text = job.full_text
 
         results = []
         processed = 0
@@ -169,3 +186,218 @@ def process_batch_matching(
 
     finally:
         db.close()
+
+
+def _stale_before() -> datetime:
+    """
+    Claim time before which a processing task is considered abandoned.
+
+    Celery hard-kills a worker after batch_timeout_seconds, so a task
+    claimed longer ago than that can no longer be finishing.
+    """
+    return datetime.utcnow() - timedelta(seconds=settings.batch_timeout_seconds)
+
+
+def _claim_next_task(db: Session, batch_job_id: int) -> Optional[MatchTask]:
+    """
+    Claim the oldest pending task of a batch.
+
+    FOR UPDATE SKIP LOCKED lets any number of workers pull from the same
+    batch concurrently without handing out a task twice. The row lock is
+    released as soon as the task is marked as processing. Tasks left in
+    processing by a crashed worker are claimed again once they go stale.
+    """
+    task = db.query(MatchTask).filter(
+        MatchTask.batch_job_id == batch_job_id,
+        or_(
+            MatchTask.status == "pending",
+            and_(
+                MatchTask.status == "processing",
+                or_(MatchTask.started_at.is_(None), MatchTask.started_at < _stale_before())
+            )
+        )
+    ).order_by(MatchTask.id).with_for_update(skip_locked=True).first()
+
+    if task:
+        if task.status == "processing":
+            logger.warning(
+                "Reclaiming stale match task", batch_job_id=batch_job_id, task_id=task.id
+            )
+        task.status = "processing"
+        task.started_at = datetime.utcnow()
+        db.commit()
+
+    return task
+
+
+def _finalize_batch(db: Session, batch_job_id: int) -> bool:
+    """
+    Mark the batch completed once no task is pending or processing.
+
+    Returns:
+        True if the batch has no unfinished tasks left
+    """
+    remaining = db.query(func.count(MatchTask.id)).filter(
+        MatchTask.batch_job_id == batch_job_id,
+        MatchTask.status.in_(["pending", "processing"])
+    ).scalar()
+
+    if remaining == 0:
+        db.query(BatchJob).filter(
+            BatchJob.id == batch_job_id,
+            BatchJob.status != "completed"
+        ).update(
+            {"status": "completed", "completed_at": datetime.utcnow()},
+            synchronize_session=False
+        )
+        db.commit()
+
+    return remaining == 0
+
+
+@celery_app.task(name="process_match_tasks")
+def process_match_tasks(
+    batch_job_id: int,
+    llm_provider: str,
+    llm_model: str,
+    detailed: bool = False
+):
+    """
+    Drain pending match tasks of a queued batch.
+
+    Several copies of this task run per batch; each one claims tasks with
+    SKIP LOCKED, runs one LLM match and records the result until the batch
+    has no pending work left. A worker that exits while another still holds
+    a task schedules a sweep, so a task abandoned by a crashed worker is
+    retried and the batch still completes.
+
+    Args:
+        batch_job_id: BatchJob ID the tasks belong to
+        llm_provider: LLM provider to use
+        llm_model: LLM model to use
+        detailed: Whether to provide detailed analysis
+    """
+    db = SessionLocal()
+    processed = 0
+    failed = 0
+
+    try:
+        batch_job = db.query(BatchJob).filter(BatchJob.id == batch_job_id).first()
+        if not batch_job:
+            logger.error("Batch job not found", batch_job_id=batch_job_id)
+            return
+
+        user = db.query(User).filter(User.id == batch_job.user_id).first()
+        first_task = db.query(MatchTask).filter(MatchTask.batch_job_id == batch_job_id).first()
+        job = db.query(Job).filter(Job.id == first_task.job_id).first() if first_task else None
+        if not user or not job:
+            logger.error("Batch owner or job missing", batch_job_id=batch_job_id)
+            return
+
+        # API keys are resolved here rather than passed through the broker
+        llm_client = LLMFactory.get_client(
+            provider=llm_provider,
+            api_key=get_user_llm_api_key(user, llm_provider),
+            model=llm_model
+        )
+        matcher = JobMatcher(llm_client)
+        job_text = job.full_text
+        job_hash = job.content_hash or job_content_hash(job.description, job.requirements)
+
+        db.query(BatchJob).filter(
+            BatchJob.id == batch_job_id,
+            BatchJob.status == "pending"
+        ).update(
+            {"status": "processing", "started_at": datetime.utcnow()},
+            synchronize_session=False
+        )
+        db.commit()
+
+        while True:
+            task = _claim_next_task(db, batch_job_id)
+            if task is None:
+                break
+
+            task_id = task.id
+            resume_id = task.resume_id
+
+            try:
+                resume = db.query(Resume.raw_text, Resume.content_hash).filter(
+                    Resume.id == resume_id
+                ).first()
+                if resume is None:
+                    raise ValueError(f"Resume {resume_id} not found")
+
+                match_result = asyncio.run(matcher.match(
+                    resume_text=resume.raw_text,
+                    job_description=job_text,
+                    detailed=detailed
+                ))
+                if "error" in match_result:
+                    raise ValueError(match_result["error"])
+
+                match_row, usage_row = match_result_rows(
+                    match_result, user.id, resume_id, job.id,
+                    resume.content_hash or content_hash(resume.raw_text), job_hash,
+                    detailed, "/api/v1/matches/batch/async"
+                )
+                match_id = db.execute(
+                    insert(Match).values(**match_row).returning(Match.id)
+                ).scalar_one()
+                if settings.enable_cost_tracking:
+                    db.execute(insert(APIUsage).values(**usage_row))
+
+                task.status = "completed"
+                task.match_id = match_id
+
+                # Quota was reserved when the batch was queued; the progress
+                # counter is bumped in SQL since other workers update it too
+                db.query(BatchJob).filter(BatchJob.id == batch_job_id).update(
+                    {BatchJob.processed_items: BatchJob.processed_items + 1},
+                    synchronize_session=False
+                )
+                db.commit()
+                processed += 1
+
+            except Exception as e:
+                db.rollback()
+                logger.error(f"Failed to match resume {resume_id}", error=str(e))
+
+                db.query(MatchTask).filter(MatchTask.id == task_id).update(
+                    {"status": "failed", "error_message": str(e)},
+                    synchronize_session=False
+                )
+                # Give back the quota reserved for this match when it was queued
+                db.query(User).filter(User.id == user.id).update(
+                    {User.matches_used: User.matches_used - 1},
+                    synchronize_session=False
+                )
+                db.query(BatchJob).filter(BatchJob.id == batch_job_id).update(
+                    {BatchJob.failed_items: BatchJob.failed_items + 1},
+                    synchronize_session=False
+                )
+                db.commit()
+                failed += 1
+
+        if not _finalize_batch(db, batch_job_id):
+            process_match_tasks.apply_async(
+                (batch_job_id, llm_provider, llm_model, detailed),
+                countdown=settings.batch_timeout_seconds
+            )
+
+        logger.info(
+            "Match task worker finished",
+            batch_job_id=batch_job_id,
+            processed=processed,
+            failed=failed
+        )
+
+        return {"batch_job_id": batch_job_id, "processed": processed, "failed": failed}
+
+    except Exception as e:
+        db.rollback()
+        logger.error("Match task worker failed", batch_job_id=batch_job_id, error=str(e))
+        raise
+
+    finally:
+        db.close()
@@ -54,7 +54,7 @@ def process_resume_batch(
         # Initialize services
         llm_client = None
         if analyze:
-            llm_client = LLMFactory.create_client(
+            llm_client = LLMFactory.get_client(
                 provider=llm_provider,
                 api_key=llm_api_key
             )
@@ -6,10 +6,10 @@ from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
+from app.core.auth import generate_api_key, get_password_hash
 from app.main import app
-from app.models.database import Base, get_db
+from app.models.database import Base, get_db, get_read_db
 from app.models.models import User
-from app.core.auth import get_password_hash, generate_api_key
 
 # Test database URL (use in-memory SQLite for tests)
 TEST_DATABASE_URL = "sqlite:///./test.db"
@@ -45,6 +45,7 @@ def client(db_session):
             pass
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
     with TestClient(app) as test_client:
         yield test_client
     app.dependency_overrides.clear()
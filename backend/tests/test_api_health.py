@@ -32,3 +32,16 @@ def test_docs_endpoint(client):
     response = client.get("/docs")
 
     assert response.status_code == status.HTTP_200_OK
+
+
+def test_large_json_responses_are_gzipped(client):
+    """Test that large JSON responses are compressed and small ones are not."""
+    response = client.get("/openapi.json", headers={"Accept-Encoding": "gzip"})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-encoding"] == "gzip"
+    assert "paths" in response.json()
+
+    response = client.get("/", headers={"Accept-Encoding": "gzip"})
+
+    assert "content-encoding" not in response.headers
@@ -3,7 +3,13 @@ Tests for LLM provider system.
 """
 import pytest
 
-from app.core.llm_providers import LLMFactory, LLMProvider, ClaudeClient, OpenAIClient
+from app.core.llm_providers import (
+    ClaudeClient,
+    GeminiClient,
+    LLMFactory,
+    LLMProvider,
+    OpenAIClient,
+)
 
 
 def test_llm_factory_create_claude():
@@ -28,6 +34,27 @@ def test_llm_factory_create_openai():
     assert client.api_key == "test-key"
 
 
+def test_llm_factory_get_client_is_cached():
+    """Test that clients are reused per provider, model and API key."""
+    first = LLMFactory.get_client(provider="claude", api_key="test-key")
+    second = LLMFactory.get_client(provider=LLMProvider.CLAUDE, api_key="test-key")
+    other_key = LLMFactory.get_client(provider="claude", api_key="other-key")
+
+    assert first is second
+    assert other_key is not first
+    assert other_key.api_key == "other-key"
+
+
+
+def test_gemini_clients_keep_their_own_key():
+    """Test that Gemini clients for different keys do not share one global key."""
+    first = LLMFactory.get_client(provider="gemini", api_key="first-key")
+    second = LLMFactory.get_client(provider="gemini", api_key="second-key")
+
+    assert isinstance(first, GeminiClient)
+    assert first.client._client._transport._credentials.token == "first-key"
+    assert second.client._client._transport._credentials.token == "second-key"
+
 def test_llm_factory_invalid_provider():
     """Test that invalid provider raises error."""
     with pytest.raises(ValueError) as exc:
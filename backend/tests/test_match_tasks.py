@@ -0,0 +1,137 @@
+"""
+Tests for the queued batch match workers.
+"""
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.core.config import settings
+from app.models.models import APIUsage, BatchJob, Job, Match, MatchTask, Resume
+from app.tasks import match_tasks
+from tests.conftest import TestingSessionLocal
+
+
+class _FakeMatcher:
+    """JobMatcher stand-in that fails for resumes mentioning "broken"."""
+
+    def __init__(self, llm_client):
+        pass
+
+    async def match(self, resume_text, job_description, detailed=False):
+        if "broken" in resume_text:
+            return {"error": "LLM request failed"}
+        return {
+            "match_score": 72,
+            "ats_score": 80.0,
+            "_metadata": {
+                "provider": "openai", "model": "gpt-4o", "tokens_used": 10, "cost_estimate": 0.01
+            }
+        }
+
+
+@pytest.fixture
+def batch(db_session, test_user):
+    """A queued batch of two resumes matched against one job."""
+    job = Job(user_id=test_user.id, title="Engineer", description="Python")
+    resumes = [
+        Resume(user_id=test_user.id, filename="a.txt", file_type="txt", raw_text="Python"),
+        Resume(user_id=test_user.id, filename="b.txt", file_type="txt", raw_text="broken"),
+    ]
+    batch_job = BatchJob(user_id=test_user.id, job_type="match", status="pending", total_items=2)
+    db_session.add_all([job, batch_job, *resumes])
+    db_session.flush()
+
+    tasks = [
+        MatchTask(
+            batch_job_id=batch_job.id, user_id=test_user.id, job_id=job.id,
+            resume_id=resume.id, status="pending"
+        )
+        for resume in resumes
+    ]
+    db_session.add_all(tasks)
+    db_session.commit()
+    return batch_job, tasks
+
+
+def test_claim_next_task(db_session, batch):
+    """Test that tasks are claimed oldest first, once each."""
+    batch_job, tasks = batch
+
+    first = match_tasks._claim_next_task(db_session, batch_job.id)
+    second = match_tasks._claim_next_task(db_session, batch_job.id)
+
+    assert [first.id, second.id] == [tasks[0].id, tasks[1].id]
+    assert first.status == "processing"
+    assert first.started_at is not None
+    assert match_tasks._claim_next_task(db_session, batch_job.id) is None
+
+
+def test_claim_next_task_reclaims_stale(db_session, batch):
+    """Test that a task abandoned in processing is claimed again once stale."""
+    batch_job, tasks = batch
+    stale = datetime.utcnow() - timedelta(seconds=settings.batch_timeout_seconds + 60)
+    tasks[0].status = "processing"
+    tasks[0].started_at = stale
+    tasks[1].status = "processing"
+    tasks[1].started_at = datetime.utcnow()
+    db_session.commit()
+
+    task = match_tasks._claim_next_task(db_session, batch_job.id)
+
+    assert task.id == tasks[0].id
+    assert task.started_at > stale
+    assert match_tasks._claim_next_task(db_session, batch_job.id) is None
+
+
+def test_finalize_batch(db_session, batch):
+    """Test that a batch is only completed once no task is left unfinished."""
+    batch_job, tasks = batch
+    tasks[0].status = "completed"
+    db_session.commit()
+
+    assert not match_tasks._finalize_batch(db_session, batch_job.id)
+    db_session.refresh(batch_job)
+    assert batch_job.status == "pending"
+
+    tasks[1].status = "failed"
+    db_session.commit()
+
+    assert match_tasks._finalize_batch(db_session, batch_job.id)
+    db_session.refresh(batch_job)
+    assert batch_job.status == "completed"
+    assert batch_job.completed_at is not None
+
+
+def test_process_match_tasks(db_session, test_user, batch, monkeypatch):
+    """Test that the worker stores full match rows and refunds failed matches."""
+    batch_job, tasks = batch
+    monkeypatch.setattr(match_tasks, "SessionLocal", TestingSessionLocal)
+    monkeypatch.setattr(match_tasks, "JobMatcher", _FakeMatcher)
+    monkeypatch.setattr(match_tasks, "get_user_llm_api_key", lambda user, provider: "key")
+    monkeypatch.setattr(match_tasks.LLMFactory, "get_client", lambda **kwargs: None)
+
+    # Both matches were reserved when the batch was queued
+    test_user.matches_used = 2
+    db_session.commit()
+
+    result = match_tasks.process_match_tasks(batch_job.id, "openai", "gpt-4o", True)
+    assert result == {"batch_job_id": batch_job.id, "processed": 1, "failed": 1}
+
+    db_session.expire_all()
+    match = db_session.query(Match).one()
+    resume = db_session.get(Resume, tasks[0].resume_id)
+    job = db_session.get(Job, tasks[0].job_id)
+    assert match.resume_id == resume.id
+    assert match.ats_score == 80.0
+    assert match.resume_hash == resume.content_hash
+    assert match.job_hash == job.content_hash
+    assert match.detailed
+
+    assert db_session.get(MatchTask, tasks[0].id).match_id == match.id
+    assert db_session.get(MatchTask, tasks[1].id).status == "failed"
+    assert db_session.query(APIUsage).count() == 1
+    assert test_user.matches_used == 1
+
+    db_session.refresh(batch_job)
+    assert batch_job.status == "completed"
+    assert (batch_job.processed_items, batch_job.failed_items) == (1, 1)
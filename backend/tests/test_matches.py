@@ -0,0 +1,201 @@
+"""
+Tests for match endpoints.
+"""
+from datetime import datetime
+
+from fastapi import status
+
+from app.models.models import Job, Match, Resume
+
+
+def test_list_matches_cursor_pagination(client, db_session, test_user, auth_headers):
+    """Test that following X-Next-Cursor visits every match exactly once."""
+    resume = Resume(user_id=test_user.id, filename="resume.txt", file_type="txt", raw_text="Python")
+    job = Job(user_id=test_user.id, title="Engineer", description="Python")
+    db_session.add_all([resume, job])
+    db_session.commit()
+
+    # Shared timestamp so ordering has to fall back to the id tiebreaker
+    created_at = datetime(2024, 1, 1)
+    db_session.add_all([
+        Match(
+            user_id=test_user.id,
+            resume_id=resume.id,
+            job_id=job.id,
+            match_score=50 + i,
+            created_at=created_at
+        )
+        for i in range(5)
+    ])
+    db_session.commit()
+
+    seen = []
+    params = {"limit": 2}
+    while True:
+        response = client.get("/api/v1/matches/", params=params, headers=auth_headers)
+        assert response.status_code == status.HTTP_200_OK
+        seen.extend(match["id"] for match in response.json())
+
+        next_cursor = response.headers.get("X-Next-Cursor")
+        if not next_cursor:
+            break
+        params = {"limit": 2, "cursor": next_cursor}
+
+    assert len(seen) == 5
+    assert seen == sorted(seen, reverse=True)
+
+
+def test_list_matches_invalid_cursor(client, auth_headers):
+    """Test that a malformed cursor is rejected."""
+    response = client.get(
+        "/api/v1/matches/", params={"cursor": "not-a-cursor"}, headers=auth_headers
+    )
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def _create_match(db_session, test_user, **values):
+    resume = Resume(user_id=test_user.id, filename="resume.txt", file_type="txt", raw_text="Python")
+    job = Job(user_id=test_user.id, title="Engineer", company="Acme", description="Python")
+    db_session.add_all([resume, job])
+    db_session.commit()
+
+    match = Match(
+        user_id=test_user.id, resume_id=resume.id, job_id=job.id, match_score=80, **values
+    )
+    db_session.add(match)
+    db_session.commit()
+    return match
+
+
+def test_get_match_not_modified(client, db_session, test_user, auth_headers):
+    """Test that a match re-fetched with its ETag returns an empty 304."""
+    match = _create_match(db_session, test_user)
+
+    response = client.get(f"/api/v1/matches/{match.id}", headers=auth_headers)
+    assert response.status_code == status.HTTP_200_OK
+    etag = response.headers["ETag"]
+
+    response = client.get(
+        f"/api/v1/matches/{match.id}",
+        headers={**auth_headers, "If-None-Match": etag}
+    )
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response.headers["ETag"] == etag
+    assert response.content == b""
+
+    # A changed match gets a new ETag, so the stale one no longer matches
+    match.match_score = 90
+    match.updated_at = datetime(2030, 1, 1)
+    db_session.commit()
+
+    response = client.get(
+        f"/api/v1/matches/{match.id}",
+        headers={**auth_headers, "If-None-Match": etag}
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["match_score"] == 90
+    assert response.headers["ETag"] != etag
+
+
+def test_download_cover_letter_not_modified(client, db_session, test_user, auth_headers):
+    """Test that a cover letter download re-fetched with its ETag returns 304."""
+    match = _create_match(db_session, test_user, cover_letter_data={
+        "cover_letter": "Dear hiring manager,\n\nI would like to apply.",
+        "candidate_name": "Jane Doe",
+        "company": "Acme",
+        "job_title": "Engineer",
+        "tone": "professional"
+    })
+    url = f"/api/v1/matches/{match.id}/cover-letter/download"
+
+    response = client.get(url, params={"format": "docx"}, headers=auth_headers)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.content
+    etag = response.headers["ETag"]
+
+    response = client.get(
+        url,
+        params={"format": "docx"},
+        headers={**auth_headers, "If-None-Match": etag}
+    )
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response.content == b""
+
+    # The ETag covers the format, so the PDF is not served from it
+    response = client.get(
+        url,
+        params={"format": "pdf"},
+        headers={**auth_headers, "If-None-Match": etag}
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["ETag"] != etag
+
+
+class _FakeMatcher:
+    """JobMatcher stand-in returning a fixed score."""
+
+    score = 0
+
+    def __init__(self, llm_client):
+        pass
+
+    async def match(self, resume_text, job_description, detailed=False):
+        return {
+            "match_score": _FakeMatcher.score,
+            "_metadata": {
+                "provider": "openai", "model": "gpt-4o", "tokens_used": 1, "cost_estimate": 0.0
+            },
+        }
+
+
+class _FakeAnalyzer:
+    """ResumeAnalyzer stand-in."""
+
+    def __init__(self, llm_client):
+        pass
+
+    async def analyze(self, text):
+        return {"skills": ["Python"]}
+
+
+def test_rescan_does_not_feed_match_reuse(client, db_session, test_user, auth_headers, monkeypatch):
+    """Test that a rescanned match is not reused for the original resume."""
+    from app.api import matches, resumes
+    from tests.conftest import TestingSessionLocal
+
+    monkeypatch.setattr(matches, "SessionLocal", TestingSessionLocal)
+    monkeypatch.setattr(matches, "get_user_llm_client", lambda *args: (None, "openai", "gpt-4o"))
+    monkeypatch.setattr(matches, "JobMatcher", _FakeMatcher)
+    monkeypatch.setattr(resumes, "JobMatcher", _FakeMatcher)
+    monkeypatch.setattr(resumes, "ResumeAnalyzer", _FakeAnalyzer)
+    monkeypatch.setattr(resumes, "get_user_llm_api_key", lambda user, provider: "key")
+    monkeypatch.setattr(resumes.LLMFactory, "get_client", lambda **kwargs: None)
+
+    resume = Resume(user_id=test_user.id, filename="resume.txt", file_type="txt", raw_text="Python")
+    job = Job(user_id=test_user.id, title="Engineer", description="Python")
+    db_session.add_all([resume, job])
+    db_session.commit()
+    body = {"resume_id": resume.id, "job_id": job.id}
+
+    _FakeMatcher.score = 60
+    response = client.post("/api/v1/matches/", json=body, headers=auth_headers)
+    assert response.status_code == status.HTTP_201_CREATED
+    match_id = response.json()["id"]
+
+    match = db_session.get(Match, match_id)
+    match.improved_resume_data = {"improved_resume": "Python, Go and Kubernetes"}
+    db_session.commit()
+
+    _FakeMatcher.score = 95
+    response = client.post(f"/api/v1/resumes/improved/{match_id}/rescan", headers=auth_headers)
+    assert response.status_code == status.HTTP_200_OK
+    db_session.expire_all()
+    assert db_session.get(Match, match_id).match_score == 95
+
+    # The original resume is scored again rather than served the rescan
+    _FakeMatcher.score = 61
+    response = client.post("/api/v1/matches/", json=body, headers=auth_headers)
+    assert response.status_code == status.HTTP_201_CREATED
+    assert response.json()["match_score"] == 61
+    assert response.headers.get("X-Match-Cache") != "hit"
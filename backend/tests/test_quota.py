@@ -0,0 +1,40 @@
+"""
+Tests for plan usage quotas.
+"""
+from app.core.quota import release_quota, reserve_quota
+from app.models.models import User
+
+
+def test_reserve_quota_stops_at_limit(db_session, test_user):
+    """Test that reservations succeed up to the limit and then fail."""
+    assert reserve_quota(db_session, test_user, User.matches_used, limit=2) == 1
+    assert reserve_quota(db_session, test_user, User.matches_used, limit=2) == 2
+    assert reserve_quota(db_session, test_user, User.matches_used, limit=2) is None
+
+    db_session.refresh(test_user)
+    assert test_user.matches_used == 2
+
+
+def test_reserve_quota_batch_is_all_or_nothing(db_session, test_user):
+    """Test that a multi-unit reservation fails without charging anything."""
+    assert reserve_quota(db_session, test_user, User.matches_used, limit=3, amount=4) is None
+
+    db_session.refresh(test_user)
+    assert test_user.matches_used == 0
+
+
+def test_reserve_quota_admin_bypasses_limit(db_session, test_user):
+    """Test that admins are counted but never limited."""
+    test_user.is_admin = True
+    db_session.commit()
+
+    assert reserve_quota(db_session, test_user, User.matches_used, limit=0) == 1
+
+
+def test_release_quota(db_session, test_user):
+    """Test that released units are given back."""
+    reserve_quota(db_session, test_user, User.cover_letters_used, limit=3, amount=3)
+    release_quota(db_session, test_user.id, User.cover_letters_used, amount=2)
+
+    db_session.refresh(test_user)
+    assert test_user.cover_letters_used == 1
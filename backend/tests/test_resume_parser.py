@@ -3,7 +3,7 @@ Tests for resume parsing service.
 """
 import pytest
 
-from app.services.resume_parser import ResumeParser, ResumeParseError
+from app.services.resume_parser import ResumeParseError, ResumeParser
 
 
 def test_parse_txt():
@@ -0,0 +1,160 @@
+"""
+Tests for resume upload endpoints.
+"""
+import pytest
+from fastapi import HTTPException, Response, status
+
+from app.api import resumes
+from app.models.models import RESUME_UPLOADING, Job, Match, Resume, content_hash
+from tests.conftest import TestingSessionLocal
+
+
+class _MemoryStorage:
+    """Stand-in for StorageClient that keeps uploaded files in memory."""
+
+    def __init__(self):
+        self.files = {}
+
+    def upload_file(self, file_content, filename, content_type, user_id=None, content_hash=None):
+        path = f"user_{user_id}/{content_hash}_{filename}"
+        self.files[path] = file_content
+        return path
+
+    def delete_file(self, file_path):
+        return self.files.pop(file_path, None) is not None
+
+
+@pytest.fixture
+def storage(monkeypatch):
+    """Route uploads to in-memory storage."""
+    memory_storage = _MemoryStorage()
+    monkeypatch.setattr(resumes, "get_storage_client", lambda: memory_storage)
+    return memory_storage
+
+
+def test_upload_resume_duplicate_rejected(client, db_session, auth_headers, storage):
+    """Test that re-uploading the same file is rejected with 409."""
+    files = {"file": ("resume.txt", b"John Doe\nSoftware Engineer\nPython", "text/plain")}
+
+    response = client.post(
+        "/api/v1/resumes/upload", params={"analyze": False}, files=files, headers=auth_headers
+    )
+    assert response.status_code == status.HTTP_201_CREATED
+    data = response.json()
+    assert data["filename"] == "resume.txt"
+    assert "Python" in data["raw_text"]
+    assert data["analysis_status"] is None
+
+    response = client.post(
+        "/api/v1/resumes/upload", params={"analyze": False}, files=files, headers=auth_headers
+    )
+    assert response.status_code == status.HTTP_409_CONFLICT
+
+    assert db_session.query(Resume).count() == 1
+    assert len(storage.files) == 1
+
+
+def test_upload_resume_parse_failure_frees_hash(client, db_session, auth_headers, storage):
+    """Test that a file that fails to parse leaves no record behind."""
+    files = {"file": ("resume.pdf", b"not really a pdf", "application/pdf")}
+
+    for _ in range(2):
+        response = client.post(
+            "/api/v1/resumes/upload", params={"analyze": False}, files=files, headers=auth_headers
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    assert db_session.query(Resume).count() == 0
+    assert not storage.files
+
+
+def test_upload_resumes_batch(client, db_session, auth_headers, storage, monkeypatch):
+    """Test that each file of a batch is reported on its own."""
+    # Batch uploads open their own sessions
+    monkeypatch.setattr(resumes, "SessionLocal", TestingSessionLocal)
+
+    files = [
+        ("files", ("first.txt", b"John Doe\nBackend Engineer", "text/plain")),
+        ("files", ("second.txt", b"Jane Roe\nData Scientist", "text/plain")),
+        ("files", ("copy.txt", b"John Doe\nBackend Engineer", "text/plain")),
+        ("files", ("resume.exe", b"MZ", "application/octet-stream")),
+    ]
+
+    response = client.post(
+        "/api/v1/resumes/upload/batch", params={"analyze": False}, files=files, headers=auth_headers
+    )
+    assert response.status_code == status.HTTP_200_OK
+
+    results = {item["filename"]: item for item in response.json()}
+    assert results["second.txt"]["success"]
+    assert "Data Scientist" in results["second.txt"]["resume"]["raw_text"]
+    assert not results["resume.exe"]["success"]
+    assert "Invalid file type" in results["resume.exe"]["error"]
+
+    # Files are processed concurrently, so either copy may claim the content
+    first, copy = results["first.txt"], results["copy.txt"]
+    assert first["success"] != copy["success"]
+    duplicate = copy if first["success"] else first
+    assert duplicate["error"] == "This resume has already been uploaded"
+
+    assert db_session.query(Resume).count() == 2
+    assert len(storage.files) == 2
+
+
+def test_upload_in_progress_hidden(client, test_user, auth_headers, storage, monkeypatch):
+    """Test that a resume is not listed or served until its upload completes."""
+    seen = {}
+
+    async def parse_async(file_content, filename):
+        # Look the resume up from another session while it is being parsed
+        db = TestingSessionLocal()
+        try:
+            placeholder = db.query(Resume).one()
+            seen["status"] = placeholder.analysis_status
+            seen["listed"] = resumes.list_resumes(Response(), current_user=test_user, db=db)
+            try:
+                resumes.get_resume(placeholder.id, current_user=test_user, db=db)
+            except HTTPException as e:
+                seen["get_status"] = e.status_code
+        finally:
+            db.close()
+        return file_content.decode()
+
+    monkeypatch.setattr(resumes.ResumeParser, "parse_async", parse_async)
+
+    files = {"file": ("resume.txt", b"John Doe\nSoftware Engineer", "text/plain")}
+    response = client.post(
+        "/api/v1/resumes/upload", params={"analyze": False}, files=files, headers=auth_headers
+    )
+    assert response.status_code == status.HTTP_201_CREATED
+
+    assert seen["status"] == RESUME_UPLOADING
+    assert seen["listed"] == []
+    assert seen["get_status"] == status.HTTP_404_NOT_FOUND
+
+    response = client.get("/api/v1/resumes/", headers=auth_headers)
+    assert [item["filename"] for item in response.json()] == ["resume.txt"]
+
+
+def test_save_improved_resume(client, db_session, test_user, auth_headers):
+    """Test that a saved improved resume is stored once, with its content hash."""
+    resume = Resume(user_id=test_user.id, filename="resume.txt", file_type="txt", raw_text="Python")
+    job = Job(user_id=test_user.id, title="Engineer", description="Python")
+    db_session.add_all([resume, job])
+    db_session.flush()
+    improved_text = "Python, Go and Kubernetes"
+    match = Match(
+        user_id=test_user.id, resume_id=resume.id, job_id=job.id, match_score=60,
+        improved_resume_data={"improved_resume": improved_text}
+    )
+    db_session.add(match)
+    db_session.commit()
+
+    response = client.post(f"/api/v1/resumes/improved/{match.id}/save", headers=auth_headers)
+    assert response.status_code == status.HTTP_200_OK
+    saved = db_session.get(Resume, response.json()["resume"]["id"])
+    assert saved.raw_text == improved_text
+    assert saved.content_hash == content_hash(improved_text)
+
+    response = client.post(f"/api/v1/resumes/improved/{match.id}/save", headers=auth_headers)
+    assert response.status_code == status.HTTP_409_CONFLICT
@@ -1,5 +1,5 @@
 import apiClient from './client';
-import { ResumeResponse } from '@/types/api';
+import { ResumeListItem, ResumeResponse } from '@/types/api';
 
 export interface RewriteResponse {
   resume_id: number;
@@ -23,7 +23,7 @@ export const resumesAPI = {
   },
 
   list: (skip = 0, limit = 100) =>
-    apiClient.get<ResumeResponse[]>('/resumes/', {
+    apiClient.get<ResumeListItem[]>('/resumes/', {
       params: { skip, limit }
     }),
 
@@ -1,9 +1,9 @@
 import useSWR from 'swr';
 import { resumesAPI } from '@/lib/api/resumes';
-import { ResumeResponse } from '@/types/api';
+import { ResumeListItem, ResumeResponse } from '@/types/api';
 
 export function useResumes() {
-  const { data, error, mutate } = useSWR<ResumeResponse[]>(
+  const { data, error, mutate } = useSWR<ResumeListItem[]>(
     'resumes',
     () => resumesAPI.list().then(res => res.data),
     {
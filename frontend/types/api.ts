@@ -32,15 +32,19 @@ export interface UserResponse {
 }
 
 // ============ Resume ============
-export interface ResumeResponse {
+export interface ResumeListItem {
   id: number;
   filename: string;
   file_type: string;
-  raw_text: string;
   parsed_data: Record<string, any> | null;
+  analysis_status: string | null;
   created_at: string;
 }
 
+export interface ResumeResponse extends ResumeListItem {
+  raw_text: string;
+}
+
 export interface ResumeListResponse {
   resumes: ResumeResponse[];
   total: number;